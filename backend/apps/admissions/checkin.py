@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.queue.models import QueueTicket
+from apps.queue.numbering import allocate_numbers
+from apps.tenants.cache import QUEUE, bump
+from .models import Visit
+
+
+def check_in(tenant, patients, lane="", priority=None):
+    """Open a visit and queue ticket for each patient, numbered in order.
+
+    Visits and tickets are bulk inserted in one transaction around a single
+    allocation of a contiguous block of queue numbers. Returns the tickets
+    in ``patients`` order, annotated with ``patient_name``.
+    """
+    if priority is None:
+        priority = settings.QUEUE_LANE_PRIORITIES.get(lane, 0)
+    day = timezone.localdate()
+    with transaction.atomic():
+        visits = Visit.objects.bulk_create(
+            Visit.stamp([Visit(tenant=tenant, patient=patient) for patient in patients])
+        )
+        first = allocate_numbers(tenant, count=len(visits), lane=lane, day=day)
+        tickets = QueueTicket.objects.bulk_create(
+            QueueTicket.stamp(
+                [
+                    QueueTicket(
+                        tenant=tenant,
+                        visit=visit,
+                        queue_date=day,
+                        lane=lane,
+                        priority=priority,
+                        number=first + i,
+                    )
+                    for i, visit in enumerate(visits)
+                ]
+            )
+        )
+        bump(tenant.id, QUEUE)
+    for ticket, patient in zip(tickets, patients):
+        ticket.patient_name = patient.full_name
+    return tickets
@@ -0,0 +1,113 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from rest_framework.test import APIClient
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from apps.tenants.models import Tenant
+from apps.users.auth import TenantTokenObtainPairSerializer
+from apps.users.models import User
+from rme_core.synthetic import Generator
+
+
+class Command(BaseCommand):
+    help = "Measure check-in throughput through the API with concurrent clients"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checkins", type=int, default=1000)
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--tenant", default="bench-checkin")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1,
+            help="Patients per request; above 1 uses /api/admissions/checkin/batch/",
+        )
+
+    def handle(self, *args, **options):
+        tenant, _ = Tenant.objects.get_or_create(
+            subdomain=options["tenant"], defaults={"name": "Check-in benchmark"}
+        )
+        user, _ = User.objects.get_or_create(
+            username=f"{tenant.subdomain}-staff",
+            defaults={"tenant": tenant, "role": User.Role.STAFF},
+        )
+        token = str(TenantTokenObtainPairSerializer.get_token(user).access_token)
+        patients = self.patients(tenant, options["checkins"])
+        before = QueueTicket.objects.filter(tenant=tenant).count()
+
+        latencies = []
+        failures = []
+        lock = threading.Lock()
+        workers = options["workers"]
+        batch_size = options["batch_size"]
+        barrier = threading.Barrier(workers)
+
+        def post(client, ids, headers):
+            if batch_size == 1:
+                return client.post(
+                    "/api/admissions/checkin/", {"patient_id": str(ids[0])}, **headers
+                )
+            return client.post(
+                "/api/admissions/checkin/batch/",
+                {"patient_ids": [str(pk) for pk in ids]},
+                format="json",
+                **headers,
+            )
+
+        def worker(chunk):
+            client = APIClient()
+            headers = {
+                "HTTP_AUTHORIZATION": f"Bearer {token}",
+                "HTTP_X_TENANT_ID": str(tenant.id),
+            }
+            barrier.wait()
+            try:
+                for start in range(0, len(chunk), batch_size):
+                    started = time.perf_counter()
+                    resp = post(client, chunk[start : start + batch_size], headers)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        latencies.append(elapsed)
+                        if resp.status_code != 201:
+                            failures.append(resp.status_code)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=worker, args=(patients[i::workers],))
+            for i in range(workers)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        created = QueueTicket.objects.filter(tenant=tenant).count() - before
+        if failures:
+            raise CommandError(f"{len(failures)} requests failed: {set(failures)}")
+        latencies.sort()
+        self.stdout.write(
+            f"{created} check-ins with {workers} workers, batch size {batch_size}, "
+            f"in {elapsed:.2f}s: "
+            f"{created / elapsed:.1f}/sec, "
+            f"p50={statistics.median(latencies):.1f}ms "
+            f"p95={latencies[int(len(latencies) * 0.95) - 1]:.1f}ms"
+        )
+
+    def patients(self, tenant, count):
+        ids = list(
+            Patient.objects.filter(tenant=tenant).values_list("id", flat=True)[:count]
+        )
+        if len(ids) < count:
+            generator = Generator(prefix=tenant.subdomain)
+            created = Patient.objects.bulk_create(
+                generator.patients(tenant, 0, len(ids), count)
+            )
+            ids += [p.id for p in created]
+        return ids
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("admissions", "0001_initial"),
+    ]
+
+    # Only the Python-side default changes; the column is untouched, so skip
+    # the table rebuild SQLite would otherwise do (which drops triggers).
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="visit",
+                    name="created_at",
+                    field=models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+            ]
+        ),
+    ]
@@ -1,14 +1,23 @@
 import uuid
 from django.db import models
+from django.utils import timezone
+from apps.sync.models import SyncedModel
 from apps.tenants.models import Tenant
 from apps.patients.models import Patient
 
 
-class Visit(models.Model):
+class Visit(SyncedModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
     patient = models.ForeignKey(Patient, on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["tenant", "change_seq", "id"], name="visit_tenant_change_idx"
+            )
+        ]
 
     def __str__(self) -> str:
         return f"Visit {self.id}"
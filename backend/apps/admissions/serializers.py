@@ -5,6 +5,21 @@ from apps.queue.serializers import QueueTicketSerializer
 
 class CheckInSerializer(serializers.Serializer):
     patient_id = serializers.UUIDField()
+    lane = serializers.CharField(max_length=20, required=False, default="")
+    priority = serializers.IntegerField(required=False, min_value=0, max_value=32767)
+
+
+class BatchCheckInSerializer(serializers.Serializer):
+    patient_ids = serializers.ListField(
+        child=serializers.UUIDField(), min_length=1, max_length=200
+    )
+    lane = serializers.CharField(max_length=20, required=False, default="")
+    priority = serializers.IntegerField(required=False, min_value=0, max_value=32767)
+
+    def validate_patient_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Duplicate patient ids.")
+        return value
 
 
 class CheckInResponseSerializer(QueueTicketSerializer):
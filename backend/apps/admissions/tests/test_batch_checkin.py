@@ -0,0 +1,80 @@
+import uuid
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+
+class BatchCheckInTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.auth_headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.patients = Patient.objects.bulk_create(
+            Patient(tenant=self.tenant, full_name=f"P{i}", mrn=str(i))
+            for i in range(30)
+        )
+
+    def batch(self, ids, **data):
+        return self.client.post(
+            "/api/admissions/checkin/batch/",
+            {"patient_ids": [str(pk) for pk in ids], **data},
+            format="json",
+            **self.auth_headers,
+        )
+
+    def test_batch_returns_tickets_in_order_with_contiguous_numbers(self):
+        self.client.post(
+            "/api/admissions/checkin/",
+            {"patient_id": str(self.patients[0].id)},
+            **self.auth_headers,
+        )
+        chosen = list(reversed(self.patients[1:6]))
+        resp = self.batch([p.id for p in chosen], lane="ELDERLY")
+        self.assertEqual(resp.status_code, 201)
+        data = resp.json()
+        self.assertEqual(
+            [t["patient_name"] for t in data], [p.full_name for p in chosen]
+        )
+        self.assertEqual([t["number"] for t in data], [1, 2, 3, 4, 5])
+        self.assertEqual({t["priority"] for t in data}, {50})
+        resp = self.batch([p.id for p in self.patients[6:8]], lane="ELDERLY")
+        self.assertEqual([t["number"] for t in resp.json()], [6, 7])
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def writes(ids):
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.batch(ids).status_code, 201)
+            return len([q for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]])
+
+        small = writes([p.id for p in self.patients[:2]])
+        large = writes([p.id for p in self.patients[2:30]])
+        self.assertEqual(small, large)
+
+    def test_unknown_or_foreign_patients_reject_whole_batch(self):
+        other = Tenant.objects.create(name="O", subdomain="o")
+        foreign = Patient.objects.create(tenant=other, full_name="X", mrn="x")
+        for bad in (foreign.id, uuid.uuid4()):
+            resp = self.batch([self.patients[0].id, bad])
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn(str(bad), resp.json()["patient_ids"][0])
+        resp = self.batch([self.patients[0].id, self.patients[0].id])
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(Visit.objects.exists())
+        self.assertFalse(QueueTicket.objects.exists())
@@ -1,15 +1,17 @@
+from drf_spectacular.utils import extend_schema
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import serializers, status
 
+from apps.tenants.idempotency import idempotent
 from apps.tenants.permissions import IsTenantUser, RolePermission
 from apps.users.models import User
 from apps.patients.models import Patient
-from apps.queue.models import QueueTicket
+from apps.queue.events import publish_ticket_event
 from apps.queue.serializers import QueueTicketSerializer
-from .models import Visit
-from .serializers import CheckInSerializer
+from .checkin import check_in
+from .serializers import BatchCheckInSerializer, CheckInSerializer
 
 
 class CheckInView(APIView):
@@ -22,17 +24,52 @@ class CheckInView(APIView):
         User.Role.STAFF,
     ]
 
+    @idempotent
     def post(self, request):
         serializer = CheckInSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         patient = Patient.objects.get(
             id=serializer.validated_data["patient_id"], tenant=request.tenant
         )
-        visit = Visit.objects.create(tenant=request.tenant, patient=patient)
-        number = QueueTicket.objects.filter(tenant=request.tenant).count() + 1
-        ticket = QueueTicket.objects.create(
-            tenant=request.tenant, visit=visit, number=number
+        (ticket,) = check_in(
+            request.tenant,
+            [patient],
+            serializer.validated_data["lane"],
+            serializer.validated_data.get("priority"),
         )
-        return Response(
-            QueueTicketSerializer(ticket).data, status=status.HTTP_201_CREATED
+        data = QueueTicketSerializer(ticket).data
+        publish_ticket_event(request.tenant.id, "ticket.created", data)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class BatchCheckInView(APIView):
+    serializer_class = BatchCheckInSerializer
+    permission_classes = [IsAuthenticated, IsTenantUser, RolePermission]
+    required_roles = CheckInView.required_roles
+
+    @extend_schema(responses={201: QueueTicketSerializer(many=True)})
+    @idempotent
+    def post(self, request):
+        """Check in several patients at once; tickets come back in request order."""
+        serializer = BatchCheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["patient_ids"]
+        found = Patient.objects.filter(tenant=request.tenant, id__in=ids).only(
+            "id", "full_name"
+        )
+        by_id = {patient.id: patient for patient in found}
+        missing = [str(pk) for pk in ids if pk not in by_id]
+        if missing:
+            raise serializers.ValidationError(
+                {"patient_ids": [f"Unknown patients: {', '.join(missing)}"]}
+            )
+        tickets = check_in(
+            request.tenant,
+            [by_id[pk] for pk in ids],
+            serializer.validated_data["lane"],
+            serializer.validated_data.get("priority"),
         )
+        data = QueueTicketSerializer(tickets, many=True).data
+        for ticket in data:
+            publish_ticket_event(request.tenant.id, "ticket.created", ticket)
+        return Response(data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+
+from .importer import CSV, NDJSON
+
+EXPORT_FIELDS = ("id", "full_name", "mrn", "nik", "bpjs", "created_at")
+CONTENT_TYPES = {CSV: "text/csv", NDJSON: "application/x-ndjson"}
+# Rows buffered into each emitted chunk; keeps chunks a few dozen KB.
+ROWS_PER_CHUNK = 500
+
+
+def export_rows(queryset, chunk_size=2000):
+    """Stream value tuples, using a server-side cursor on PostgreSQL."""
+    return (
+        queryset.order_by().values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    )
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def render_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_cell(v) for v in row])
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def render_ndjson(rows):
+    lines = []
+    for row in rows:
+        record = dict(zip(EXPORT_FIELDS, (_cell(v) for v in row)))
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) == ROWS_PER_CHUNK:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+RENDERERS = {CSV: render_csv, NDJSON: render_ndjson}
+
+
+def gzip_chunks(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_patients(queryset, fmt=CSV, compress=False, chunk_size=2000):
+    """Return an iterator of encoded export bytes in constant memory."""
+    chunks = RENDERERS[fmt](export_rows(queryset, chunk_size))
+    return gzip_chunks(chunks) if compress else chunks
+
+
+async def async_chunks(chunks):
+    """Serve a sync chunk iterator to an ASGI server one chunk at a time.
+
+    Django's ASGI handler collects sync streaming content into a list
+    before sending it. Each ``next`` runs on the thread-sensitive executor,
+    so the server-side cursor stays on one connection.
+    """
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
@@ -0,0 +1,226 @@
+import csv
+import io
+import json
+import time
+from itertools import islice
+
+from django.db import IntegrityError, connection, transaction
+
+from apps.tenants.cache import PATIENTS, bump
+from .models import Patient
+
+CSV = "csv"
+NDJSON = "ndjson"
+FORMATS = (CSV, NDJSON)
+FIELDS = ("full_name", "mrn", "nik", "bpjs")
+REQUIRED = ("full_name", "mrn")
+MAX_ERRORS = 100
+# Yielded by parse_rows() in place of a row where the file stops being UTF-8.
+UNDECODABLE = object()
+
+
+def detect_format(name):
+    return NDJSON if name.lower().endswith((".ndjson", ".jsonl")) else CSV
+
+
+def parse_rows(stream, fmt):
+    """Yield ``(line, row)`` from a binary stream without loading it into memory.
+
+    ``line`` is the row's line in the file (a quoted multi-line CSV record
+    counts as its last line). Bytes that are not UTF-8 end the stream with
+    ``(line, UNDECODABLE)``, ``line`` being the first one not read.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    line = 0
+    try:
+        for line, row in _parse_text(text, fmt):
+            yield line, row
+    except UnicodeDecodeError:
+        yield line + 1, UNDECODABLE
+
+
+def _parse_text(text, fmt):
+    if fmt == CSV:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line, content in enumerate(text, start=1):
+        content = content.strip()
+        if not content:
+            continue
+        try:
+            yield line, json.loads(content)
+        except ValueError:
+            yield line, None
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    def error(self, line, message):
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    @property
+    def rows_per_sec(self):
+        return round(self.rows / self.seconds, 1) if self.seconds else 0.0
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "rows_per_sec": self.rows_per_sec,
+        }
+
+
+class PatientImporter:
+    """Stream patients into a tenant in validated, bulk-written batches.
+
+    MRN collisions with existing rows and within the file are detected per
+    batch with one ``mrn__in`` query. PostgreSQL uses ``COPY`` by default,
+    other backends ``bulk_create``.
+    """
+
+    def __init__(self, tenant, batch_size=5000, use_copy=None):
+        self.tenant = tenant
+        self.batch_size = batch_size
+        if use_copy is None:
+            use_copy = connection.vendor == "postgresql"
+        self.use_copy = use_copy
+        self.max_lengths = {f: Patient._meta.get_field(f).max_length for f in FIELDS}
+        self.seen_mrns = set()
+
+    def run(self, rows):
+        """Import ``(line, row)`` pairs, as :func:`parse_rows` yields them."""
+        report = ImportReport()
+        started = time.perf_counter()
+        for batch in chunked(rows, self.batch_size):
+            report.rows += len(batch)
+            patients = self.validate(batch, report)
+            self.write(patients, report)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def validate(self, batch, report):
+        candidates = []
+        for line, row in batch:
+            if row is UNDECODABLE:
+                # Always reported: it explains every row missing after it.
+                report.invalid += 1
+                report.errors.append(
+                    {
+                        "line": line,
+                        "error": "Not UTF-8 encoded from here on; "
+                        "the rest of the file was not imported",
+                    }
+                )
+                continue
+            if not isinstance(row, dict):
+                report.invalid += 1
+                report.error(line, "Unparseable row")
+                continue
+            values = {f: str(row.get(f) or "").strip() for f in FIELDS}
+            problem = self.check(values)
+            if problem:
+                report.invalid += 1
+                report.error(line, problem)
+                continue
+            if values["mrn"] in self.seen_mrns:
+                report.duplicates += 1
+                report.error(line, f"Duplicate MRN {values['mrn']} in file")
+                continue
+            self.seen_mrns.add(values["mrn"])
+            candidates.append((line, values))
+
+        existing = self.existing_mrns([values["mrn"] for _, values in candidates])
+        patients = []
+        for line, values in candidates:
+            if values["mrn"] in existing:
+                report.duplicates += 1
+                report.error(line, f"MRN {values['mrn']} already exists")
+                continue
+            patients.append(Patient(tenant=self.tenant, **values))
+        return patients
+
+    def check(self, values):
+        for field in REQUIRED:
+            if not values[field]:
+                return f"{field} is required"
+        for field, limit in self.max_lengths.items():
+            if len(values[field]) > limit:
+                return f"{field} exceeds {limit} characters"
+        return None
+
+    def existing_mrns(self, mrns):
+        if not mrns:
+            return set()
+        return set(
+            Patient.objects.filter(tenant=self.tenant, mrn__in=mrns).values_list(
+                "mrn", flat=True
+            )
+        )
+
+    def write(self, patients, report):
+        if not patients:
+            return
+        try:
+            with transaction.atomic():
+                self.insert(patients)
+        except IntegrityError:
+            # Lost a race with a concurrent writer; drop the new collisions.
+            existing = self.existing_mrns([p.mrn for p in patients])
+            report.duplicates += len(existing)
+            patients = [p for p in patients if p.mrn not in existing]
+            with transaction.atomic():
+                self.insert(patients)
+        report.created += len(patients)
+        bump(self.tenant.id, PATIENTS)
+
+    def insert(self, patients):
+        Patient.stamp(patients)
+        if self.use_copy:
+            copy_patients(patients)
+        else:
+            Patient.objects.bulk_create(patients, batch_size=self.batch_size)
+
+
+def _db_rows(objs, fields):
+    for obj in objs:
+        yield [f.get_db_prep_save(f.pre_save(obj, True), connection) for f in fields]
+
+
+def _table_and_columns(model):
+    fields = model._meta.concrete_fields
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+    return fields, table, columns
+
+
+def copy_objects(model, objs):
+    """Insert unsaved ``model`` instances with PostgreSQL ``COPY ... FROM STDIN``."""
+    fields, table, columns = _table_and_columns(model)
+    with connection.cursor() as cursor:
+        with cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+            for row in _db_rows(objs, fields):
+                copy.write_row(row)
+
+
+def copy_patients(patients):
+    copy_objects(Patient, patients)
@@ -0,0 +1,59 @@
+import re
+
+from django.db.models import Q
+
+NIK = "nik"
+BPJS = "bpjs"
+MRN = "mrn"
+IDENTIFIER_TYPES = (NIK, BPJS, MRN)
+
+# NIK is the 16-digit national ID; BPJS card numbers are 13 digits.
+NIK_RE = re.compile(r"^\d{16}$")
+BPJS_RE = re.compile(r"^\d{13}$")
+
+
+def identifier_type(value):
+    if NIK_RE.match(value):
+        return NIK
+    if BPJS_RE.match(value):
+        return BPJS
+    return MRN
+
+
+def candidate_types(value):
+    """Columns probed for ``value`` when no type is given, likeliest first.
+
+    A 13- or 16-digit value may also be an all-digit MRN.
+    """
+    inferred = identifier_type(value)
+    return (inferred,) if inferred == MRN else (inferred, MRN)
+
+
+def lookup_patients(queryset, identifiers, id_type=None):
+    """Resolve exact identifiers with one query of per-column index probes.
+
+    Returns ``(identifier, type, patient_or_None)`` tuples in input order;
+    ``type`` is the column that matched, or the inferred one on a miss.
+    """
+    probes = [
+        (value, (id_type,) if id_type else candidate_types(value))
+        for value in identifiers
+    ]
+    wanted = {t: set() for t in IDENTIFIER_TYPES}
+    for value, types in probes:
+        for t in types:
+            wanted[t].add(value)
+    query = Q()
+    for field, values in wanted.items():
+        if values:
+            query |= Q(**{f"{field}__in": values})
+    found = {}
+    if query:
+        for patient in queryset.filter(query):
+            for field in IDENTIFIER_TYPES:
+                found.setdefault((field, getattr(patient, field)), patient)
+    results = []
+    for value, types in probes:
+        matched = next((t for t in types if (t, value) in found), types[0])
+        results.append((value, matched, found.get((matched, value))))
+    return results
@@ -0,0 +1,80 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from apps.patients.models import Patient
+from apps.patients.search import search_patients, substring_search
+from apps.tenants.models import Tenant
+from rme_core.synthetic import Generator
+
+
+class Command(BaseCommand):
+    help = "Benchmark patient search latency before/after indexed search"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patients", type=int, default=1_000_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--tenant", default="bench")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        tenant, _ = Tenant.objects.get_or_create(
+            subdomain=options["tenant"], defaults={"name": "Benchmark"}
+        )
+        generator = Generator(options["seed"], prefix=tenant.subdomain)
+        self.seed(tenant, generator, options["patients"], options["batch_size"])
+        terms = self.sample_terms(tenant, options["queries"], rng)
+        base = Patient.objects.filter(tenant=tenant).order_by("full_name")
+        before = self.measure(terms, lambda t: substring_search(base, t))
+        after = self.measure(terms, lambda t: search_patients(base, t, tenant))
+        for label, timings in (("before", before), ("after", after)):
+            self.stdout.write(
+                f"{label:<7} p50={percentile(timings, 50):8.2f}ms "
+                f"p95={percentile(timings, 95):8.2f}ms "
+                f"mean={statistics.mean(timings):8.2f}ms"
+            )
+
+    def seed(self, tenant, generator, total, batch_size):
+        existing = Patient.objects.filter(tenant=tenant).count()
+        for start in range(existing, total, batch_size):
+            stop = min(start + batch_size, total)
+            Patient.objects.bulk_create(generator.patients(tenant, 0, start, stop))
+            self.stdout.write(f"seeded {min(start + batch_size, total)}/{total}")
+        # Refresh planner statistics after the bulk load.
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def sample_terms(self, tenant, count, rng):
+        """Keystroke-sized fragments of real names and identifiers."""
+        total = Patient.objects.filter(tenant=tenant).count()
+        terms = []
+        for _ in range(count):
+            offset = rng.randrange(total)
+            patient = Patient.objects.filter(tenant=tenant).order_by("mrn")[offset]
+            value = rng.choice(
+                [v for v in (patient.full_name, patient.nik, patient.mrn) if v]
+            )
+            length = rng.randint(4, 7)
+            start = rng.randrange(max(1, len(value) - length))
+            terms.append(value[start : start + length])
+        return terms
+
+    def measure(self, terms, search):
+        timings = []
+        for term in terms:
+            started = time.perf_counter()
+            qs = search(term)
+            qs.count()
+            list(qs[:10])
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, round(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.patients.exporter import export_patients
+from apps.patients.importer import FORMATS
+from apps.patients.models import Patient
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Stream all patients of a tenant as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("tenant", help="Tenant subdomain")
+        parser.add_argument("path", nargs="?", default="-", help="Output file or -")
+        parser.add_argument("--format", choices=FORMATS, default=FORMATS[0])
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            tenant = Tenant.objects.get(subdomain=options["tenant"])
+        except Tenant.DoesNotExist:
+            raise CommandError(f"Unknown tenant {options['tenant']}")
+        if options["gzip"] and options["path"] == "-":
+            raise CommandError("--gzip requires an output file")
+        chunks = export_patients(
+            Patient.objects.filter(tenant=tenant),
+            options["format"],
+            compress=options["gzip"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["path"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk.decode("utf-8"), ending="")
+            return
+        with open(options["path"], "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.patients.importer import FORMATS, PatientImporter, detect_format, parse_rows
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Stream patients from a CSV or NDJSON file into a tenant"
+
+    def add_arguments(self, parser):
+        parser.add_argument("tenant", help="Tenant subdomain")
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            default=None,
+            help="Force COPY (PostgreSQL only, default there)",
+        )
+        parser.add_argument("--no-copy", action="store_false", dest="copy")
+
+    def handle(self, *args, **options):
+        try:
+            tenant = Tenant.objects.get(subdomain=options["tenant"])
+        except Tenant.DoesNotExist:
+            raise CommandError(f"Unknown tenant {options['tenant']}")
+        fmt = options["format"] or detect_format(options["path"])
+        importer = PatientImporter(
+            tenant, batch_size=options["batch_size"], use_copy=options["copy"]
+        )
+        with open(options["path"], "rb") as stream:
+            report = importer.run(parse_rows(stream, fmt))
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.created} created, {report.duplicates} duplicates, "
+                f"{report.invalid} invalid of {report.rows} rows in "
+                f"{report.seconds:.2f}s ({report.rows_per_sec} rows/sec)"
+            )
+        )
@@ -0,0 +1,76 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.utils import OperationalError
+
+SEARCH_FIELDS = ("full_name", "mrn", "nik", "bpjs")
+
+# patient_id is indexed so triggers can locate a row through the FTS index
+# instead of scanning the whole table.
+DELETE_OLD = (
+    "DELETE FROM patients_patient_fts WHERE rowid IN ("
+    "SELECT rowid FROM patients_patient_fts "
+    "WHERE patients_patient_fts MATCH 'patient_id : \"' || old.id || '\"');"
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS patients_patient_{field}_trgm "
+                f"ON patients_patient USING gin ({field} gin_trgm_ops)"
+            )
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE patients_patient_fts USING fts5("
+                "patient_id, tenant_id UNINDEXED, "
+                "full_name, mrn, nik, bpjs, tokenize='trigram')"
+            )
+        except OperationalError:
+            # SQLite without FTS5 or the trigram tokenizer (< 3.34); search
+            # falls back to LIKE.
+            return
+        columns = "id, tenant_id, full_name, mrn, nik, bpjs"
+        new = "new.id, new.tenant_id, new.full_name, new.mrn, new.nik, new.bpjs"
+        schema_editor.execute(
+            f"INSERT INTO patients_patient_fts SELECT {columns} FROM patients_patient"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER patients_patient_fts_ai AFTER INSERT ON patients_patient "
+            f"BEGIN INSERT INTO patients_patient_fts VALUES ({new}); END"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER patients_patient_fts_au AFTER UPDATE ON patients_patient "
+            f"BEGIN {DELETE_OLD} INSERT INTO patients_patient_fts VALUES ({new}); END"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER patients_patient_fts_ad AFTER DELETE ON patients_patient "
+            f"BEGIN {DELETE_OLD} END"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(f"DROP INDEX IF EXISTS patients_patient_{field}_trgm")
+    elif vendor == "sqlite":
+        for suffix in ("ai", "au", "ad"):
+            schema_editor.execute(
+                f"DROP TRIGGER IF EXISTS patients_patient_fts_{suffix}"
+            )
+        schema_editor.execute("DROP TABLE IF EXISTS patients_patient_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0001_initial"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0002_patient_search_indexes"),
+        ("tenants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(fields=["tenant", "nik"], name="patient_tenant_nik_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                fields=["tenant", "bpjs"], name="patient_tenant_bpjs_idx"
+            ),
+        ),
+    ]
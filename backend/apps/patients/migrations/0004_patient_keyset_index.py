@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0003_patient_identifier_indexes"),
+        ("tenants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                fields=["tenant", "full_name", "id"], name="patient_tenant_name_idx"
+            ),
+        ),
+    ]
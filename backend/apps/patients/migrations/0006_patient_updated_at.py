@@ -0,0 +1,66 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:02
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+# Adding a NOT NULL column makes SQLite rebuild the table, which drops the
+# search triggers from 0002; they are recreated after the backfill so it
+# does not rewrite the FTS index row by row.
+DELETE_OLD = (
+    "DELETE FROM patients_patient_fts WHERE rowid IN ("
+    "SELECT rowid FROM patients_patient_fts "
+    "WHERE patients_patient_fts MATCH 'patient_id : \"' || old.id || '\"');"
+)
+NEW = "new.id, new.tenant_id, new.full_name, new.mrn, new.nik, new.bpjs"
+
+
+def backfill_updated_at(apps, schema_editor):
+    Patient = apps.get_model("patients", "Patient")
+    Patient.objects.update(updated_at=F("created_at"))
+
+
+def restore_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'patients_patient_fts'"
+        )
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute(
+        "CREATE TRIGGER IF NOT EXISTS patients_patient_fts_ai "
+        "AFTER INSERT ON patients_patient "
+        f"BEGIN INSERT INTO patients_patient_fts VALUES ({NEW}); END"
+    )
+    schema_editor.execute(
+        "CREATE TRIGGER IF NOT EXISTS patients_patient_fts_au "
+        "AFTER UPDATE ON patients_patient "
+        f"BEGIN {DELETE_OLD} INSERT INTO patients_patient_fts VALUES ({NEW}); END"
+    )
+    schema_editor.execute(
+        "CREATE TRIGGER IF NOT EXISTS patients_patient_fts_ad "
+        "AFTER DELETE ON patients_patient "
+        f"BEGIN {DELETE_OLD} END"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0005_patient_created_at_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="patient",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-18 13:07
+
+from django.db import migrations, models
+
+
+def add_change_seq(table, model_name):
+    # A plain ADD COLUMN with a constant default: existing rows start at
+    # change 1 without a table rewrite, and SQLite keeps the search
+    # triggers instead of rebuilding the table.
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[
+            migrations.RunSQL(
+                f"ALTER TABLE {table} ADD COLUMN change_seq bigint NOT NULL DEFAULT 1",
+                f"ALTER TABLE {table} DROP COLUMN change_seq",
+            )
+        ],
+        state_operations=[
+            migrations.AddField(
+                model_name=model_name,
+                name="change_seq",
+                field=models.BigIntegerField(default=0, editable=False),
+            )
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0006_patient_updated_at"),
+    ]
+
+    operations = [
+        add_change_seq("patients_patient", "patient"),
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                fields=["tenant", "change_seq", "id"], name="patient_tenant_change_idx"
+            ),
+        ),
+    ]
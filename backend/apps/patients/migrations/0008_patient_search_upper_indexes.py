@@ -0,0 +1,43 @@
+from django.db import migrations
+
+SEARCH_FIELDS = ("full_name", "mrn", "nik", "bpjs")
+
+
+# icontains compiles to UPPER(col::text) LIKE UPPER(%s) on PostgreSQL, which
+# only an index on UPPER(col) can serve. The plain full_name index stays for
+# the trigram similarity (%) operator; the other plain ones served nothing.
+def create_upper_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS patients_patient_{field}_upper_trgm "
+            f"ON patients_patient USING gin (UPPER({field}) gin_trgm_ops)"
+        )
+    for field in SEARCH_FIELDS[1:]:
+        schema_editor.execute(f"DROP INDEX IF EXISTS patients_patient_{field}_trgm")
+
+
+def drop_upper_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in SEARCH_FIELDS[1:]:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS patients_patient_{field}_trgm "
+            f"ON patients_patient USING gin ({field} gin_trgm_ops)"
+        )
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f"DROP INDEX IF EXISTS patients_patient_{field}_upper_trgm"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0007_patient_change_seq"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_upper_indexes, drop_upper_indexes),
+    ]
@@ -1,16 +1,19 @@
 import uuid
 from django.db import models
+from django.utils import timezone
+from apps.sync.models import SyncedModel
 from apps.tenants.models import Tenant
 
 
-class Patient(models.Model):
+class Patient(SyncedModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
     full_name = models.CharField(max_length=255)
     mrn = models.CharField(max_length=50)
     nik = models.CharField(max_length=20, blank=True)
     bpjs = models.CharField(max_length=20, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
@@ -18,6 +21,16 @@ class Patient(models.Model):
                 fields=["tenant", "mrn"], name="uniq_patient_mrn_per_tenant"
             ),
         ]
+        indexes = [
+            models.Index(fields=["tenant", "nik"], name="patient_tenant_nik_idx"),
+            models.Index(fields=["tenant", "bpjs"], name="patient_tenant_bpjs_idx"),
+            models.Index(
+                fields=["tenant", "full_name", "id"], name="patient_tenant_name_idx"
+            ),
+            models.Index(
+                fields=["tenant", "change_seq", "id"], name="patient_tenant_change_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.full_name
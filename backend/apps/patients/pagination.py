@@ -0,0 +1,174 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PatientPagination(PageNumberPagination):
+    page_size = 10
+
+
+def estimate_count(queryset):
+    """Planner row estimate on PostgreSQL; exact when the estimate is small."""
+    if connection.vendor == "postgresql":
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate >= settings.PAGINATION_EXACT_COUNT_THRESHOLD:
+            return estimate
+    return queryset.count()
+
+
+class KeysetPagination(BasePagination):
+    """Keyset pagination over ``(full_name, id)`` with opaque cursors.
+
+    Each page is a single index range scan, so deep pages cost the same as
+    the first. Rows may be model instances or ``values()`` dicts holding
+    the ordering columns. ``count`` is an estimate, taken on the first page
+    and carried in the cursors after it. Requests using ``?page=`` or a
+    search ranking fall back to page-number pagination.
+    """
+
+    page_size = 10
+    max_page_size = 100
+    ordering = ("full_name", "id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    fallback_class = PatientPagination
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        if self.use_fallback(queryset, request):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, reverse, self.count = self.decode_cursor(request)
+        if self.count is None:
+            self.count = estimate_count(queryset)
+        queryset = self.seek(queryset, position, reverse)
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = rows
+        return rows
+
+    def seek(self, queryset, position, reverse):
+        """``queryset`` ordered for the page and filtered past ``position``."""
+        first, second = self.ordering
+        if reverse:
+            queryset = queryset.order_by(f"-{first}", f"-{second}")
+        else:
+            queryset = queryset.order_by(first, second)
+        if position is None:
+            return queryset
+        op = "lt" if reverse else "gt"
+        # The plain bound on the first column is implied by the OR, but it is
+        # what lets the planner seek instead of scanning from the start of the
+        # tenant's index range.
+        return queryset.filter(
+            Q(**{f"{first}__{op}e": position[0]}),
+            Q(**{f"{first}__{op}": position[0]})
+            | Q(**{first: position[0], f"{second}__{op}": position[1]}),
+        )
+
+    def use_fallback(self, queryset, request):
+        if self.fallback_class.page_query_param in request.query_params:
+            return True
+        return tuple(queryset.query.order_by) != self.ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        """``(position, reverse, count)``; count is None on the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False, None
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            count = data.get("c")
+            if count is not None:
+                count = int(count)
+            return (data["k"][0], data["k"][1]), bool(data.get("r")), count
+        except (TypeError, ValueError, KeyError, IndexError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row, reverse):
+        if isinstance(row, dict):
+            key = [str(row[field]) for field in self.ordering]
+        else:
+            key = [str(getattr(row, field)) for field in self.ordering]
+        data = {"k": key, "c": self.count}
+        if reverse:
+            data["r"] = 1
+        encoded = urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return self.fallback_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            *self.fallback_class().get_schema_operation_parameters(view),
+        ]
@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from rest_framework import filters
+
+from .models import Patient
+
+FTS_TABLE = "patients_patient_fts"
+SEARCH_FIELDS = ("full_name", "mrn", "nik", "bpjs")
+# Trigram indexes cannot serve terms shorter than one trigram.
+MIN_INDEXED_LENGTH = 3
+
+
+# Database name -> whether it has FTS_TABLE; cleared after migrations.
+_fts_tables = {}
+
+
+def fts_available():
+    name = connection.settings_dict["NAME"]
+    if name not in _fts_tables:
+        _fts_tables[name] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[name]
+
+
+def forget_fts_tables():
+    _fts_tables.clear()
+
+
+def substring_query(term):
+    query = Q()
+    for field in SEARCH_FIELDS:
+        query |= Q(**{f"{field}__icontains": term})
+    return query
+
+
+def substring_search(queryset, term):
+    return queryset.filter(substring_query(term))
+
+
+def trigram_search(queryset, term):
+    """Rank by trigram similarity, or list substring matches if too many.
+
+    Substring matches are probed first, unordered, through the
+    ``UPPER(col)`` trigram indexes. Past ``PATIENT_SEARCH_LIMIT`` of them
+    they are returned in the queryset's own order, since ranking costs a
+    similarity per row. Otherwise fuzzy ``full_name`` matches join them
+    and everything is ranked.
+    """
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    matches = substring_search(queryset, term)
+    limit = settings.PATIENT_SEARCH_LIMIT
+    if matches.order_by().values("id")[limit : limit + 1].exists():
+        return matches
+    rank = Greatest(*(TrigramSimilarity(field, term) for field in SEARCH_FIELDS))
+    return (
+        queryset.filter(Q(full_name__trigram_similar=term) | substring_query(term))
+        .annotate(search_rank=rank)
+        .order_by("-search_rank", "full_name", "id")
+    )
+
+
+def fts5_search(queryset, term, tenant=None):
+    """Rank by FTS5 relevance, or list every match if there are too many.
+
+    Up to ``PATIENT_SEARCH_LIMIT`` matches come back in rank order. A
+    broader term returns every match in the queryset's own order, so
+    ``count`` and pagination stay exact.
+    """
+    columns = " ".join(SEARCH_FIELDS)
+    match = '{{{}}} : "{}"'.format(columns, term.replace('"', '""'))
+    sql = f"SELECT patient_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    params = [match]
+    if tenant is not None:
+        sql += " AND tenant_id = %s"
+        params.append(
+            Patient._meta.get_field("tenant").get_db_prep_value(tenant.id, connection)
+        )
+    limit = settings.PATIENT_SEARCH_LIMIT
+    with connection.cursor() as cursor:
+        cursor.execute(f"{sql} ORDER BY rank LIMIT %s", [*params, limit + 1])
+        ids = [Patient._meta.pk.to_python(row[0]) for row in cursor.fetchall()]
+    if not ids:
+        return queryset.none()
+    if len(ids) > limit:
+        return queryset.filter(id__in=RawSQL(sql, params))
+    position = Case(
+        *(When(id=pk, then=Value(i)) for i, pk in enumerate(ids)),
+        output_field=IntegerField(),
+    )
+    return (
+        queryset.filter(id__in=ids)
+        .annotate(search_rank=position)
+        .order_by("search_rank")
+    )
+
+
+def search_patients(queryset, term, tenant=None):
+    """Rank patients matching ``term`` using the best index for the backend.
+
+    ``tenant`` lets the SQLite FTS5 probe filter before ranking.
+    """
+    term = term.strip()
+    if not term:
+        return queryset
+    if len(term) >= MIN_INDEXED_LENGTH:
+        if connection.vendor == "postgresql":
+            return trigram_search(queryset, term)
+        if connection.vendor == "sqlite" and fts_available():
+            return fts5_search(queryset, term, tenant)
+    return substring_search(queryset, term)
+
+
+class PatientSearchFilter(filters.SearchFilter):
+    """Drop-in replacement for SearchFilter using indexed, ranked search."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        tenant = getattr(request, "tenant", None)
+        return search_patients(queryset, " ".join(terms), tenant)
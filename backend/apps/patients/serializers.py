@@ -1,9 +1,48 @@
 from rest_framework import serializers
+from rme_core.projection import Projection
+from .importer import FORMATS
+from .lookup import IDENTIFIER_TYPES
 from .models import Patient
 
 
 class PatientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Patient
-        fields = ["id", "full_name", "mrn", "nik", "bpjs", "created_at"]
-        read_only_fields = ["id", "created_at"]
+        fields = ["id", "full_name", "mrn", "nik", "bpjs", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_at", "updated_at"]
+
+
+patient_projection = Projection(PatientSerializer)
+
+
+class PatientLookupSerializer(serializers.Serializer):
+    identifiers = serializers.ListField(
+        child=serializers.CharField(max_length=50), min_length=1, max_length=100
+    )
+    type = serializers.ChoiceField(choices=IDENTIFIER_TYPES, required=False)
+
+
+class PatientLookupResultSerializer(serializers.Serializer):
+    identifier = serializers.CharField()
+    type = serializers.CharField()
+    patient = PatientSerializer(allow_null=True)
+
+
+class PatientImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    fmt = serializers.ChoiceField(choices=FORMATS, required=False)
+
+
+class PatientImportErrorSerializer(serializers.Serializer):
+    line = serializers.IntegerField()
+    error = serializers.CharField()
+
+
+class PatientImportReportSerializer(serializers.Serializer):
+    rows = serializers.IntegerField()
+    created = serializers.IntegerField()
+    duplicates = serializers.IntegerField()
+    invalid = serializers.IntegerField()
+    errors = PatientImportErrorSerializer(many=True)
+    seconds = serializers.FloatField()
+    rows_per_sec = serializers.FloatField()
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from apps.tenants.cache import PATIENTS, QUEUE, bump
+from .models import Patient
+from . import search
+
+
+@receiver(post_save, sender=Patient)
+@receiver(post_delete, sender=Patient)
+def invalidate_patient_reads(sender, instance, created=False, **kwargs):
+    if created:
+        bump(instance.tenant_id, PATIENTS)
+    else:
+        # Renames and deletions also show on the queue board.
+        bump(instance.tenant_id, PATIENTS, QUEUE)
+
+
+@receiver(post_migrate)
+def recheck_fts_table(**kwargs):
+    # A migration may have created or dropped the FTS table.
+    search.forget_fts_tables()
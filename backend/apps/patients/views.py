@@ -1,14 +1,30 @@
-from rest_framework import viewsets, filters
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from .exporter import CONTENT_TYPES, async_chunks, export_patients
+from .importer import CSV, FORMATS, PatientImporter, detect_format, parse_rows
+from .lookup import lookup_patients
 from .models import Patient
-from .serializers import PatientSerializer
+from .pagination import KeysetPagination
+from .search import PatientSearchFilter
+from .serializers import (
+    PatientImportReportSerializer,
+    PatientImportSerializer,
+    PatientLookupResultSerializer,
+    PatientLookupSerializer,
+    PatientSerializer,
+    patient_projection,
+)
+from apps.tenants.cache import PATIENTS, cached_response, conditional
 from apps.tenants.permissions import IsTenantUser, RolePermission
 from apps.users.models import User
-
-
-class PatientPagination(PageNumberPagination):
-    page_size = 10
+from rme_core.projection import FIELDS_PARAMETER
 
 
 class PatientViewSet(viewsets.ModelViewSet):
@@ -21,13 +37,120 @@ class PatientViewSet(viewsets.ModelViewSet):
         User.Role.STAFF,
     ]
     queryset = Patient.objects.all()
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [PatientSearchFilter]
     search_fields = ["full_name", "mrn", "nik", "bpjs"]
-    pagination_class = PatientPagination
+    pagination_class = KeysetPagination
     lookup_field = "id"
 
     def get_queryset(self):
-        return Patient.objects.filter(tenant=self.request.tenant).order_by("full_name")
+        return Patient.objects.filter(tenant=self.request.tenant).order_by(
+            "full_name", "id"
+        )
+
+    @extend_schema(parameters=[FIELDS_PARAMETER])
+    @conditional(PATIENTS)
+    @cached_response(PATIENTS)
+    def list(self, request, *args, **kwargs):
+        # Rows come from values(), not model instances; the keyset cursor
+        # needs the ordering columns whatever ?fields= asks for.
+        fields = patient_projection.select(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = patient_projection.values(queryset, fields, KeysetPagination.ordering)
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(patient_projection.render(page, fields))
+
+    @conditional(PATIENTS, detail=True)
+    @cached_response(PATIENTS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(tenant=self.request.tenant)
+
+    @extend_schema(
+        request=PatientLookupSerializer,
+        responses=PatientLookupResultSerializer(many=True),
+    )
+    @action(
+        detail=False,
+        methods=["get", "post"],
+        pagination_class=None,
+        filter_backends=[],
+    )
+    def lookup(self, request):
+        """Exact NIK/BPJS/MRN lookup; GET ?id=...&id=... or POST a batch."""
+        if request.method == "GET":
+            data = {"identifiers": request.query_params.getlist("id")}
+            if "type" in request.query_params:
+                data["type"] = request.query_params["type"]
+        else:
+            data = request.data
+        serializer = PatientLookupSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        results = lookup_patients(
+            Patient.objects.filter(tenant=request.tenant),
+            serializer.validated_data["identifiers"],
+            serializer.validated_data.get("type"),
+        )
+        payload = [
+            {"identifier": value, "type": id_type, "patient": patient}
+            for value, id_type, patient in results
+        ]
+        return Response(PatientLookupResultSerializer(payload, many=True).data)
+
+    @extend_schema(
+        request={"multipart/form-data": PatientImportSerializer},
+        responses={201: PatientImportReportSerializer},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+        required_roles=[User.Role.ADMIN],
+    )
+    def bulk_import(self, request):
+        """Stream a CSV or NDJSON upload into the tenant in bulk batches."""
+        serializer = PatientImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        fmt = serializer.validated_data.get("fmt") or detect_format(upload.name)
+        report = PatientImporter(request.tenant).run(parse_rows(upload, fmt))
+        return Response(
+            PatientImportReportSerializer(report.as_dict()).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("fmt", enum=FORMATS, default=CSV),
+            OpenApiParameter("compress", enum=["gzip"]),
+        ],
+        responses={(200, "text/csv"): OpenApiTypes.BINARY},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        pagination_class=None,
+        filter_backends=[],
+        required_roles=[User.Role.ADMIN],
+    )
+    def export(self, request):
+        """Stream every tenant patient as CSV or NDJSON, optionally gzipped."""
+        fmt = request.query_params.get("fmt", CSV)
+        if fmt not in FORMATS:
+            return Response(
+                {"fmt": [f"Choose one of {', '.join(FORMATS)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        compress = request.query_params.get("compress") == "gzip"
+        chunks = export_patients(
+            Patient.objects.filter(tenant=request.tenant), fmt, compress
+        )
+        if isinstance(request._request, ASGIRequest):
+            chunks = async_chunks(chunks)
+        response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'attachment; filename="patients.{fmt}"'
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        return response
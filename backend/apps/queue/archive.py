@@ -0,0 +1,59 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.sync.models import Tombstone
+from apps.tenants.cache import QUEUE, bump
+from .models import QueueTicket, QueueTicketArchive
+
+
+def _move_to_archive(ids, archived_at):
+    quote = connection.ops.quote_name
+    fields = QueueTicket._meta.concrete_fields
+    columns = ", ".join(quote(f.column) for f in fields)
+    table = quote(QueueTicket._meta.db_table)
+    pk = QueueTicket._meta.pk
+    where = f"WHERE {quote(pk.column)} IN ({', '.join(['%s'] * len(ids))})"
+    keys = [pk.get_db_prep_value(i, connection) for i in ids]
+    stamp = QueueTicketArchive._meta.get_field("archived_at")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(QueueTicketArchive._meta.db_table)} "
+            f"({columns}, {quote(stamp.column)}) "
+            f"SELECT {columns}, %s FROM {table} {where}",
+            [stamp.get_db_prep_value(archived_at, connection), *keys],
+        )
+        # Raw, so no per-row pre_delete tombstones; the caller writes them.
+        cursor.execute(f"DELETE FROM {table} {where}", keys)
+
+
+def archive_tickets(before=None, batch_size=5000):
+    """Move finished tickets issued before ``before`` (default today) to the archive.
+
+    Each batch runs in its own transaction, so the active table is never
+    locked for long: one ``INSERT ... SELECT`` and one ``DELETE`` for the
+    tickets, plus one sequence allocation and one tombstone INSERT per
+    tenant in the batch, so synced clients drop the archived tickets. The
+    queue cache is bumped once per tenant. Returns the number of tickets
+    moved.
+    """
+    before = before or timezone.localdate()
+    finished = QueueTicket.objects.filter(
+        state__in=QueueTicket.FINISHED_STATES, queue_date__lt=before
+    ).order_by()
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(finished.values_list("pk", "tenant_id")[:batch_size])
+            if not rows:
+                return moved
+            by_tenant = {}
+            for pk, tenant_id in rows:
+                by_tenant.setdefault(tenant_id, []).append(pk)
+            for tenant_id, ids in by_tenant.items():
+                Tombstone.objects.record(
+                    tenant_id, [(Tombstone.Kind.QUEUE_TICKET, pk) for pk in ids]
+                )
+            _move_to_archive([pk for pk, _ in rows], timezone.now())
+            for tenant_id in by_tenant:
+                bump(tenant_id, QUEUE)
+        moved += len(rows)
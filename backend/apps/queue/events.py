@@ -0,0 +1,109 @@
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class InMemoryBroker:
+    """Process-local fan-out; the default and the stand-in used by tests."""
+
+    def __init__(self, max_pending=100):
+        self.max_pending = max_pending
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def publish(self, tenant_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(str(tenant_id), ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(_offer, queue, event)
+
+    @asynccontextmanager
+    async def subscribe(self, tenant_id):
+        key = str(tenant_id)
+        entry = (asyncio.get_running_loop(), asyncio.Queue(self.max_pending))
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                self._subscribers[key].discard(entry)
+                if not self._subscribers[key]:
+                    del self._subscribers[key]
+
+
+def _offer(queue, event):
+    # Slow consumers lose the oldest deltas rather than stalling publishers.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+class RedisBroker:
+    """Cross-process fan-out over Redis pub/sub (requires ``redis``)."""
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="queue-events"):
+        import redis
+
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def channel(self, tenant_id):
+        return f"{self.prefix}:{tenant_id}"
+
+    def publish(self, tenant_id, event):
+        self._client.publish(self.channel(tenant_id), json.dumps(event))
+
+    @asynccontextmanager
+    async def subscribe(self, tenant_id):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.channel(tenant_id))
+        queue = asyncio.Queue()
+
+        async def pump():
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    queue.put_nowait(json.loads(message["data"]))
+
+        task = asyncio.create_task(pump())
+        try:
+            yield queue
+        finally:
+            task.cancel()
+            await pubsub.unsubscribe()
+            await client.aclose()
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        conf = settings.QUEUE_EVENTS
+        _broker = import_string(conf["BROKER"])(**conf.get("OPTIONS", {}))
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    global _broker
+    if setting == "QUEUE_EVENTS":
+        _broker = None
+
+
+def publish_ticket_event(tenant_id, event_type, ticket_data):
+    """Broadcast a ticket delta once the current transaction commits."""
+    event = {"type": event_type, "ticket": dict(ticket_data)}
+    transaction.on_commit(lambda: get_broker().publish(tenant_id, event))
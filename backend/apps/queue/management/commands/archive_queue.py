@@ -0,0 +1,23 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.queue.archive import archive_tickets
+
+
+class Command(BaseCommand):
+    help = "Move finished queue tickets from past days to the archive table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=0,
+            help="Also keep finished tickets from this many previous days",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        before = timezone.localdate() - datetime.timedelta(days=options["keep_days"])
+        moved = archive_tickets(before, batch_size=options["batch_size"])
+        self.stdout.write(f"Archived {moved} tickets issued before {before}")
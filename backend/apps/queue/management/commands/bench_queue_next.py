@@ -0,0 +1,88 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import Counter, QueueTicket
+from apps.queue.numbering import allocate_numbers
+from apps.queue.services import claim_next, close_day
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Measure concurrent 'call next' throughput as the number of counters grows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--callers", default="1,2,4,8,16,32")
+        parser.add_argument("--calls", type=int, default=50, help="Calls per caller")
+        parser.add_argument("--tenant", default="bench-next")
+
+    def handle(self, *args, **options):
+        tenant, _ = Tenant.objects.get_or_create(
+            subdomain=options["tenant"], defaults={"name": "Call-next benchmark"}
+        )
+        patient, _ = Patient.objects.get_or_create(
+            tenant=tenant, mrn="BN00000001", defaults={"full_name": "Bench Next"}
+        )
+        for callers in [int(n) for n in options["callers"].split(",")]:
+            self.run_round(tenant, patient, callers, options["calls"])
+
+    def run_round(self, tenant, patient, callers, calls):
+        # Through close_day, so the leftovers are stamped for sync and the
+        # board cache is bumped like any other skip.
+        close_day(tenant)
+        self.seed(tenant, patient, callers * calls)
+        counters = [
+            Counter.objects.get_or_create(tenant=tenant, name=f"Room {i + 1}")[0]
+            for i in range(callers)
+        ]
+
+        latencies = []
+        claimed = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(callers)
+
+        def worker(counter):
+            barrier.wait()
+            try:
+                for _ in range(calls):
+                    started = time.perf_counter()
+                    ticket = claim_next(tenant, counter)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        latencies.append(elapsed)
+                        if ticket is not None:
+                            claimed.append(ticket.pk)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(c,)) for c in counters]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if len(set(claimed)) != len(claimed):
+            raise CommandError("A ticket was claimed by more than one counter")
+        latencies.sort()
+        self.stdout.write(
+            f"{callers:>2} callers: {len(claimed)} calls in {elapsed:.2f}s: "
+            f"{len(claimed) / elapsed:.1f}/sec, "
+            f"p50={statistics.median(latencies):.1f}ms "
+            f"p95={latencies[int(len(latencies) * 0.95) - 1]:.1f}ms"
+        )
+
+    def seed(self, tenant, patient, count):
+        visits = Visit.objects.bulk_create(
+            Visit(tenant=tenant, patient=patient) for _ in range(count)
+        )
+        first = allocate_numbers(tenant, count=count)
+        QueueTicket.objects.bulk_create(
+            QueueTicket(tenant=tenant, visit=visit, number=first + i)
+            for i, visit in enumerate(visits)
+        )
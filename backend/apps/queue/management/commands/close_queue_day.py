@@ -0,0 +1,29 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.queue.services import close_day
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Skip tickets still WAITING at close of day (run from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--day", help="YYYY-MM-DD, defaults to today")
+        parser.add_argument("--tenant", help="Tenant subdomain, defaults to all")
+
+    def handle(self, *args, **options):
+        day = None
+        if options["day"]:
+            try:
+                day = datetime.date.fromisoformat(options["day"])
+            except ValueError:
+                raise CommandError("--day must be YYYY-MM-DD")
+        tenant = None
+        if options["tenant"]:
+            try:
+                tenant = Tenant.objects.get(subdomain=options["tenant"])
+            except Tenant.DoesNotExist:
+                raise CommandError(f"Unknown tenant {options['tenant']}")
+        skipped = close_day(tenant, day)
+        self.stdout.write(f"Skipped {skipped} waiting tickets")
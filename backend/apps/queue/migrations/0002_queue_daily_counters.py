@@ -0,0 +1,86 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Max
+from django.db.models.functions import TruncDate
+
+
+def backfill_queue_dates(apps, schema_editor):
+    QueueTicket = apps.get_model("queue", "QueueTicket")
+    QueueCounter = apps.get_model("queue", "QueueCounter")
+    # One set-based UPDATE: the local date of created_at, as localdate().
+    QueueTicket.objects.update(
+        queue_date=TruncDate(
+            "created_at", tzinfo=django.utils.timezone.get_current_timezone()
+        )
+    )
+    last_numbers = QueueTicket.objects.values("tenant_id", "queue_date").annotate(
+        last=Max("number")
+    )
+    QueueCounter.objects.bulk_create(
+        QueueCounter(
+            tenant_id=row["tenant_id"], day=row["queue_date"], value=row["last"]
+        )
+        for row in last_numbers
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("admissions", "0001_initial"),
+        ("queue", "0001_initial"),
+        ("tenants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueueCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("lane", models.CharField(blank=True, default="", max_length=20)),
+                ("value", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="queuecounter",
+            name="tenant",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="tenants.tenant"
+            ),
+        ),
+        migrations.RemoveConstraint(
+            model_name="queueticket",
+            name="uniq_queue_number_per_tenant",
+        ),
+        migrations.AddField(
+            model_name="queueticket",
+            name="queue_date",
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.RunPython(backfill_queue_dates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="queueticket",
+            constraint=models.UniqueConstraint(
+                fields=("tenant", "queue_date", "number"),
+                name="uniq_queue_number_per_tenant_day",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="queuecounter",
+            constraint=models.UniqueConstraint(
+                fields=("tenant", "day", "lane"), name="uniq_queue_counter"
+            ),
+        ),
+    ]
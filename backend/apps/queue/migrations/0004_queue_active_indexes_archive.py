@@ -0,0 +1,96 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("admissions", "0001_initial"),
+        ("queue", "0003_queue_counters"),
+        ("tenants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueueTicketArchive",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(editable=False, primary_key=True, serialize=False),
+                ),
+                ("number", models.PositiveIntegerField()),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("WAITING", "WAITING"),
+                            ("IN_PROGRESS", "IN_PROGRESS"),
+                            ("DONE", "DONE"),
+                            ("SKIPPED", "SKIPPED"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("queue_date", models.DateField()),
+                ("created_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="queueticket",
+            index=models.Index(
+                condition=models.Q(
+                    ("state", "WAITING"), ("state", "IN_PROGRESS"), _connector="OR"
+                ),
+                fields=["tenant", "created_at"],
+                name="queue_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="queueticket",
+            index=models.Index(
+                condition=models.Q(("state", "WAITING")),
+                fields=["tenant", "created_at"],
+                name="queue_waiting_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="queueticketarchive",
+            name="counter",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="archived_tickets",
+                to="queue.counter",
+            ),
+        ),
+        migrations.AddField(
+            model_name="queueticketarchive",
+            name="tenant",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="tenants.tenant"
+            ),
+        ),
+        migrations.AddField(
+            model_name="queueticketarchive",
+            name="visit",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_queue_tickets",
+                to="admissions.visit",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="queueticketarchive",
+            index=models.Index(
+                fields=["tenant", "queue_date"], name="queue_archive_tenant_day_idx"
+            ),
+        ),
+    ]
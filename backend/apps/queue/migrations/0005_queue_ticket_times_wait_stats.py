@@ -0,0 +1,88 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("queue", "0004_queue_active_indexes_archive"),
+        ("tenants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queueticket",
+            name="called_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="queueticket",
+            name="finished_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="queueticketarchive",
+            name="called_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="queueticketarchive",
+            name="finished_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="QueueWaitStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("hour", models.PositiveSmallIntegerField()),
+                ("served", models.PositiveIntegerField(default=0)),
+                ("skipped", models.PositiveIntegerField(default=0)),
+                ("wait_seconds", models.FloatField(default=0)),
+                ("service_seconds", models.FloatField(default=0)),
+                ("wait_histogram", models.JSONField(default=list)),
+                ("service_histogram", models.JSONField(default=list)),
+                (
+                    "counter",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="queue.counter",
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="tenants.tenant"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="queuewaitstat",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("counter__isnull", False)),
+                fields=("tenant", "day", "hour", "counter"),
+                name="uniq_wait_stat_counter",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="queuewaitstat",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("counter__isnull", True)),
+                fields=("tenant", "day", "hour"),
+                name="uniq_wait_stat_no_counter",
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("admissions", "0001_initial"),
+        ("queue", "0005_queue_ticket_times_wait_stats"),
+        ("tenants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="queueticket",
+            name="uniq_queue_number_per_tenant_day",
+        ),
+        migrations.RemoveIndex(
+            model_name="queueticket",
+            name="queue_waiting_idx",
+        ),
+        migrations.AddField(
+            model_name="queueticket",
+            name="lane",
+            field=models.CharField(blank=True, default="", max_length=20),
+        ),
+        migrations.AddField(
+            model_name="queueticket",
+            name="priority",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="queueticketarchive",
+            name="lane",
+            field=models.CharField(blank=True, default="", max_length=20),
+        ),
+        migrations.AddField(
+            model_name="queueticketarchive",
+            name="priority",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="queueticket",
+            index=models.Index(
+                condition=models.Q(("state", "WAITING")),
+                fields=["tenant", "-priority", "created_at"],
+                name="queue_waiting_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="queueticket",
+            index=models.Index(
+                condition=models.Q(("state", "WAITING")),
+                fields=["tenant", "lane", "-priority", "created_at"],
+                name="queue_waiting_lane_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="queueticket",
+            constraint=models.UniqueConstraint(
+                fields=("tenant", "queue_date", "lane", "number"),
+                name="uniq_queue_number_per_lane_day",
+            ),
+        ),
+    ]
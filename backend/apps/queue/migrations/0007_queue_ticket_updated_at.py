@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:02
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    last_change = Coalesce("finished_at", "called_at", F("created_at"))
+    for name in ("QueueTicket", "QueueTicketArchive"):
+        apps.get_model("queue", name).objects.update(updated_at=last_change)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("queue", "0006_queue_ticket_lanes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queueticket",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="queueticketarchive",
+            name="updated_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.6 on 2026-10-18 13:07
+
+from django.db import migrations, models
+
+
+def add_change_seq(table, model_name, field):
+    # A plain ADD COLUMN with a constant default: existing rows start at
+    # change 1 without a table rewrite.
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[
+            migrations.RunSQL(
+                f"ALTER TABLE {table} ADD COLUMN change_seq bigint NOT NULL DEFAULT 1",
+                f"ALTER TABLE {table} DROP COLUMN change_seq",
+            )
+        ],
+        state_operations=[
+            migrations.AddField(model_name=model_name, name="change_seq", field=field)
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("queue", "0007_queue_ticket_updated_at"),
+    ]
+
+    operations = [
+        add_change_seq(
+            "queue_queueticket",
+            "queueticket",
+            models.BigIntegerField(default=0, editable=False),
+        ),
+        add_change_seq(
+            "queue_queueticketarchive",
+            "queueticketarchive",
+            models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="queueticket",
+            index=models.Index(
+                fields=["tenant", "change_seq", "id"], name="queue_tenant_change_idx"
+            ),
+        ),
+    ]
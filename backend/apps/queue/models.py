@@ -1,16 +1,82 @@
 import uuid
 from django.db import models
+from django.db.models import F, Q
 from django.utils import timezone
+from apps.sync.models import SyncedModel
 from apps.tenants.models import Tenant
 
 
-class QueueTicket(models.Model):
+# Tickets shown on the board. Spelled as an OR rather than IN so SQLite can
+# match the partial index against queries with bound parameters.
+ACTIVE_TICKETS = Q(state="WAITING") | Q(state="IN_PROGRESS")
+
+
+class QueueTicketQuerySet(models.QuerySet):
+    def with_patient_name(self):
+        return self.annotate(patient_name=F("visit__patient__full_name"))
+
+    def projected(self):
+        """Ticket rows as the dicts QueueTicketSerializer renders."""
+        return self.values(
+            "id",
+            "number",
+            "state",
+            "lane",
+            "priority",
+            "counter_id",
+            patient_name=F("visit__patient__full_name"),
+        )
+
+    def active(self, tenant):
+        """Tickets on the board, in arrival order."""
+        return self.filter(ACTIVE_TICKETS, tenant=tenant).order_by("created_at")
+
+    def board(self, tenant):
+        """Flat projection of the queue board: one joined query, no models."""
+        return self.active(tenant).projected()
+
+
+class Counter(models.Model):
+    """A registration counter or examination room that calls tickets."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant", "name"], name="uniq_counter_name_per_tenant"
+            )
+        ]
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class QueueTicket(SyncedModel):
     class State(models.TextChoices):
         WAITING = "WAITING", "WAITING"
         IN_PROGRESS = "IN_PROGRESS", "IN_PROGRESS"
         DONE = "DONE", "DONE"
         SKIPPED = "SKIPPED", "SKIPPED"
 
+    # Target state -> states a ticket may enter it from.
+    TRANSITIONS = {
+        State.IN_PROGRESS: (State.WAITING,),
+        State.DONE: (State.IN_PROGRESS,),
+        State.SKIPPED: (State.WAITING, State.IN_PROGRESS),
+    }
+    FINISHED_STATES = (State.DONE, State.SKIPPED)
+    # Timestamp set when a ticket enters a state.
+    STAMPS = {
+        State.IN_PROGRESS: "called_at",
+        State.DONE: "finished_at",
+        State.SKIPPED: "finished_at",
+    }
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
     visit = models.ForeignKey(
@@ -20,15 +86,151 @@ class QueueTicket(models.Model):
     state = models.CharField(
         max_length=20, choices=State.choices, default=State.WAITING
     )
+    lane = models.CharField(max_length=20, blank=True, default="")
+    priority = models.PositiveSmallIntegerField(default=0)
+    queue_date = models.DateField(default=timezone.localdate)
+    counter = models.ForeignKey(
+        Counter,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="tickets",
+    )
     created_at = models.DateTimeField(default=timezone.now)
+    called_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Kept by save() and set explicitly by the UPDATEs in services.py.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = QueueTicketQuerySet.as_manager()
 
     class Meta:
         constraints = [
             models.UniqueConstraint(
-                fields=["tenant", "number"], name="uniq_queue_number_per_tenant"
+                fields=["tenant", "queue_date", "lane", "number"],
+                name="uniq_queue_number_per_lane_day",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["tenant", "created_at"],
+                condition=ACTIVE_TICKETS,
+                name="queue_active_idx",
+            ),
+            # Exactly the call-next ordering, with and without a lane filter.
+            models.Index(
+                fields=["tenant", "-priority", "created_at"],
+                condition=Q(state="WAITING"),
+                name="queue_waiting_idx",
+            ),
+            models.Index(
+                fields=["tenant", "lane", "-priority", "created_at"],
+                condition=Q(state="WAITING"),
+                name="queue_waiting_lane_idx",
+            ),
+            models.Index(
+                fields=["tenant", "change_seq", "id"], name="queue_tenant_change_idx"
+            ),
+        ]
         ordering = ["created_at"]
 
     def __str__(self) -> str:
         return f"{self.number} - {self.state}"
+
+
+class QueueTicketArchive(models.Model):
+    """Finished tickets moved off the hot table; mirrors QueueTicket's columns."""
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    visit = models.ForeignKey(
+        "admissions.Visit",
+        on_delete=models.CASCADE,
+        related_name="archived_queue_tickets",
+    )
+    number = models.PositiveIntegerField()
+    state = models.CharField(max_length=20, choices=QueueTicket.State.choices)
+    lane = models.CharField(max_length=20, blank=True, default="")
+    priority = models.PositiveSmallIntegerField(default=0)
+    queue_date = models.DateField()
+    counter = models.ForeignKey(
+        Counter,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="archived_tickets",
+    )
+    created_at = models.DateTimeField()
+    called_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField()
+    change_seq = models.BigIntegerField(default=0)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["tenant", "queue_date"], name="queue_archive_tenant_day_idx"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.queue_date} {self.number} - {self.state}"
+
+
+class QueueCounter(models.Model):
+    """Last queue number issued per tenant, day and lane."""
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    day = models.DateField()
+    lane = models.CharField(max_length=20, blank=True, default="")
+    value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant", "day", "lane"], name="uniq_queue_counter"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.lane}: {self.value}"
+
+
+class QueueWaitStat(models.Model):
+    """Hourly wait/service rollup per tenant and counter, kept as tickets finish.
+
+    Tickets are bucketed by queue day and local arrival hour. The histograms
+    hold counts per ``apps.queue.stats.BUCKETS`` bucket so percentiles can be
+    read without touching tickets.
+    """
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    day = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+    counter = models.ForeignKey(
+        Counter, null=True, blank=True, on_delete=models.CASCADE
+    )
+    served = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    wait_seconds = models.FloatField(default=0)
+    service_seconds = models.FloatField(default=0)
+    wait_histogram = models.JSONField(default=list)
+    service_histogram = models.JSONField(default=list)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant", "day", "hour", "counter"],
+                condition=Q(counter__isnull=False),
+                name="uniq_wait_stat_counter",
+            ),
+            models.UniqueConstraint(
+                fields=["tenant", "day", "hour"],
+                condition=Q(counter__isnull=True),
+                name="uniq_wait_stat_no_counter",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.hour:02d}h: {self.served} served"
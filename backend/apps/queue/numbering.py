@@ -0,0 +1,45 @@
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import QueueCounter
+
+# Both backends support INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+# (SQLite since 3.35), so a number costs one statement.
+UPSERT_VENDORS = ("postgresql", "sqlite")
+
+
+def _prep(field_name, value):
+    field = QueueCounter._meta.get_field(field_name)
+    return field.get_db_prep_value(value, connection)
+
+
+def allocate_numbers(tenant, count=1, lane="", day=None):
+    """Reserve ``count`` consecutive queue numbers and return the first.
+
+    The counter row stays locked until the surrounding transaction ends,
+    so call this inside the same ``transaction.atomic()`` block that
+    inserts the tickets to keep numbering gap-free.
+    """
+    day = day or timezone.localdate()
+    if connection.vendor in UPSERT_VENDORS:
+        table = connection.ops.quote_name(QueueCounter._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (tenant_id, day, lane, value) "
+                "VALUES (%s, %s, %s, %s) "
+                "ON CONFLICT (tenant_id, day, lane) "
+                f"DO UPDATE SET value = {table}.value + excluded.value "
+                "RETURNING value",
+                [_prep("tenant", tenant.pk), _prep("day", day), lane, count],
+            )
+            last = cursor.fetchone()[0]
+        return last - count + 1
+
+    with transaction.atomic():
+        counter, _ = QueueCounter.objects.select_for_update().get_or_create(
+            tenant=tenant, day=day, lane=lane
+        )
+        QueueCounter.objects.filter(pk=counter.pk).update(value=F("value") + count)
+        counter.refresh_from_db(fields=["value"])
+    return counter.value - count + 1
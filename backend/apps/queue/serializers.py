@@ -1,13 +1,113 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F
 from rest_framework import serializers
-from .models import QueueTicket
+from rest_framework.fields import get_attribute
+from .models import Counter, QueueTicket
+from .stats import GROUPS
+from rme_core.projection import Projection
+
+
+class AnnotationField(serializers.CharField):
+    """Read-only string from a queryset annotation that must be present.
+
+    A plain read-only field would silently drop the key when a caller
+    forgets the annotation.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(read_only=True, **kwargs)
+
+    def get_attribute(self, instance):
+        try:
+            return get_attribute(instance, self.source_attrs)
+        except (AttributeError, KeyError):
+            raise ImproperlyConfigured(
+                f"{type(instance).__name__} has no {self.source!r} annotation."
+            )
 
 
 class QueueTicketSerializer(serializers.ModelSerializer):
-    patient_name = serializers.CharField(
-        source="visit.patient.full_name", read_only=True
-    )
+    # Projected by QueueTicket.objects.board() / with_patient_name() so
+    # rendering never walks visit.patient per row.
+    patient_name = AnnotationField()
+    counter = serializers.UUIDField(source="counter_id", read_only=True)
 
     class Meta:
         model = QueueTicket
-        fields = ["id", "number", "state", "patient_name"]
+        fields = [
+            "id",
+            "number",
+            "state",
+            "lane",
+            "priority",
+            "patient_name",
+            "counter",
+        ]
         read_only_fields = fields
+
+
+ticket_projection = Projection(
+    QueueTicketSerializer, patient_name=F("visit__patient__full_name")
+)
+
+
+class CounterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Counter
+        fields = ["id", "name", "is_active"]
+        read_only_fields = ["id"]
+
+    def validate_name(self, value):
+        tenant = self.context["request"].tenant
+        taken = Counter.objects.filter(tenant=tenant, name=value)
+        if self.instance is not None:
+            taken = taken.exclude(pk=self.instance.pk)
+        if taken.exists():
+            raise serializers.ValidationError("A counter with this name exists.")
+        return value
+
+
+class QueueNextSerializer(serializers.Serializer):
+    counter = serializers.UUIDField(required=False, allow_null=True)
+    lane = serializers.CharField(max_length=20, required=False, allow_blank=True)
+
+    def validate_counter(self, value):
+        if value is None:
+            return None
+        tenant = self.context["request"].tenant
+        try:
+            return Counter.objects.get(pk=value, tenant=tenant, is_active=True)
+        except Counter.DoesNotExist:
+            raise serializers.ValidationError("Unknown or inactive counter.")
+
+
+class QueueCloseDaySerializer(serializers.Serializer):
+    day = serializers.DateField(required=False)
+
+
+class QueueCloseDayResultSerializer(serializers.Serializer):
+    skipped = serializers.IntegerField()
+
+
+class QueueStatsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    group = serializers.ChoiceField(choices=GROUPS, default="day")
+    counter = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("start") and attrs.get("end") and attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError("start must not be after end.")
+        return attrs
+
+
+class QueueStatSerializer(serializers.Serializer):
+    day = serializers.DateField()
+    counter = serializers.UUIDField(required=False)
+    hour = serializers.IntegerField(required=False)
+    served = serializers.IntegerField()
+    skipped = serializers.IntegerField()
+    avg_wait = serializers.FloatField(allow_null=True)
+    p90_wait = serializers.FloatField(allow_null=True)
+    avg_service = serializers.FloatField(allow_null=True)
+    p90_service = serializers.FloatField(allow_null=True)
@@ -0,0 +1,244 @@
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from .models import QueueTicket
+from .stats import record_finished, record_skipped
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.sync.models import ChangeCounter
+from apps.tenants.cache import QUEUE, bump
+
+# Backends that can return the updated row from the UPDATE itself.
+RETURNING_VENDORS = ("postgresql", "sqlite")
+
+
+class InvalidTransition(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Ticket cannot move to that state."
+    default_code = "invalid_transition"
+
+
+def claim_next(tenant, counter=None, lane=None):
+    """Move the next WAITING ticket to IN_PROGRESS for ``counter``.
+
+    The next ticket is the oldest of the highest priority, optionally within
+    one ``lane``; ``queue_waiting_idx``/``queue_waiting_lane_idx`` match
+    that ordering, so the pick is a single index seek.
+
+    On PostgreSQL concurrent callers skip rows another transaction has
+    locked, so every counter claims a different ticket without waiting on
+    the same row lock. SQLite has no row locks; there the claim is a single
+    ``UPDATE ... RETURNING`` serialized by the database write lock.
+    Returns the ticket annotated with ``patient_name``, or None.
+    """
+    if connection.features.has_select_for_update_skip_locked:
+        return _claim_skip_locked(tenant, counter, lane)
+    return _claim_single_statement(tenant, counter, lane)
+
+
+def _waiting(tenant, lane=None):
+    tickets = QueueTicket.objects.filter(tenant=tenant, state=QueueTicket.State.WAITING)
+    if lane is not None:
+        tickets = tickets.filter(lane=lane)
+    return tickets.order_by("-priority", "created_at")
+
+
+def _claim_skip_locked(tenant, counter, lane):
+    with transaction.atomic():
+        # The change sequence before any row lock: PostgreSQL's takes no
+        # lock, but where the counter row is locked every synced write
+        # takes it first. An empty queue just leaves a gap in the sequence.
+        change_seq = ChangeCounter.objects.allocate(tenant.id)
+        ticket = (
+            _waiting(tenant, lane)
+            .with_patient_name()
+            .select_for_update(skip_locked=True, of=("self",))
+            .first()
+        )
+        if ticket is None:
+            return None
+        ticket.state = QueueTicket.State.IN_PROGRESS
+        ticket.counter = counter
+        ticket.called_at = timezone.now()
+        ticket.change_seq = change_seq
+        ticket.save(
+            update_fields=["state", "counter", "called_at", "updated_at", "change_seq"]
+        )
+    return ticket
+
+
+def _prep(field_name, value):
+    field = QueueTicket._meta.get_field(field_name)
+    return field.get_db_prep_value(value, connection)
+
+
+def _claim_single_statement(tenant, counter, lane):
+    table = connection.ops.quote_name(QueueTicket._meta.db_table)
+    pick, pick_params = _waiting(tenant, lane).values("pk")[:1].query.sql_with_params()
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET state = %s, counter_id = %s, called_at = %s, "
+            f"updated_at = %s, change_seq = %s WHERE id = ({pick}) RETURNING id",
+            [
+                QueueTicket.State.IN_PROGRESS,
+                _prep("counter", counter.pk if counter else None),
+                _prep("called_at", now),
+                _prep("updated_at", now),
+                ChangeCounter.objects.allocate(tenant.id),
+                *pick_params,
+            ],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    bump(tenant.id, QUEUE)
+    return QueueTicket.objects.with_patient_name().get(
+        pk=QueueTicket._meta.pk.to_python(row[0])
+    )
+
+
+def _stamps(stamp, change_seq):
+    """``stamp`` and ``updated_at`` set to now, for queryset ``update()``."""
+    now = timezone.now()
+    return {stamp: now, "updated_at": now, "change_seq": change_seq}
+
+
+def _parse_pk(pk):
+    try:
+        return QueueTicket._meta.pk.to_python(pk)
+    except ValidationError:
+        raise NotFound()
+
+
+def transition(tenant, pk, target):
+    """Move ticket ``pk`` to ``target`` if its current state allows it.
+
+    The state check and the write are one conditional ``UPDATE``; the row
+    comes back shaped like ``QueueTicket.objects.projected()``. A rejected
+    transition costs one extra indexed lookup to tell 404 from 409.
+    Finishing a ticket also folds it into the wait-time rollup.
+    """
+    pk = _parse_pk(pk)
+    sources = QueueTicket.TRANSITIONS[target]
+    stamp = QueueTicket.STAMPS[target]
+    with transaction.atomic():
+        change_seq = ChangeCounter.objects.allocate(tenant.id)
+        if connection.vendor in RETURNING_VENDORS:
+            row = _update_returning(tenant, pk, target, sources, stamp, change_seq)
+        else:
+            updated = QueueTicket.objects.filter(
+                pk=pk, tenant=tenant, state__in=sources
+            ).update(state=target, **_stamps(stamp, change_seq))
+            row = (
+                QueueTicket.objects.filter(pk=pk).projected().get() if updated else None
+            )
+        if row is not None:
+            bump(tenant.id, QUEUE)
+        if row is not None and target in QueueTicket.FINISHED_STATES:
+            record_finished(pk)
+    if row is not None:
+        return row
+    state = (
+        QueueTicket.objects.filter(pk=pk, tenant=tenant)
+        .values_list("state", flat=True)
+        .first()
+    )
+    if state is None:
+        raise NotFound()
+    raise InvalidTransition(f"Ticket is {state}; cannot move to {target}.")
+
+
+def _update_returning(tenant, pk, target, sources, stamp, change_seq):
+    quote = connection.ops.quote_name
+    table = quote(QueueTicket._meta.db_table)
+    visits = quote(Visit._meta.db_table)
+    patients = quote(Patient._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(sources))
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET state = %s, {quote(stamp)} = %s, updated_at = %s, "
+            "change_seq = %s "
+            f"WHERE id = %s AND tenant_id = %s AND state IN ({placeholders}) "
+            "RETURNING id, number, state, lane, priority, counter_id, "
+            f"(SELECT p.full_name FROM {visits} v JOIN {patients} p "
+            f"ON p.id = v.patient_id WHERE v.id = {table}.visit_id)",
+            [
+                target,
+                _prep(stamp, now),
+                _prep("updated_at", now),
+                change_seq,
+                _prep("id", pk),
+                _prep("tenant", tenant.pk),
+                *sources,
+            ],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return {
+        "id": _from_db("id", row[0]),
+        "number": row[1],
+        "state": row[2],
+        "lane": row[3],
+        "priority": row[4],
+        "counter_id": _from_db("counter", row[5]),
+        "patient_name": row[6],
+    }
+
+
+def _from_db(field_name, value):
+    field = QueueTicket._meta.get_field(field_name)
+    if field.is_relation:
+        field = field.target_field
+    return None if value is None else field.to_python(value)
+
+
+def bulk_transition(queryset, target, change_seq):
+    """Move every ticket in ``queryset`` that may enter ``target``; one UPDATE.
+
+    ``queryset`` holds one tenant's tickets and ``change_seq`` comes from
+    that tenant's counter. Callers bump the tenant's queue cache.
+    """
+    sources = QueueTicket.TRANSITIONS[target]
+    stamp = QueueTicket.STAMPS[target]
+    return queryset.filter(state__in=sources).update(
+        state=target, **_stamps(stamp, change_seq)
+    )
+
+
+def close_day(tenant=None, day=None):
+    """Skip WAITING tickets issued on or before ``day`` (default today).
+
+    ``tenant=None`` closes every tenant in one transaction, for cron, with
+    one ``UPDATE`` per tenant so each is stamped from its own counter.
+    """
+    day = day or timezone.localdate()
+    tickets = QueueTicket.objects.filter(
+        state=QueueTicket.State.WAITING, queue_date__lte=day
+    )
+    if tenant is not None:
+        tickets = tickets.filter(tenant=tenant)
+    with transaction.atomic():
+        if tenant is not None:
+            tenant_ids = [tenant.id]
+        else:
+            tenant_ids = list(
+                tickets.order_by("tenant_id")
+                .values_list("tenant_id", flat=True)
+                .distinct()
+            )
+        record_skipped(tickets)
+        skipped = 0
+        for tenant_id in tenant_ids:
+            skipped += bulk_transition(
+                tickets.filter(tenant_id=tenant_id),
+                QueueTicket.State.SKIPPED,
+                ChangeCounter.objects.allocate(tenant_id),
+            )
+            bump(tenant_id, QUEUE)
+        return skipped
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.admissions.models import Visit
+from apps.tenants.cache import QUEUE, bump
+from .models import Counter, QueueTicket
+
+
+# No post_delete on QueueTicket: a receiver would stop Django from
+# fast-deleting tickets, and the only bulk deleter (archive_tickets) bumps
+# once per tenant per batch. Deleting a visit cascades to its tickets.
+@receiver(post_save, sender=QueueTicket)
+@receiver(post_delete, sender=Counter)
+@receiver(post_delete, sender=Visit)
+def invalidate_queue_reads(sender, instance, **kwargs):
+    bump(instance.tenant_id, QUEUE)
@@ -0,0 +1,141 @@
+import bisect
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.db.models.functions import ExtractHour
+from django.utils import timezone
+
+from .models import QueueTicket, QueueWaitStat
+
+# Histogram upper bounds in seconds; the last bucket is open-ended.
+BUCKETS = (30, 60, 120, 300, 600, 900, 1200, 1800, 2700, 3600, 5400, 7200, 10800)
+GROUPS = ("day", "counter", "hour")
+
+
+def bucket(seconds):
+    return bisect.bisect_left(BUCKETS, seconds)
+
+
+def _stat_for_update(tenant_id, day, hour, counter_id):
+    key = {"tenant_id": tenant_id, "day": day, "hour": hour, "counter_id": counter_id}
+    stats = QueueWaitStat.objects.select_for_update()
+    stat = stats.filter(**key).first()
+    if stat is not None:
+        return stat
+    try:
+        with transaction.atomic():
+            return QueueWaitStat.objects.create(**key)
+    except IntegrityError:
+        return stats.get(**key)
+
+
+def _add(histogram, seconds):
+    histogram = histogram or [0] * (len(BUCKETS) + 1)
+    histogram[bucket(seconds)] += 1
+    return histogram
+
+
+@transaction.atomic
+def record_finished(ticket_id):
+    """Fold a ticket that just became DONE or SKIPPED into its hourly rollup."""
+    ticket = QueueTicket.objects.values(
+        "tenant_id",
+        "queue_date",
+        "counter_id",
+        "state",
+        "created_at",
+        "called_at",
+        "finished_at",
+    ).get(pk=ticket_id)
+    stat = _stat_for_update(
+        ticket["tenant_id"],
+        ticket["queue_date"],
+        timezone.localtime(ticket["created_at"]).hour,
+        ticket["counter_id"],
+    )
+    if ticket["state"] == QueueTicket.State.DONE and ticket["called_at"]:
+        wait = (ticket["called_at"] - ticket["created_at"]).total_seconds()
+        service = (ticket["finished_at"] - ticket["called_at"]).total_seconds()
+        stat.served += 1
+        stat.wait_seconds += wait
+        stat.service_seconds += service
+        stat.wait_histogram = _add(stat.wait_histogram, wait)
+        stat.service_histogram = _add(stat.service_histogram, service)
+    else:
+        stat.skipped += 1
+    stat.save()
+
+
+@transaction.atomic
+def record_skipped(tickets):
+    """Count a queryset of tickets about to be bulk-skipped; one grouped query."""
+    groups = (
+        tickets.annotate(hour=ExtractHour("created_at"))
+        .values("tenant_id", "queue_date", "hour", "counter_id")
+        .annotate(n=Count("pk"))
+        .order_by()
+    )
+    for group in groups:
+        stat = _stat_for_update(
+            group["tenant_id"], group["queue_date"], group["hour"], group["counter_id"]
+        )
+        stat.skipped += group["n"]
+        stat.save(update_fields=["skipped"])
+
+
+def percentile(histogram, fraction):
+    """Estimate a percentile by interpolating inside the matching bucket."""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = fraction * total
+    seen = 0
+    for i, count in enumerate(histogram):
+        if count and seen + count >= target:
+            lower = BUCKETS[i - 1] if i else 0
+            if i == len(BUCKETS):
+                return float(lower)
+            return lower + (BUCKETS[i] - lower) * (target - seen) / count
+        seen += count
+    return None
+
+
+def _merge(histograms):
+    merged = [0] * (len(BUCKETS) + 1)
+    for histogram in histograms:
+        for i, count in enumerate(histogram):
+            merged[i] += count
+    return merged
+
+
+def _sort_key(key):
+    return tuple((value is None, value if value is not None else 0) for value in key)
+
+
+def summarize(stats, group="day"):
+    """Merge rollup rows into per-``group`` averages and p90s (seconds)."""
+    keys = {"day": ("day",), "counter": ("day", "counter_id"), "hour": ("day", "hour")}
+    buckets = defaultdict(list)
+    for stat in stats:
+        buckets[tuple(getattr(stat, k) for k in keys[group])].append(stat)
+    results = []
+    for key, rows in sorted(buckets.items(), key=lambda item: _sort_key(item[0])):
+        served = sum(r.served for r in rows)
+        wait = _merge(r.wait_histogram for r in rows)
+        service = _merge(r.service_histogram for r in rows)
+        result = dict(zip(keys[group], key))
+        if "counter_id" in result:
+            result["counter"] = result.pop("counter_id")
+        result.update(
+            served=served,
+            skipped=sum(r.skipped for r in rows),
+            avg_wait=sum(r.wait_seconds for r in rows) / served if served else None,
+            p90_wait=percentile(wait, 0.9),
+            avg_service=(
+                sum(r.service_seconds for r in rows) / served if served else None
+            ),
+            p90_service=percentile(service, 0.9),
+        )
+        results.append(result)
+    return results
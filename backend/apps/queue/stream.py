@@ -0,0 +1,106 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseForbidden, StreamingHttpResponse
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from apps.tenants.registry import registry
+from apps.users.authentication import TenantJWTAuthentication
+from apps.users.models import User
+from .events import get_broker
+
+STREAM_ROLES = [
+    User.Role.ADMIN,
+    User.Role.DOCTOR,
+    User.Role.NURSE,
+    User.Role.STAFF,
+]
+KEEPALIVE_SECONDS = 15
+WEBSOCKET_PATH = "/api/queue/ws/"
+
+
+def authenticate_token(raw_token, tenant):
+    """Return the token user if it may watch ``tenant``'s queue, else None.
+
+    Browsers cannot set headers on EventSource or WebSocket, so both
+    channels also accept the access token as a ``token`` query parameter.
+    """
+    if not raw_token or tenant is None:
+        return None
+    auth = TenantJWTAuthentication()
+    try:
+        user = auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    if user.tenant_id != tenant.id or user.role not in STREAM_ROLES:
+        return None
+    return user
+
+
+def format_sse(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def sse_events(tenant_id, keepalive=KEEPALIVE_SECONDS):
+    async with get_broker().subscribe(tenant_id) as queue:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+
+
+async def queue_stream(request):
+    """Server-Sent Events feed of ticket deltas for the request tenant."""
+    header = request.headers.get("Authorization", "")
+    raw_token = header[7:] if header.startswith("Bearer ") else None
+    raw_token = raw_token or request.GET.get("token")
+    tenant = getattr(request, "tenant", None)
+    user = await sync_to_async(authenticate_token)(raw_token, tenant)
+    if user is None:
+        return HttpResponseForbidden()
+    response = StreamingHttpResponse(
+        sse_events(tenant.id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class QueueWebSocketApp:
+    """ASGI WebSocket endpoint pushing the same deltas as the SSE feed."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["path"] != WEBSOCKET_PATH:
+            await send({"type": "websocket.close", "code": 4404})
+            return
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+        params = parse_qs(scope.get("query_string", b"").decode())
+        tenant_id = params.get("tenant", [None])[0]
+        tenant = await sync_to_async(registry.get_by_id)(tenant_id)
+        user = await sync_to_async(authenticate_token)(
+            params.get("token", [None])[0], tenant
+        )
+        if user is None:
+            await send({"type": "websocket.close", "code": 4403})
+            return
+        await send({"type": "websocket.accept"})
+        async with get_broker().subscribe(tenant.id) as queue:
+            forward = asyncio.create_task(self.forward(queue, send))
+            try:
+                while (await receive())["type"] != "websocket.disconnect":
+                    pass
+            finally:
+                forward.cancel()
+
+    async def forward(self, queue, send):
+        while True:
+            event = await queue.get()
+            await send({"type": "websocket.send", "text": json.dumps(event)})
@@ -0,0 +1,107 @@
+import datetime
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.archive import archive_tickets
+from apps.queue.models import QueueTicket, QueueTicketArchive
+from apps.sync.models import Tombstone
+from apps.tenants.cache import QUEUE, get_version
+from apps.tenants.models import Tenant
+
+State = QueueTicket.State
+
+
+class ArchiveTicketsTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        self.patient = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi", mrn="1"
+        )
+        self.today = datetime.date.today()
+        self.yesterday = self.today - datetime.timedelta(days=1)
+
+    def ticket(self, state, day, number=1):
+        visit = Visit.objects.create(tenant=self.tenant, patient=self.patient)
+        return QueueTicket.objects.create(
+            tenant=self.tenant, visit=visit, number=number, state=state, queue_date=day
+        )
+
+    def test_moves_only_finished_tickets_from_past_days(self):
+        done = self.ticket(State.DONE, self.yesterday, 1)
+        skipped = self.ticket(State.SKIPPED, self.yesterday, 2)
+        waiting = self.ticket(State.WAITING, self.yesterday, 3)
+        done_today = self.ticket(State.DONE, self.today)
+
+        self.assertEqual(archive_tickets(batch_size=1), 2)
+
+        self.assertEqual(
+            set(QueueTicket.objects.values_list("pk", flat=True)),
+            {waiting.pk, done_today.pk},
+        )
+        archived = QueueTicketArchive.objects.in_bulk()
+        self.assertEqual(set(archived), {done.pk, skipped.pk})
+        self.assertEqual(archived[done.pk].number, 1)
+        self.assertEqual(archived[done.pk].state, State.DONE)
+        self.assertEqual(archived[done.pk].created_at, done.created_at)
+        self.assertEqual(archived[done.pk].visit_id, done.visit_id)
+
+    @override_settings(RESPONSE_CACHE={"CACHE": "default", "TTL": 300})
+    def test_bumps_the_queue_cache_once_per_tenant(self):
+        for number in range(1, 4):
+            self.ticket(State.DONE, self.yesterday, number)
+        before = get_version(self.tenant.id, QUEUE)
+        archive_tickets()
+        self.assertEqual(get_version(self.tenant.id, QUEUE), before + 1)
+
+    def test_statements_per_batch_do_not_grow_with_its_size(self):
+        other = Tenant.objects.create(name="O", subdomain="o")
+        patient = Patient.objects.create(tenant=other, full_name="Siti", mrn="1")
+        counts = []
+        for size in (2, 20):
+            tickets = [self.ticket(State.DONE, self.yesterday, n) for n in range(size)]
+            visit = Visit.objects.create(tenant=other, patient=patient)
+            QueueTicket.objects.create(
+                tenant=other,
+                visit=visit,
+                number=1,
+                state=State.DONE,
+                queue_date=self.yesterday,
+            )
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(archive_tickets(), size + 1)
+            counts.append(len(ctx.captured_queries))
+            self.assertEqual(
+                set(
+                    Tombstone.objects.filter(
+                        tenant=self.tenant, object_id__in=[t.pk for t in tickets]
+                    ).values_list("kind", flat=True)
+                ),
+                {Tombstone.Kind.QUEUE_TICKET},
+            )
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(Tombstone.objects.filter(tenant=other).count(), 2)
+
+    def test_archive_mirrors_ticket_columns(self):
+        ticket_columns = {f.column for f in QueueTicket._meta.concrete_fields}
+        archive_columns = {f.column for f in QueueTicketArchive._meta.concrete_fields}
+        self.assertEqual(archive_columns - ticket_columns, {"archived_at"})
+        self.assertEqual(ticket_columns - archive_columns, set())
+
+    def test_board_shows_active_tickets_only(self):
+        for number, state in enumerate(State.values, 1):
+            self.ticket(state, self.today, number)
+        states = {row["state"] for row in QueueTicket.objects.board(self.tenant)}
+        self.assertEqual(states, {State.WAITING, State.IN_PROGRESS})
+
+    def test_archive_queue_command(self):
+        self.ticket(State.DONE, self.yesterday)
+        out = io.StringIO()
+        call_command("archive_queue", "--keep-days", "1", stdout=out)
+        self.assertIn("Archived 0", out.getvalue())
+        call_command("archive_queue", stdout=out)
+        self.assertFalse(QueueTicket.objects.exists())
@@ -0,0 +1,118 @@
+import threading
+import unittest
+
+from django.db import connection, connections
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import Counter, QueueTicket
+from apps.queue.services import claim_next
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+
+def seed_tickets(tenant, count):
+    patient = Patient.objects.create(tenant=tenant, full_name="Budi", mrn="1")
+    for number in range(1, count + 1):
+        visit = Visit.objects.create(tenant=tenant, patient=patient)
+        QueueTicket.objects.create(tenant=tenant, visit=visit, number=number)
+
+
+class CounterApiTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        self.other = Tenant.objects.create(name="O", subdomain="o")
+        for username, role in (("admin", User.Role.ADMIN), ("staff", User.Role.STAFF)):
+            User.objects.create_user(
+                username=username, password="pass", tenant=self.tenant, role=role
+            )
+
+    def headers(self, username):
+        token = self.client.post(
+            reverse("login"),
+            {"username": username, "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        return {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+
+    def test_admin_manages_counters_staff_reads(self):
+        admin, staff = self.headers("admin"), self.headers("staff")
+        resp = self.client.post("/api/counters/", {"name": "Poli Umum"}, **admin)
+        self.assertEqual(resp.status_code, 201)
+        resp = self.client.post("/api/counters/", {"name": "Poli Umum"}, **admin)
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post("/api/counters/", {"name": "Poli Gigi"}, **staff)
+        self.assertEqual(resp.status_code, 403)
+        Counter.objects.create(tenant=self.other, name="Elsewhere")
+        resp = self.client.get("/api/counters/", **staff)
+        self.assertEqual([c["name"] for c in resp.json()], ["Poli Umum"])
+
+    def test_next_assigns_ticket_to_counter(self):
+        seed_tickets(self.tenant, 2)
+        room = Counter.objects.create(tenant=self.tenant, name="Room 1")
+        staff = self.headers("staff")
+        resp = self.client.post("/api/queue/next/", {"counter": room.id}, **staff)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["counter"], str(room.id))
+        self.assertEqual(resp.json()["number"], 1)
+        resp = self.client.post("/api/queue/next/", **staff)
+        self.assertEqual(resp.json()["counter"], None)
+        self.assertEqual(resp.json()["number"], 2)
+
+    def test_next_rejects_foreign_or_inactive_counter(self):
+        seed_tickets(self.tenant, 1)
+        staff = self.headers("staff")
+        foreign = Counter.objects.create(tenant=self.other, name="Room 1")
+        closed = Counter.objects.create(
+            tenant=self.tenant, name="Room 2", is_active=False
+        )
+        for counter in (foreign, closed):
+            resp = self.client.post(
+                "/api/queue/next/", {"counter": counter.id}, **staff
+            )
+            self.assertEqual(resp.status_code, 400)
+        self.assertEqual(QueueTicket.objects.get().state, QueueTicket.State.WAITING)
+
+
+@unittest.skipUnless(
+    connection.features.test_db_allows_multiple_connections,
+    "Needs concurrent connections; runs in the backend-postgres CI job",
+)
+class ConcurrentClaimTests(TransactionTestCase):
+    callers = 8
+    per_caller = 5
+
+    def test_each_caller_claims_distinct_tickets(self):
+        tenant = Tenant.objects.create(name="T", subdomain="t")
+        seed_tickets(tenant, self.callers * self.per_caller)
+        counters = [
+            Counter.objects.create(tenant=tenant, name=f"Room {i}")
+            for i in range(self.callers)
+        ]
+        barrier = threading.Barrier(self.callers)
+        claimed = []
+
+        def worker(counter):
+            barrier.wait()
+            try:
+                for _ in range(self.per_caller):
+                    claimed.append(claim_next(tenant, counter).pk)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(c,)) for c in counters]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(claimed)), self.callers * self.per_caller)
+        self.assertFalse(
+            QueueTicket.objects.filter(state=QueueTicket.State.WAITING).exists()
+        )
+        self.assertIsNone(claim_next(tenant))
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from apps.patients.models import Patient
+from apps.queue.events import InMemoryBroker, RedisBroker, get_broker
+from apps.queue.stream import QueueWebSocketApp
+
+
+class InMemoryBrokerTests(TestCase):
+    async def test_fan_out_is_scoped_per_tenant(self):
+        broker = InMemoryBroker(max_pending=2)
+        async with broker.subscribe("a") as a, broker.subscribe("b") as b:
+            thread = threading.Thread(target=broker.publish, args=("a", {"n": 1}))
+            thread.start()
+            thread.join()
+            self.assertEqual(await asyncio.wait_for(a.get(), 1), {"n": 1})
+            self.assertTrue(b.empty())
+            for n in range(3):
+                broker.publish("a", {"n": n})
+            await asyncio.sleep(0)
+            self.assertEqual(a.qsize(), 2)
+        self.assertEqual(broker._subscribers, {})
+
+    @override_settings(
+        QUEUE_EVENTS={
+            "BROKER": "apps.queue.events.RedisBroker",
+            "OPTIONS": {"url": "redis://cache:6379/1"},
+        }
+    )
+    def test_broker_follows_the_setting(self):
+        broker = get_broker()
+        self.assertIsInstance(broker, RedisBroker)
+        self.assertEqual(broker.url, "redis://cache:6379/1")
+
+
+@override_settings(
+    QUEUE_EVENTS={"BROKER": "apps.queue.events.InMemoryBroker", "OPTIONS": {}}
+)
+class QueuePushTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        self.token = self.client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.patient = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi", mrn="1"
+        )
+
+    def check_in(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/admissions/checkin/",
+                {"patient_id": str(self.patient.id)},
+                HTTP_AUTHORIZATION=f"Bearer {self.token}",
+                HTTP_X_TENANT_ID=str(self.tenant.id),
+            ).json()
+
+    async def test_checkin_and_next_broadcast_deltas(self):
+        async with get_broker().subscribe(self.tenant.id) as queue:
+            ticket = await sync_to_async(self.check_in)()
+            event = await asyncio.wait_for(queue.get(), 1)
+            self.assertEqual(event, {"type": "ticket.created", "ticket": ticket})
+
+            def call_next():
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.client.post(
+                        "/api/queue/next/",
+                        HTTP_AUTHORIZATION=f"Bearer {self.token}",
+                        HTTP_X_TENANT_ID=str(self.tenant.id),
+                    )
+
+            await sync_to_async(call_next)()
+            event = await asyncio.wait_for(queue.get(), 1)
+            self.assertEqual(event["type"], "ticket.updated")
+            self.assertEqual(event["ticket"]["state"], "IN_PROGRESS")
+
+    async def test_sse_stream(self):
+        response = await self.async_client.get(
+            f"/api/queue/stream/?tenant={self.tenant.id}&token={self.token}"
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        ticket = await sync_to_async(self.check_in)()
+        chunk = (await asyncio.wait_for(anext(stream), 1)).decode()
+        self.assertTrue(chunk.startswith("event: ticket.created\n"))
+        self.assertEqual(json.loads(chunk.split("data: ")[1])["ticket"], ticket)
+        await stream.aclose()
+
+    async def test_sse_requires_token(self):
+        response = await self.async_client.get(
+            f"/api/queue/stream/?tenant={self.tenant.id}"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    async def test_websocket(self):
+        inbox, outbox = asyncio.Queue(), asyncio.Queue()
+        scope = {
+            "type": "websocket",
+            "path": "/api/queue/ws/",
+            "query_string": f"tenant={self.tenant.id}&token={self.token}".encode(),
+        }
+        app = asyncio.create_task(QueueWebSocketApp()(scope, inbox.get, outbox.put))
+        await inbox.put({"type": "websocket.connect"})
+        accepted = await asyncio.wait_for(outbox.get(), 1)
+        self.assertEqual(accepted["type"], "websocket.accept")
+        ticket = await sync_to_async(self.check_in)()
+        message = await asyncio.wait_for(outbox.get(), 1)
+        self.assertEqual(json.loads(message["text"])["ticket"], ticket)
+        await inbox.put({"type": "websocket.disconnect"})
+        await asyncio.wait_for(app, 1)
+
+    async def test_websocket_rejects_bad_token(self):
+        inbox, outbox = asyncio.Queue(), asyncio.Queue()
+        scope = {
+            "type": "websocket",
+            "path": "/api/queue/ws/",
+            "query_string": f"tenant={self.tenant.id}&token=nope".encode(),
+        }
+        await inbox.put({"type": "websocket.connect"})
+        await QueueWebSocketApp()(scope, inbox.get, outbox.put)
+        self.assertEqual((await outbox.get())["code"], 4403)
@@ -0,0 +1,75 @@
+import unittest
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.patients.models import Patient
+from apps.queue.services import _waiting
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+
+class PriorityLaneTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.auth_headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.patients = 0
+
+    def check_in(self, **data):
+        self.patients += 1
+        patient = Patient.objects.create(
+            tenant=self.tenant, full_name=f"P{self.patients}", mrn=str(self.patients)
+        )
+        return self.client.post(
+            "/api/admissions/checkin/",
+            {"patient_id": str(patient.id), **data},
+            **self.auth_headers,
+        ).json()
+
+    def call_next(self, **data):
+        return self.client.post("/api/queue/next/", data, **self.auth_headers)
+
+    def test_checkin_numbers_per_lane_with_default_priority(self):
+        general = self.check_in()
+        elderly = self.check_in(lane="ELDERLY")
+        urgent = self.check_in(lane="BPJS", priority=7)
+        self.assertEqual((general["number"], general["priority"]), (1, 0))
+        self.assertEqual((elderly["number"], elderly["priority"]), (1, 50))
+        self.assertEqual((urgent["lane"], urgent["priority"]), ("BPJS", 7))
+        self.assertEqual(self.check_in(lane="ELDERLY")["number"], 2)
+
+    def test_next_takes_highest_priority_then_oldest(self):
+        first = self.check_in()
+        elderly = self.check_in(lane="ELDERLY")
+        emergency = self.check_in(lane="EMERGENCY")
+        second = self.check_in()
+        order = [self.call_next().json()["id"] for _ in range(4)]
+        self.assertEqual(
+            order, [emergency["id"], elderly["id"], first["id"], second["id"]]
+        )
+        self.assertEqual(self.call_next().status_code, 404)
+
+    def test_next_filters_by_lane(self):
+        self.check_in(lane="EMERGENCY")
+        bpjs = self.check_in(lane="BPJS")
+        self.assertEqual(self.call_next(lane="BPJS").json()["id"], bpjs["id"])
+        self.assertEqual(self.call_next(lane="BPJS").status_code, 404)
+        self.assertEqual(self.call_next(lane="").status_code, 404)
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_next_pick_is_an_index_seek(self):
+        for lane in (None, "BPJS"):
+            plan = _waiting(self.tenant, lane).values("pk")[:1].explain()
+            self.assertIn("queue_waiting", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
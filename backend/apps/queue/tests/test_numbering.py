@@ -0,0 +1,100 @@
+import datetime
+import threading
+import unittest
+
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from apps.queue.numbering import allocate_numbers
+
+
+class AllocateNumbersTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        self.other = Tenant.objects.create(name="O", subdomain="o")
+
+    def test_sequential_and_per_tenant(self):
+        self.assertEqual(allocate_numbers(self.tenant), 1)
+        self.assertEqual(allocate_numbers(self.tenant), 2)
+        self.assertEqual(allocate_numbers(self.other), 1)
+
+    def test_block_allocation(self):
+        self.assertEqual(allocate_numbers(self.tenant, count=5), 1)
+        self.assertEqual(allocate_numbers(self.tenant), 6)
+
+    def test_numbers_reset_daily_and_per_lane(self):
+        today = datetime.date(2025, 1, 1)
+        tomorrow = today + datetime.timedelta(days=1)
+        allocate_numbers(self.tenant, count=3, day=today)
+        self.assertEqual(allocate_numbers(self.tenant, day=tomorrow), 1)
+        self.assertEqual(allocate_numbers(self.tenant, day=today, lane="BPJS"), 1)
+
+    def test_allocation_is_one_statement(self):
+        allocate_numbers(self.tenant)
+        with self.assertNumQueries(1):
+            allocate_numbers(self.tenant)
+
+
+@unittest.skipUnless(
+    connection.features.test_db_allows_multiple_connections,
+    "Needs concurrent connections; runs in the backend-postgres CI job",
+)
+class ConcurrentCheckInTests(TransactionTestCase):
+    workers = 8
+    per_worker = 5
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        self.patients = Patient.objects.bulk_create(
+            Patient(tenant=self.tenant, full_name=f"P{i}", mrn=str(i))
+            for i in range(self.workers * self.per_worker)
+        )
+
+    def test_simultaneous_checkins_get_unique_numbers(self):
+        client = APIClient()
+        token = client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        barrier = threading.Barrier(self.workers)
+        statuses = []
+
+        def worker(patients):
+            thread_client = APIClient()
+            barrier.wait()
+            try:
+                for patient in patients:
+                    resp = thread_client.post(
+                        "/api/admissions/checkin/",
+                        {"patient_id": str(patient.id)},
+                        HTTP_AUTHORIZATION=f"Bearer {token}",
+                        HTTP_X_TENANT_ID=str(self.tenant.id),
+                    )
+                    statuses.append(resp.status_code)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=worker, args=(self.patients[i :: self.workers],))
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = self.workers * self.per_worker
+        self.assertEqual(statuses, [201] * total)
+        numbers = sorted(QueueTicket.objects.values_list("number", flat=True))
+        self.assertEqual(numbers, list(range(1, total + 1)))
+        with transaction.atomic():
+            self.assertEqual(allocate_numbers(self.tenant), total + 1)
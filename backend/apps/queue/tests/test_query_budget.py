@@ -0,0 +1,77 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from apps.queue.serializers import QueueTicketSerializer
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+# Queries allowed for one board refresh, whatever the queue length.
+LIST_QUERY_BUDGET = 2
+
+
+class QueueListQueryBudgetTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.auth_headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.created = 0
+
+    def add_tickets(self, count):
+        for _ in range(count):
+            self.created += 1
+            patient = Patient.objects.create(
+                tenant=self.tenant, full_name=f"P{self.created}", mrn=str(self.created)
+            )
+            visit = Visit.objects.create(tenant=self.tenant, patient=patient)
+            QueueTicket.objects.create(
+                tenant=self.tenant, visit=visit, number=self.created
+            )
+
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/queue/", **self.auth_headers)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries), resp.json()
+
+    def test_list_query_count_is_constant(self):
+        self.add_tickets(5)
+        small, data = self.list_queries()
+        self.assertEqual(len(data), 5)
+        self.add_tickets(45)
+        large, data = self.list_queries()
+        self.assertEqual(len(data), 50)
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, LIST_QUERY_BUDGET)
+        self.assertEqual(data[0]["patient_name"], "P1")
+
+    def test_actions_render_patient_name_without_extra_queries(self):
+        self.add_tickets(1)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post("/api/queue/next/", **self.auth_headers)
+        self.assertEqual(resp.json()["patient_name"], "P1")
+        self.assertFalse(
+            [q for q in ctx.captured_queries if "patients_patient" in q["sql"]][1:]
+        )
+
+    def test_missing_patient_name_annotation_is_an_error(self):
+        self.add_tickets(1)
+        ticket = QueueTicket.objects.get()
+        with self.assertRaises(ImproperlyConfigured):
+            QueueTicketSerializer(ticket).data
+        data = QueueTicketSerializer(QueueTicket.objects.with_patient_name()[0]).data
+        self.assertEqual(data["patient_name"], "P1")
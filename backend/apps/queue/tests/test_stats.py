@@ -0,0 +1,103 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import Counter, QueueTicket, QueueWaitStat
+from apps.queue.services import claim_next, close_day, transition
+from apps.queue.stats import BUCKETS, percentile
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+State = QueueTicket.State
+
+
+class PercentileTests(TestCase):
+    def test_interpolates_within_bucket(self):
+        histogram = [0] * (len(BUCKETS) + 1)
+        self.assertIsNone(percentile(histogram, 0.9))
+        histogram[BUCKETS.index(600)] = 10  # (300, 600]
+        self.assertEqual(percentile(histogram, 0.9), 570)
+        histogram[-1] = 90
+        self.assertEqual(percentile(histogram, 0.9), BUCKETS[-1])
+
+
+class WaitStatsTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.auth_headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.patient = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi", mrn="1"
+        )
+        self.room = Counter.objects.create(tenant=self.tenant, name="Room 1")
+
+    def ticket(self, number, waited_minutes):
+        visit = Visit.objects.create(tenant=self.tenant, patient=self.patient)
+        created = timezone.now() - datetime.timedelta(minutes=waited_minutes)
+        return QueueTicket.objects.create(
+            tenant=self.tenant, visit=visit, number=number, created_at=created
+        )
+
+    def serve(self, number, waited_minutes):
+        self.ticket(number, waited_minutes)
+        ticket = claim_next(self.tenant, self.room)
+        transition(self.tenant, ticket.pk, State.DONE)
+        return ticket
+
+    def test_transitions_stamp_times_and_roll_up(self):
+        ticket = self.serve(1, 8)
+        ticket.refresh_from_db()
+        self.assertIsNotNone(ticket.called_at)
+        self.assertGreaterEqual(ticket.finished_at, ticket.called_at)
+        self.serve(2, 4)
+        skipped = self.ticket(3, 1)
+        transition(self.tenant, skipped.pk, State.SKIPPED)
+
+        # Tickets created a few minutes apart may straddle an hour boundary.
+        served = QueueWaitStat.objects.filter(counter=self.room)
+        self.assertEqual(sum(stat.served for stat in served), 2)
+        self.assertAlmostEqual(
+            sum(stat.wait_seconds for stat in served), 12 * 60, delta=5
+        )
+        self.assertEqual(sum(sum(stat.wait_histogram) for stat in served), 2)
+        self.assertEqual(QueueWaitStat.objects.get(counter=None).skipped, 1)
+
+    def test_close_day_counts_skipped(self):
+        self.ticket(1, 5)
+        self.ticket(2, 5)
+        close_day(self.tenant)
+        self.assertEqual(QueueWaitStat.objects.get().skipped, 2)
+
+    def test_stats_endpoint_reads_rollups(self):
+        self.serve(1, 8)
+        self.serve(2, 8)
+        with self.assertNumQueries(1):
+            resp = self.client.get("/api/queue/stats/", **self.auth_headers)
+        self.assertEqual(resp.status_code, 200)
+        (day,) = resp.json()
+        self.assertEqual(day["day"], str(timezone.localdate()))
+        self.assertEqual(day["served"], 2)
+        self.assertAlmostEqual(day["avg_wait"], 480, delta=5)
+        self.assertAlmostEqual(day["p90_wait"], 570, delta=1)
+        self.assertNotIn("counter", day)
+
+        resp = self.client.get("/api/queue/stats/?group=counter", **self.auth_headers)
+        self.assertEqual(resp.json()[0]["counter"], str(self.room.id))
+        resp = self.client.get(
+            "/api/queue/stats/?start=2020-01-02&end=2020-01-01", **self.auth_headers
+        )
+        self.assertEqual(resp.status_code, 400)
@@ -0,0 +1,119 @@
+import datetime
+import io
+import uuid
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from apps.queue.services import close_day, transition
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+State = QueueTicket.State
+
+
+def ticket_writes(ctx):
+    return [
+        q["sql"]
+        for q in ctx.captured_queries
+        if q["sql"].startswith('UPDATE "queue_queueticket"')
+    ]
+
+
+class TicketTransitionTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.auth_headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.patient = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi", mrn="1"
+        )
+
+    def ticket(self, state=State.WAITING, number=1, tenant=None, **kwargs):
+        tenant = tenant or self.tenant
+        visit = Visit.objects.create(tenant=tenant, patient=self.patient)
+        return QueueTicket.objects.create(
+            tenant=tenant, visit=visit, number=number, state=state, **kwargs
+        )
+
+    def test_transition_is_one_statement_and_returns_row(self):
+        ticket = self.ticket(State.IN_PROGRESS)
+        with CaptureQueriesContext(connection) as ctx:
+            row = transition(self.tenant, ticket.pk, State.DONE)
+        self.assertEqual(len(ticket_writes(ctx)), 1)
+        waiting = self.ticket(number=2)
+        with CaptureQueriesContext(connection) as ctx:
+            transition(self.tenant, waiting.pk, State.IN_PROGRESS)
+        statements = [q["sql"] for q in ctx.captured_queries]
+        statements = [sql for sql in statements if "SAVEPOINT" not in sql]
+        # The ticket UPDATE plus the change sequence allocation.
+        self.assertEqual(len(statements), 2)
+        self.assertIn('"sync_changecounter"', statements[0])
+        self.assertEqual(row["id"], ticket.pk)
+        self.assertEqual(row["state"], State.DONE)
+        self.assertEqual(row["patient_name"], "Budi")
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.state, State.DONE)
+
+    def test_illegal_transition_is_conflict(self):
+        ticket = self.ticket(State.DONE)
+        resp = self.client.post(f"/api/queue/{ticket.pk}/skip/", **self.auth_headers)
+        self.assertEqual(resp.status_code, 409)
+        waiting = self.ticket(number=2)
+        resp = self.client.post(f"/api/queue/{waiting.pk}/done/", **self.auth_headers)
+        self.assertEqual(resp.status_code, 409)
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.state, State.DONE)
+
+    def test_missing_or_foreign_ticket_is_not_found(self):
+        other = Tenant.objects.create(name="O", subdomain="o")
+        foreign = self.ticket(tenant=other)
+        for pk in (foreign.pk, uuid.uuid4(), "not-a-uuid"):
+            resp = self.client.post(f"/api/queue/{pk}/skip/", **self.auth_headers)
+            self.assertEqual(resp.status_code, 404)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.state, State.WAITING)
+
+    def test_skip_from_waiting_and_in_progress(self):
+        for number, state in enumerate((State.WAITING, State.IN_PROGRESS), 1):
+            ticket = self.ticket(state, number=number)
+            resp = self.client.post(
+                f"/api/queue/{ticket.pk}/skip/", **self.auth_headers
+            )
+            self.assertEqual(resp.json()["state"], State.SKIPPED)
+
+    def test_close_day_skips_stale_waiting_in_one_statement(self):
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        stale = self.ticket(queue_date=yesterday)
+        serving = self.ticket(State.IN_PROGRESS, number=2, queue_date=yesterday)
+        today = self.ticket(number=1)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(close_day(self.tenant, yesterday), 1)
+        self.assertEqual(len(ticket_writes(ctx)), 1)
+        states = dict(QueueTicket.objects.values_list("pk", "state"))
+        self.assertEqual(states[stale.pk], State.SKIPPED)
+        self.assertEqual(states[serving.pk], State.IN_PROGRESS)
+        self.assertEqual(states[today.pk], State.WAITING)
+
+        resp = self.client.post("/api/queue/close-day/", **self.auth_headers)
+        self.assertEqual(resp.json(), {"skipped": 1})
+
+    def test_close_queue_day_command(self):
+        self.ticket()
+        call_command("close_queue_day", stdout=io.StringIO())
+        self.assertEqual(QueueTicket.objects.get().state, State.SKIPPED)
@@ -1,13 +1,31 @@
-from django.db import transaction
+import datetime
+
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 from rest_framework.response import Response
 
-from .models import QueueTicket
-from .serializers import QueueTicketSerializer
+from .events import publish_ticket_event
+from .models import Counter, QueueTicket, QueueWaitStat
+from .serializers import (
+    CounterSerializer,
+    QueueCloseDayResultSerializer,
+    QueueCloseDaySerializer,
+    QueueNextSerializer,
+    QueueStatSerializer,
+    QueueStatsQuerySerializer,
+    QueueTicketSerializer,
+    ticket_projection,
+)
+from .services import claim_next, close_day as close_queue_day, transition
+from .stats import summarize
+from apps.tenants.cache import QUEUE, cached_response, conditional
+from apps.tenants.idempotency import idempotent
 from apps.tenants.permissions import IsTenantUser, RolePermission
 from apps.users.models import User
+from rme_core.projection import FIELDS_PARAMETER
 
 
 class QueueTicketViewSet(viewsets.ViewSet):
@@ -20,39 +38,106 @@ class QueueTicketViewSet(viewsets.ViewSet):
         User.Role.STAFF,
     ]
 
+    @extend_schema(parameters=[FIELDS_PARAMETER])
+    @conditional(QUEUE)
+    @cached_response(QUEUE)
     def list(self, request):
-        qs = (
-            QueueTicket.objects.filter(tenant=request.tenant)
-            .exclude(state=QueueTicket.State.DONE)
-            .order_by("created_at")
+        fields = ticket_projection.select(request)
+        rows = ticket_projection.values(
+            QueueTicket.objects.active(request.tenant), fields
         )
-        return Response(QueueTicketSerializer(qs, many=True).data)
+        return Response(ticket_projection.render(rows, fields))
 
+    @extend_schema(request=QueueNextSerializer)
+    @idempotent
     @action(detail=False, methods=["post"])
     def next(self, request):
-        with transaction.atomic():
-            ticket = (
-                QueueTicket.objects.select_for_update()
-                .filter(tenant=request.tenant, state=QueueTicket.State.WAITING)
-                .order_by("created_at")
-                .first()
-            )
-            if not ticket:
-                return Response({"detail": "empty"}, status=status.HTTP_404_NOT_FOUND)
-            ticket.state = QueueTicket.State.IN_PROGRESS
-            ticket.save()
-            return Response(QueueTicketSerializer(ticket).data)
+        """Call the next waiting ticket, optionally to a counter or from a lane."""
+        serializer = QueueNextSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        ticket = claim_next(
+            request.tenant,
+            serializer.validated_data.get("counter"),
+            serializer.validated_data.get("lane"),
+        )
+        if not ticket:
+            return Response({"detail": "empty"}, status=status.HTTP_404_NOT_FOUND)
+        data = QueueTicketSerializer(ticket).data
+        publish_ticket_event(request.tenant.id, "ticket.updated", data)
+        return Response(data)
 
+    @idempotent
     @action(detail=True, methods=["post"])
     def done(self, request, pk=None):
-        ticket = QueueTicket.objects.get(pk=pk, tenant=request.tenant)
-        ticket.state = QueueTicket.State.DONE
-        ticket.save()
-        return Response(QueueTicketSerializer(ticket).data)
+        return self.move(request, pk, QueueTicket.State.DONE)
 
+    @idempotent
     @action(detail=True, methods=["post"])
     def skip(self, request, pk=None):
-        ticket = QueueTicket.objects.get(pk=pk, tenant=request.tenant)
-        ticket.state = QueueTicket.State.SKIPPED
-        ticket.save()
-        return Response(QueueTicketSerializer(ticket).data)
+        return self.move(request, pk, QueueTicket.State.SKIPPED)
+
+    def move(self, request, pk, target):
+        data = QueueTicketSerializer(transition(request.tenant, pk, target)).data
+        publish_ticket_event(request.tenant.id, "ticket.updated", data)
+        return Response(data)
+
+    @extend_schema(
+        request=QueueCloseDaySerializer, responses=QueueCloseDayResultSerializer
+    )
+    @idempotent
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="close-day",
+        required_roles=[User.Role.ADMIN],
+    )
+    def close_day(self, request):
+        """Skip every ticket still WAITING from ``day`` (default today) or earlier."""
+        serializer = QueueCloseDaySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        skipped = close_queue_day(request.tenant, serializer.validated_data.get("day"))
+        return Response({"skipped": skipped})
+
+    @extend_schema(
+        parameters=[QueueStatsQuerySerializer],
+        responses=QueueStatSerializer(many=True),
+    )
+    @action(detail=False, methods=["get"], required_roles=[User.Role.ADMIN])
+    def stats(self, request):
+        """Wait and service times (seconds) from the hourly rollups.
+
+        Defaults to the last 7 days, grouped by day; ``group=counter`` or
+        ``group=hour`` splits each day further.
+        """
+        query = QueueStatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        end = query.validated_data.get("end") or timezone.localdate()
+        start = query.validated_data.get("start") or end - datetime.timedelta(days=6)
+        rows = QueueWaitStat.objects.filter(
+            tenant=request.tenant, day__range=(start, end)
+        )
+        if "counter" in query.validated_data:
+            rows = rows.filter(counter_id=query.validated_data["counter"])
+        data = summarize(rows, query.validated_data["group"])
+        return Response(QueueStatSerializer(data, many=True).data)
+
+
+class CounterViewSet(viewsets.ModelViewSet):
+    serializer_class = CounterSerializer
+    permission_classes = [IsAuthenticated, IsTenantUser, RolePermission]
+    queryset = Counter.objects.all()
+    lookup_field = "id"
+
+    @property
+    def required_roles(self):
+        if self.request.method in SAFE_METHODS:
+            return QueueTicketViewSet.required_roles
+        return [User.Role.ADMIN]
+
+    def get_queryset(self):
+        return Counter.objects.filter(tenant=self.request.tenant)
+
+    def perform_create(self, serializer):
+        serializer.save(tenant=self.request.tenant)
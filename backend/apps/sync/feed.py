@@ -0,0 +1,156 @@
+"""Per-tenant change feed over the synced models and their tombstones.
+
+Every source is read with one keyset range scan on its
+``(tenant, change_seq, id)`` index, so a batch costs the same however
+large the tenant is. Rows are ordered by ``(change_seq, source, id)``;
+bulk updates may stamp many rows with one sequence number, and the
+source and id break those ties so a batch can end mid-group.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from .models import ChangeCounter, Tombstone
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+# Source name -> model; the position is the source's tie-break rank.
+SOURCES = (
+    (Tombstone.Kind.PATIENT, Patient),
+    (Tombstone.Kind.VISIT, Visit),
+    (Tombstone.Kind.QUEUE_TICKET, QueueTicket),
+)
+TOMBSTONES = len(SOURCES)
+# Rank for positions built from ``since``: after every source at that seq.
+AFTER_ALL = TOMBSTONES + 1
+
+
+class ResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Deletes after this point were pruned; sync again from 0."
+    default_code = "resync_required"
+
+
+@dataclass
+class ChangeBatch:
+    rows: dict
+    deleted: dict
+    seq: int
+    next: str = None
+
+
+def since(seq):
+    """Position just after every change up to and including ``seq``."""
+    return (seq, AFTER_ALL, None)
+
+
+def encode_cursor(position):
+    seq, rank, key = position
+    data = json.dumps({"k": [seq, rank, str(key)]}).encode("utf-8")
+    return urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_cursor(encoded):
+    try:
+        seq, rank, key = json.loads(urlsafe_b64decode(encoded.encode("ascii")))["k"]
+        if not (isinstance(seq, int) and isinstance(rank, int) and 0 <= rank):
+            raise ValueError(encoded)
+        if rank == TOMBSTONES:
+            key = int(key)
+        elif rank < TOMBSTONES:
+            key = Patient._meta.pk.to_python(key)
+    except (TypeError, ValueError, KeyError, ValidationError):
+        raise NotFound("Invalid cursor")
+    return seq, rank, key
+
+
+def after(queryset, rank, position):
+    """Rows of source ``rank`` ordered after ``position``."""
+    seq, position_rank, key = position
+    if rank < position_rank:
+        queryset = queryset.filter(change_seq__gt=seq)
+    elif rank > position_rank:
+        queryset = queryset.filter(change_seq__gte=seq)
+    else:
+        queryset = queryset.filter(_row_after(queryset.model, seq, key))
+    return queryset.order_by("change_seq", "pk")
+
+
+def _row_after(model, seq, key):
+    """``(change_seq, pk) > (seq, key)`` as one row-value comparison.
+
+    Both backends seek the ``(tenant, change_seq, id)`` index straight to
+    the position. SQLite plans the equivalent OR without any range, and
+    even with a ``change_seq`` bound every continuation inside a group
+    sharing one number would rescan the group.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    pk = model._meta.pk
+    return RawSQL(
+        f"({table}.{quote('change_seq')}, {table}.{quote(pk.column)}) > (%s, %s)",
+        [seq, pk.get_db_prep_value(key, connection)],
+        output_field=BooleanField(),
+    )
+
+
+def changes(tenant, position, limit=DEFAULT_LIMIT):
+    """The first ``limit`` changes after ``position`` for ``tenant``.
+
+    Each source returns at most ``limit + 1`` rows, which is enough to
+    know whether anything is left once the sources are merged. Rows above
+    the tenant's high-water mark wait for the next call, as a transaction
+    still running may yet commit a change below them. Raises
+    :class:`ResyncRequired` when tombstones newer than ``position`` were
+    pruned.
+    """
+    pruned = (
+        ChangeCounter.objects.filter(tenant=tenant)
+        .values_list("pruned", flat=True)
+        .first()
+    )
+    if 0 < position[0] < (pruned or 0):
+        raise ResyncRequired()
+    high = ChangeCounter.objects.high_water(tenant.id)
+    entries = []
+    for rank, (_, model) in enumerate(SOURCES):
+        rows = after(
+            model.objects.filter(tenant=tenant, change_seq__lte=high), rank, position
+        )
+        entries += [(row.change_seq, rank, row.pk, row) for row in rows[: limit + 1]]
+    tombstones = after(
+        Tombstone.objects.filter(tenant=tenant, change_seq__lte=high),
+        TOMBSTONES,
+        position,
+    )
+    entries += [
+        (row.change_seq, TOMBSTONES, row.pk, row) for row in tombstones[: limit + 1]
+    ]
+    entries.sort(key=lambda entry: entry[:3])
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    rows = {name: [] for name, _ in SOURCES}
+    deleted = {name: [] for name, _ in SOURCES}
+    for _, rank, _, row in entries:
+        if rank == TOMBSTONES:
+            deleted[row.kind].append(row.object_id)
+        else:
+            rows[SOURCES[rank][0]].append(row)
+    if not more:
+        return ChangeBatch(rows, deleted, max(position[0], high))
+    last = entries[-1][:3]
+    # The last group may continue in the next batch, so only the sequence
+    # before it is safe to resume from with ``since``.
+    return ChangeBatch(rows, deleted, last[0] - 1, encode_cursor(last))
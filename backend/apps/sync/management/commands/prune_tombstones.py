@@ -0,0 +1,22 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete sync tombstones older than --keep-days; clients that last "
+        "synced before them are told to resync"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-days", type=int, default=30)
+
+    def handle(self, *args, **options):
+        if options["keep_days"] < 0:
+            raise CommandError("--keep-days must not be negative")
+        cutoff = timezone.now() - datetime.timedelta(days=options["keep_days"])
+        deleted = Tombstone.objects.prune(cutoff)
+        self.stdout.write(f"Deleted {deleted} tombstones")
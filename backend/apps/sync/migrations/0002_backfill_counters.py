@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-18 13:07
+
+from django.db import migrations
+
+
+def start_counters(apps, schema_editor):
+    # Existing rows were stamped 1 when change_seq was added.
+    Tenant = apps.get_model("tenants", "Tenant")
+    ChangeCounter = apps.get_model("sync", "ChangeCounter")
+    ChangeCounter.objects.bulk_create(
+        ChangeCounter(tenant_id=pk, value=1)
+        for pk in Tenant.objects.values_list("pk", flat=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sync", "0001_initial"),
+        ("patients", "0007_patient_change_seq"),
+        ("admissions", "0003_visit_change_seq"),
+        ("queue", "0008_queue_ticket_change_seq"),
+    ]
+
+    operations = [
+        migrations.RunPython(start_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sync", "0002_backfill_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="changecounter",
+            name="pruned",
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
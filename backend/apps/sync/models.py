@@ -0,0 +1,216 @@
+from django.db import connection, models, transaction
+from django.db.models import F, Max
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from apps.tenants.models import Tenant
+
+# Both backends support INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+# (SQLite since 3.35), so an allocation costs one statement.
+UPSERT_VENDORS = ("postgresql", "sqlite")
+# Low bits of a PostgreSQL change_seq: the transaction's own allocations.
+XID_SHIFT = 20
+# Transaction-local setting holding the next such offset.
+OFFSET_SETTING = "rme.change_offset"
+OFFSET = f"COALESCE(NULLIF(current_setting('{OFFSET_SETTING}', true), ''), '0')::bigint"
+
+
+class ChangeCounterQuerySet(models.QuerySet):
+    def allocate(self, tenant_id, count=1):
+        """Reserve ``count`` consecutive change sequence numbers; return the first.
+
+        On PostgreSQL the numbers are the tenant's base ``value`` plus the
+        transaction id shifted left by ``XID_SHIFT``, plus an offset that
+        grows with each allocation in the transaction. Nothing is written
+        or locked, so concurrent writers never wait on each other, and
+        numbers no longer commit in order; readers clamp to
+        :meth:`high_water`.
+
+        Elsewhere the counter row is incremented and stays locked until the
+        surrounding transaction ends, so a tenant's changes commit in
+        sequence order. Allocate before touching synced rows, inside the
+        transaction that writes them.
+        """
+        tenant = ChangeCounter._meta.get_field("tenant")
+        table = connection.ops.quote_name(ChangeCounter._meta.db_table)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COALESCE((SELECT value FROM {table} "
+                    "WHERE tenant_id = %s), 0) "
+                    f"+ (txid_current() << {XID_SHIFT}) + n, "
+                    f"set_config('{OFFSET_SETTING}', (n + %s)::text, true) "
+                    f"FROM (SELECT {OFFSET} AS n) AS allocated",
+                    [tenant.get_db_prep_value(tenant_id, connection), count],
+                )
+                return cursor.fetchone()[0]
+
+        if connection.vendor in UPSERT_VENDORS:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (tenant_id, value, pruned) "
+                    "VALUES (%s, %s, 0) ON CONFLICT (tenant_id) "
+                    f"DO UPDATE SET value = {table}.value + excluded.value "
+                    "RETURNING value",
+                    [tenant.get_db_prep_value(tenant_id, connection), count],
+                )
+                last = cursor.fetchone()[0]
+            return last - count + 1
+
+        with transaction.atomic():
+            counter, _ = self.select_for_update().get_or_create(tenant_id=tenant_id)
+            self.filter(pk=counter.pk).update(value=F("value") + count)
+            counter.refresh_from_db(fields=["value"])
+        return counter.value - count + 1
+
+    def high_water(self, tenant_id):
+        """The highest number below which every change is visible to us.
+
+        No transaction still running can commit a change at or below it,
+        so readers that stop there never skip a row that commits later. On
+        PostgreSQL that is just below the oldest transaction in progress,
+        or our own last allocation; elsewhere the counter itself.
+        """
+        tenant = ChangeCounter._meta.get_field("tenant")
+        if connection.vendor == "postgresql":
+            table = connection.ops.quote_name(ChangeCounter._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COALESCE((SELECT value FROM {table} "
+                    "WHERE tenant_id = %s), 0) + LEAST("
+                    f"(SELECT min(x) FROM txid_snapshot_xip(s) AS x) << {XID_SHIFT}, "
+                    f"txid_snapshot_xmax(s) << {XID_SHIFT}, "
+                    f"(txid_current_if_assigned() << {XID_SHIFT}) + {OFFSET}"
+                    ") - 1 FROM txid_current_snapshot() AS s",
+                    [tenant.get_db_prep_value(tenant_id, connection)],
+                )
+                return cursor.fetchone()[0]
+        value = self.filter(tenant_id=tenant_id).values_list("value", flat=True)
+        return value.first() or 0
+
+
+class ChangeCounter(models.Model):
+    """Last change sequence number issued for a tenant.
+
+    On PostgreSQL ``value`` stays fixed and is the base of the numbers
+    :meth:`~ChangeCounterQuerySet.allocate` derives from transaction ids.
+    """
+
+    tenant = models.OneToOneField(Tenant, on_delete=models.CASCADE, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    # Newest tombstone number pruned; clients behind it must resync.
+    pruned = models.BigIntegerField(default=0)
+
+    objects = ChangeCounterQuerySet.as_manager()
+
+    def __str__(self) -> str:
+        return f"{self.tenant_id}: {self.value}"
+
+
+class SyncedModel(models.Model):
+    """Rows stamped with their tenant's change sequence on every write.
+
+    ``save()`` stamps automatically. Paths that bypass it stamp
+    explicitly: ``stamp()`` before ``bulk_create()``, and a ``change_seq``
+    from ``ChangeCounter.objects.allocate()`` in ``update()`` and raw SQL.
+    """
+
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, update_fields=None, **kwargs):
+        with transaction.atomic():
+            # A caller listing change_seq has stamped the row already.
+            if update_fields is None or "change_seq" not in update_fields:
+                self.change_seq = ChangeCounter.objects.allocate(self.tenant_id)
+            if update_fields is not None:
+                update_fields = {*update_fields, "change_seq"}
+            super().save(*args, update_fields=update_fields, **kwargs)
+
+    @classmethod
+    def stamp(cls, objs):
+        """Give unsaved ``objs`` consecutive change sequence numbers per tenant."""
+        by_tenant = {}
+        for obj in objs:
+            by_tenant.setdefault(obj.tenant_id, []).append(obj)
+        for tenant_id, group in by_tenant.items():
+            first = ChangeCounter.objects.allocate(tenant_id, len(group))
+            for offset, obj in enumerate(group):
+                obj.change_seq = first + offset
+        return objs
+
+
+class TombstoneQuerySet(models.QuerySet):
+    def record(self, tenant_id, entries):
+        """Write one tombstone per ``(kind, object_id)`` in ``entries``.
+
+        One allocation and one INSERT however many rows are deleted.
+        """
+        entries = list(entries)
+        if not entries:
+            return []
+        first = ChangeCounter.objects.allocate(tenant_id, len(entries))
+        return self.bulk_create(
+            Tombstone(
+                tenant_id=tenant_id,
+                change_seq=first + offset,
+                kind=kind,
+                object_id=object_id,
+            )
+            for offset, (kind, object_id) in enumerate(entries)
+        )
+
+    def prune(self, before):
+        """Delete tombstones written before ``before``; return how many.
+
+        Each tenant's ``ChangeCounter.pruned`` moves up to the newest number
+        deleted, in the same transaction, so the feed can tell a client
+        that may have missed a delete to start over.
+        """
+        floors = (
+            self.filter(deleted_at__lt=before)
+            .order_by()
+            .values_list("tenant_id")
+            .annotate(Max("change_seq"))
+        )
+        deleted = 0
+        for tenant_id, floor in floors:
+            with transaction.atomic():
+                ChangeCounter.objects.get_or_create(tenant_id=tenant_id)
+                ChangeCounter.objects.filter(tenant_id=tenant_id).update(
+                    pruned=Greatest("pruned", floor)
+                )
+                count, _ = self.filter(
+                    tenant_id=tenant_id, change_seq__lte=floor
+                ).delete()
+            deleted += count
+        return deleted
+
+
+class Tombstone(models.Model):
+    """A deleted synced row, kept so clients can drop their copy."""
+
+    class Kind(models.TextChoices):
+        PATIENT = "patients", "patients"
+        VISIT = "visits", "visits"
+        QUEUE_TICKET = "queue_tickets", "queue_tickets"
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    change_seq = models.BigIntegerField()
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    objects = TombstoneQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["tenant", "change_seq", "id"],
+                name="tombstone_tenant_change_idx",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id} @ {self.change_seq}"
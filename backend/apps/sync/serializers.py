@@ -0,0 +1,54 @@
+from rest_framework import serializers
+
+from apps.admissions.models import Visit
+from apps.patients.serializers import PatientSerializer
+from apps.queue.models import QueueTicket
+from .feed import DEFAULT_LIMIT, MAX_LIMIT
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, default=0)
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_LIMIT, default=DEFAULT_LIMIT
+    )
+
+
+class SyncVisitSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Visit
+        fields = ["id", "patient", "created_at"]
+
+
+class SyncQueueTicketSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = QueueTicket
+        fields = [
+            "id",
+            "visit",
+            "number",
+            "state",
+            "lane",
+            "priority",
+            "queue_date",
+            "counter",
+            "created_at",
+            "called_at",
+            "finished_at",
+            "updated_at",
+        ]
+
+
+class SyncDeletedSerializer(serializers.Serializer):
+    patients = serializers.ListField(child=serializers.UUIDField())
+    visits = serializers.ListField(child=serializers.UUIDField())
+    queue_tickets = serializers.ListField(child=serializers.UUIDField())
+
+
+class SyncBatchSerializer(serializers.Serializer):
+    seq = serializers.IntegerField()
+    next = serializers.CharField(allow_null=True)
+    patients = PatientSerializer(many=True)
+    visits = SyncVisitSerializer(many=True)
+    queue_tickets = SyncQueueTicketSerializer(many=True)
+    deleted = SyncDeletedSerializer()
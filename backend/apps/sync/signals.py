@@ -0,0 +1,41 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import Counter, QueueTicket
+from apps.tenants.models import Tenant
+from .models import ChangeCounter, Tombstone
+
+KINDS = {
+    Patient: Tombstone.Kind.PATIENT,
+    Visit: Tombstone.Kind.VISIT,
+    QueueTicket: Tombstone.Kind.QUEUE_TICKET,
+}
+
+
+def deleting_tenant(origin):
+    # The tenant's tombstones and counter go with it; writing new ones
+    # would only violate their foreign keys at commit.
+    return isinstance(origin, Tenant) or getattr(origin, "model", None) is Tenant
+
+
+@receiver(pre_delete, sender=Patient)
+@receiver(pre_delete, sender=Visit)
+@receiver(pre_delete, sender=QueueTicket)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    # pre_delete, so the sequence is allocated before rows are locked.
+    if deleting_tenant(origin):
+        return
+    Tombstone.objects.record(instance.tenant_id, [(KINDS[sender], instance.pk)])
+
+
+@receiver(pre_delete, sender=Counter)
+def stamp_released_tickets(sender, instance, origin=None, **kwargs):
+    # Deleting a counter nulls tickets.counter with an UPDATE that bypasses
+    # save(); stamp those tickets first.
+    if deleting_tenant(origin):
+        return
+    QueueTicket.objects.filter(counter=instance).update(
+        change_seq=ChangeCounter.objects.allocate(instance.tenant_id)
+    )
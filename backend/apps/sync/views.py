@@ -0,0 +1,44 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.tenants.permissions import IsTenantUser, RolePermission
+from apps.users.models import User
+from .feed import changes, decode_cursor, since
+from .serializers import SyncBatchSerializer, SyncQuerySerializer
+
+
+class SyncView(APIView):
+    permission_classes = [IsAuthenticated, IsTenantUser, RolePermission]
+    required_roles = [
+        User.Role.ADMIN,
+        User.Role.DOCTOR,
+        User.Role.NURSE,
+        User.Role.STAFF,
+    ]
+
+    @extend_schema(parameters=[SyncQuerySerializer], responses=SyncBatchSerializer)
+    def get(self, request):
+        """Patients, visits and tickets changed or deleted after ``since``.
+
+        Follow ``next`` with ``?cursor=`` until it is null, then keep
+        ``seq`` as the next ``since``.
+        """
+        query = SyncQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        if "cursor" in query.validated_data:
+            position = decode_cursor(query.validated_data["cursor"])
+        else:
+            position = since(query.validated_data["since"])
+        batch = changes(request.tenant, position, query.validated_data["limit"])
+        return Response(
+            SyncBatchSerializer(
+                {
+                    "seq": batch.seq,
+                    "next": batch.next,
+                    **batch.rows,
+                    "deleted": batch.deleted,
+                }
+            ).data
+        )
@@ -0,0 +1,200 @@
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+PATIENTS = "patients"
+QUEUE = "queue"
+CACHE_HEADER = "X-Cache"
+DEFAULTS = {
+    "CACHE": "default",
+    "TTL": 300,
+    "KEY_PREFIX": "tenant-cache",
+}
+
+
+def get_conf(**options):
+    return {**DEFAULTS, **getattr(settings, "RESPONSE_CACHE", {}), **options}
+
+
+def _cache(conf):
+    return caches[conf["CACHE"]]
+
+
+def version_key(tenant_id, resource, conf=None):
+    conf = conf or get_conf()
+    return f"{conf['KEY_PREFIX']}:v:{tenant_id}:{resource}"
+
+
+def get_version(tenant_id, resource, conf=None):
+    """Current version of ``resource`` for a tenant, created on first use.
+
+    A fresh version starts at the clock in nanoseconds rather than 1, so a
+    version key lost to eviction never comes back as a number that older,
+    stale entries were stored under. None when ``CACHE`` is None.
+    """
+    conf = conf or get_conf()
+    if conf["CACHE"] is None:
+        return None
+    cache = _cache(conf)
+    key = version_key(tenant_id, resource, conf)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _incr(tenant_id, resource, conf):
+    cache = _cache(conf)
+    key = version_key(tenant_id, resource, conf)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump(tenant_id, *resources):
+    """Invalidate every cached read of ``resources`` for one tenant.
+
+    Bumps now, so reads later in this transaction miss, and again on
+    commit, so nothing a concurrent reader cached from the pre-commit
+    snapshot outlives the write. A no-op when ``CACHE`` is None.
+    """
+    conf = get_conf()
+    if conf["CACHE"] is None:
+        return
+    for resource in resources:
+        _incr(tenant_id, resource, conf)
+
+    def bump_on_commit():
+        for resource in resources:
+            _incr(tenant_id, resource, conf)
+
+    transaction.on_commit(bump_on_commit)
+
+
+def entry_key(request, resource, version, conf):
+    target = f"{request.get_host()}{request.get_full_path()}"
+    digest = hashlib.sha256(target.encode("utf-8")).hexdigest()
+    return f"{conf['KEY_PREFIX']}:{request.tenant.id}:{resource}:{version}:{digest}"
+
+
+def cached_response(resource):
+    """Serve a read-only view method from the tenant's ``resource`` cache.
+
+    Successful responses are cached as their data, before rendering, under
+    the tenant's current version of ``resource``; writes call ``bump()``
+    instead of deleting keys. Permission checks still run on every request
+    because the view's ``initial()`` happens before the method is called.
+    Nothing is cached when ``CACHE`` is None or ``TTL`` is 0.
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            conf = get_conf()
+            if conf["CACHE"] is None or not conf["TTL"]:
+                return view_method(view, request, *args, **kwargs)
+            cache = _cache(conf)
+            version = get_version(request.tenant.id, resource, conf)
+            key = entry_key(request, resource, version, conf)
+            hit = cache.get(key)
+            if hit is not None:
+                return Response(hit, headers={CACHE_HEADER: "HIT"})
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, conf["TTL"])
+                response[CACHE_HEADER] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def etag(request, resource, version):
+    """Strong ETag for one representation of ``resource`` at ``version``."""
+    target = "|".join(
+        [
+            request.get_host(),
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            resource,
+            str(version),
+        ]
+    )
+    return '"%s"' % hashlib.sha256(target.encode("utf-8")).hexdigest()[:32]
+
+
+def _stamp(updated_at):
+    # Microseconds since the epoch, equal for the column value and its
+    # serialized form whatever timezone either is rendered in.
+    if isinstance(updated_at, str):
+        updated_at = parse_datetime(updated_at)
+    return None if updated_at is None else round(updated_at.timestamp() * 1e6)
+
+
+def row_version(view, kwargs):
+    """``updated_at`` of the object a detail route names, or None if missing."""
+    lookup = view.lookup_url_kwarg or view.lookup_field
+    try:
+        rows = view.get_queryset().filter(**{view.lookup_field: kwargs[lookup]})
+        return _stamp(rows.order_by().values_list("updated_at", flat=True).first())
+    except (TypeError, ValueError, ValidationError):
+        return None
+
+
+def conditional(resource, detail=False):
+    """Answer ``If-None-Match`` on a read-only view method with ``304``.
+
+    The ETag is derived from the tenant's version of ``resource`` or, with
+    ``detail=True``, from the row's ``updated_at``, never from the body, so
+    a match returns before the view queries or serializes anything. A
+    version in a per-process cache would let a worker answer ``304`` for a
+    list another worker changed, so lists get no ETag when ``CACHE`` is
+    None (no shared cache configured). Detail
+    routes read ``updated_at`` (one indexed query) only when the client
+    sent ``If-None-Match``; otherwise the tag comes from the response data.
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            # Weak comparison: compression turns the tags sent out weak.
+            candidates = {
+                tag.removeprefix("W/")
+                for tag in parse_etags(request.headers.get("If-None-Match", ""))
+            }
+            if not detail:
+                version = get_version(request.tenant.id, resource)
+            elif candidates:
+                version = row_version(view, kwargs)
+            else:
+                version = None
+            tag = None if version is None else etag(request, resource, version)
+            if tag is not None and (tag in candidates or "*" in candidates):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag}
+                )
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            if detail:
+                version = _stamp(response.data.get("updated_at"))
+                tag = None if version is None else etag(request, resource, version)
+            if tag is not None:
+                response["ETag"] = tag
+            return response
+
+        return wrapper
+
+    return decorator
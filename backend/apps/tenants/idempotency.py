@@ -0,0 +1,174 @@
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyRecord
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+POLL_SECONDS = 0.05
+DEFAULTS = {
+    "CACHE": "default",
+    "TTL": 24 * 60 * 60,
+    "WAIT": 10,
+    "KEY_PREFIX": "idempotency",
+}
+
+HEADER_PARAMETER = OpenApiParameter(
+    HEADER,
+    OpenApiTypes.STR,
+    OpenApiParameter.HEADER,
+    description="Retries with the same key replay the first successful response.",
+)
+
+
+def get_conf(**options):
+    return {**DEFAULTS, **getattr(settings, "IDEMPOTENCY", {}), **options}
+
+
+def fingerprint(request):
+    """Hash of who sent what where, so a key cannot be reused for another call."""
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    payload = json.dumps(
+        [request.user.pk, request.method, request.path, data],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """Stored responses for one tenant's key: cache first, database behind it.
+
+    The database row is written in the same transaction as the view's work,
+    so a response is stored exactly when its side effects commit.
+    """
+
+    def __init__(self, tenant, key, **options):
+        conf = get_conf(**options)
+        self.cache = caches[conf["CACHE"]]
+        self.ttl = conf["TTL"]
+        self.wait_seconds = conf["WAIT"]
+        self.tenant = tenant
+        self.key = key
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        self.cache_key = f"{conf['KEY_PREFIX']}:{tenant.pk}:{digest}"
+        self.lock_key = f"{self.cache_key}:lock"
+
+    def get(self):
+        stored = self.cache.get(self.cache_key)
+        if stored is not None:
+            return stored
+        record = (
+            IdempotencyRecord.objects.filter(tenant=self.tenant, key=self.key)
+            .values("fingerprint", "status_code", "body", "created_at")
+            .first()
+        )
+        if record is None:
+            return None
+        age = (timezone.now() - record.pop("created_at")).total_seconds()
+        if age >= self.ttl:
+            IdempotencyRecord.objects.filter(tenant=self.tenant, key=self.key).delete()
+            return None
+        self.cache.set(self.cache_key, record, self.ttl - age)
+        return record
+
+    def save(self, fingerprint, response):
+        record = {
+            "fingerprint": fingerprint,
+            "status_code": response.status_code,
+            "body": response.data,
+        }
+        IdempotencyRecord.objects.create(tenant=self.tenant, key=self.key, **record)
+        transaction.on_commit(lambda: self.cache.set(self.cache_key, record, self.ttl))
+
+    def acquire(self):
+        return self.cache.add(self.lock_key, 1, self.wait_seconds * 3)
+
+    def release(self):
+        self.cache.delete(self.lock_key)
+
+    def wait(self):
+        """Poll for the in-flight request's response; None if it never lands."""
+        deadline = time.monotonic() + self.wait_seconds
+        while time.monotonic() < deadline:
+            time.sleep(POLL_SECONDS)
+            stored = self.cache.get(self.cache_key)
+            if stored is not None:
+                return stored
+            if self.cache.get(self.lock_key) is None:
+                break
+        return self.get()
+
+
+def replay(stored, request_fingerprint):
+    if stored["fingerprint"] != request_fingerprint:
+        return Response(
+            {"detail": f"{HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(stored["body"], status=stored["status_code"])
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def idempotent(view_method):
+    """Make a view method safe to retry with an ``Idempotency-Key`` header.
+
+    The first 2xx response per tenant and key is stored and replayed for
+    retries. A duplicate that arrives while the first is still running waits
+    for it instead of redoing the work. Error responses are not stored:
+    they have no side effects, so a retry simply runs again.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view_method(view, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        store = IdempotencyStore(request.tenant, key)
+        request_fingerprint = fingerprint(request)
+        stored = store.get()
+        if stored is None and not store.acquire():
+            stored = store.wait()
+            if stored is None:
+                return Response(
+                    {"detail": f"A request with this {HEADER} is still in progress."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+        if stored is not None:
+            return replay(stored, request_fingerprint)
+        try:
+            with transaction.atomic():
+                response = view_method(view, request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    store.save(request_fingerprint, response)
+            return response
+        except IntegrityError:
+            # Another process without our cache lock committed the key first.
+            stored = store.get()
+            if stored is None:
+                raise
+            return replay(stored, request_fingerprint)
+        finally:
+            store.release()
+
+    return extend_schema(parameters=[HEADER_PARAMETER])(wrapper)
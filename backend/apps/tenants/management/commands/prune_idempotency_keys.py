@@ -0,0 +1,16 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.tenants.idempotency import get_conf
+from apps.tenants.models import IdempotencyRecord
+
+
+class Command(BaseCommand):
+    help = "Delete stored Idempotency-Key responses older than IDEMPOTENCY['TTL']"
+
+    def handle(self, *args, **options):
+        ttl = datetime.timedelta(seconds=get_conf()["TTL"])
+        cutoff = timezone.now() - ttl
+        deleted, _ = IdempotencyRecord.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(f"Deleted {deleted} idempotency records")
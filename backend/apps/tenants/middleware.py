@@ -1,30 +1,36 @@
 from django.http import HttpResponseBadRequest
-from .models import Tenant
+from .registry import registry
+
+# Tenant-independent endpoints.
+EXEMPT_PATHS = ("/api/healthz", "/api/metrics")
+# Endpoints taking ?tenant=, for EventSource clients which cannot send
+# headers. Elsewhere it would only put tenant ids into access logs.
+QUERY_TENANT_PATHS = ("/api/queue/stream/",)
 
 
 class TenantMiddleware:
-    """Resolve tenant from subdomain or X-Tenant-ID header."""
+    """Resolve tenant from subdomain, X-Tenant-ID header or ?tenant= param.
+
+    The query parameter is only read on ``QUERY_TENANT_PATHS``.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        if request.path.startswith("/api/healthz"):
+        if request.path.startswith(EXEMPT_PATHS):
             return self.get_response(request)
 
         tenant_id = request.META.get("HTTP_X_TENANT_ID")
-        tenant = None
+        if not tenant_id and request.path in QUERY_TENANT_PATHS:
+            tenant_id = request.GET.get("tenant")
         if tenant_id:
-            try:
-                tenant = Tenant.objects.get(id=tenant_id)
-            except Tenant.DoesNotExist:
-                return HttpResponseBadRequest("Invalid tenant")
+            tenant = registry.get_by_id(tenant_id)
         else:
             host = request.get_host().split(":")[0]
             subdomain = host.split(".")[0]
-            try:
-                tenant = Tenant.objects.get(subdomain=subdomain)
-            except Tenant.DoesNotExist:
-                return HttpResponseBadRequest("Invalid tenant")
+            tenant = registry.get_by_subdomain(subdomain)
+        if tenant is None:
+            return HttpResponseBadRequest("Invalid tenant")
         request.tenant = tenant
         return self.get_response(request)
@@ -0,0 +1,210 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Tenant
+
+DEFAULTS = {
+    "MAX_SIZE": 1024,
+    "MAX_MISSING": 256,
+    "TTL": 60,
+    "NEGATIVE_TTL": 5,
+    "SHARED_CACHE": None,
+    "SYNC_INTERVAL": 1.0,
+    "KEY_PREFIX": "tenant-registry",
+}
+
+# Sentinel for lookups that matched no tenant.
+MISSING = object()
+GENERATION = "generation"
+
+
+class TenantRegistry:
+    """Bounded LRU/TTL cache of tenants keyed by id and subdomain.
+
+    Lookups go local tier -> optional shared Django cache -> database.
+    Misses are cached for ``NEGATIVE_TTL`` seconds so unknown hosts or
+    ids cannot force a query per request. They live in their own map,
+    bounded by ``MAX_MISSING``, so junk lookups never evict real tenants.
+
+    With a shared cache, ``invalidate()`` also bumps a shared generation.
+    Every process compares it with its own at most once per
+    ``SYNC_INTERVAL`` seconds and drops its local tier when it moved.
+    """
+
+    def __init__(self, **options):
+        conf = {**DEFAULTS, **getattr(settings, "TENANT_REGISTRY", {}), **options}
+        self.max_size = conf["MAX_SIZE"]
+        self.max_missing = conf["MAX_MISSING"]
+        self.ttl = conf["TTL"]
+        self.negative_ttl = conf["NEGATIVE_TTL"]
+        self.shared_alias = conf["SHARED_CACHE"]
+        self.sync_interval = conf["SYNC_INTERVAL"]
+        self.key_prefix = conf["KEY_PREFIX"]
+        self._entries = OrderedDict()
+        self._missing = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._next_sync = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.shared_hits = 0
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias] if self.shared_alias else None
+
+    def get_by_id(self, tenant_id):
+        try:
+            tenant_id = uuid.UUID(str(tenant_id))
+        except ValueError:
+            return None
+        return self._get(f"id:{tenant_id}", {"id": tenant_id})
+
+    def get_by_subdomain(self, subdomain):
+        return self._get(f"sub:{subdomain}", {"subdomain": subdomain})
+
+    def _get(self, key, lookup):
+        now = time.monotonic()
+        self._sync(now)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            expires = self._missing.get(key)
+            if expires is not None and expires > now:
+                self.negative_hits += 1
+                return None
+            self.misses += 1
+
+        tenant = self._get_shared(key)
+        if tenant is None:
+            tenant = Tenant.objects.filter(**lookup).first()
+            self._set_shared(key, tenant)
+        if tenant is None or tenant is MISSING:
+            self._store_missing(key)
+            return None
+        self._store(f"id:{tenant.id}", tenant)
+        self._store(f"sub:{tenant.subdomain}", tenant)
+        return tenant
+
+    def _store(self, key, tenant):
+        with self._lock:
+            self._missing.pop(key, None)
+            self._entries[key] = (tenant, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _store_missing(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._missing[key] = time.monotonic() + self.negative_ttl
+            self._missing.move_to_end(key)
+            while len(self._missing) > self.max_missing:
+                self._missing.popitem(last=False)
+
+    def _sync(self, now):
+        """Drop the local tier if another process invalidated since last check."""
+        if self.shared is None or now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_interval
+        generation = self.shared.get(self._shared_key(GENERATION))
+        if generation is None:
+            self._seed_generation()
+            generation = self.shared.get(self._shared_key(GENERATION))
+        with self._lock:
+            if generation != self._generation:
+                if self._generation is not None:
+                    self._entries.clear()
+                    self._missing.clear()
+                self._generation = generation
+
+    def _seed_generation(self):
+        # From the clock, as cache.get_version() does: an evicted generation
+        # must not come back as a value some process still remembers.
+        self.shared.add(self._shared_key(GENERATION), time.time_ns(), timeout=None)
+
+    def _shared_key(self, key):
+        return f"{self.key_prefix}:{key}"
+
+    def _get_shared(self, key):
+        if self.shared is None:
+            return None
+        value = self.shared.get(self._shared_key(key))
+        if value is None:
+            return None
+        with self._lock:
+            self.shared_hits += 1
+        return MISSING if value == "" else value
+
+    def _set_shared(self, key, tenant):
+        if self.shared is None:
+            return
+        if tenant is None:
+            self.shared.set(self._shared_key(key), "", self.negative_ttl)
+        else:
+            self.shared.set_many(
+                {
+                    self._shared_key(f"id:{tenant.id}"): tenant,
+                    self._shared_key(f"sub:{tenant.subdomain}"): tenant,
+                },
+                self.ttl,
+            )
+
+    def invalidate(self, tenant_id=None, subdomain=None):
+        keys = []
+        if tenant_id is not None:
+            keys.append(f"id:{tenant_id}")
+        if subdomain is not None:
+            keys.append(f"sub:{subdomain}")
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._missing.pop(key, None)
+        if self.shared is None or not keys:
+            return
+        self.shared.delete_many([self._shared_key(k) for k in keys])
+        try:
+            generation = self.shared.incr(self._shared_key(GENERATION))
+        except ValueError:
+            self._seed_generation()
+            return
+        with self._lock:
+            # Only our own bump: skip the flush. Anyone else's is picked up
+            # by the next _sync().
+            if self._generation is not None and generation == self._generation + 1:
+                self._generation = generation
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._missing.clear()
+            self._generation = None
+            self._next_sync = 0.0
+            self.hits = self.misses = self.negative_hits = self.shared_hits = 0
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+            missing = len(self._missing)
+            hits, misses = self.hits, self.misses
+            negative_hits, shared_hits = self.negative_hits, self.shared_hits
+        return {
+            "size": size,
+            "missing": missing,
+            "hits": hits,
+            "misses": misses,
+            "negative_hits": negative_hits,
+            "shared_hits": shared_hits,
+        }
+
+
+registry = TenantRegistry()
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Tenant
+from .registry import registry
+
+
+@receiver(pre_save, sender=Tenant)
+def remember_previous_subdomain(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance._previous_subdomain = None
+        return
+    instance._previous_subdomain = (
+        Tenant.objects.filter(pk=instance.pk)
+        .values_list("subdomain", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_tenant_registry(sender, instance, **kwargs):
+    tenant_id, subdomain = instance.id, instance.subdomain
+    previous = getattr(instance, "_previous_subdomain", None)
+
+    def invalidate():
+        registry.invalidate(tenant_id=tenant_id, subdomain=subdomain)
+        if previous and previous != subdomain:
+            registry.invalidate(subdomain=previous)
+
+    # Now, for the rest of this transaction, and again on commit, as
+    # cache.bump() does: a lookup in between re-caches the old row.
+    invalidate()
+    transaction.on_commit(invalidate)
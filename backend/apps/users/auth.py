@@ -1,9 +1,27 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework import serializers
 
+from .authentication import (
+    ROLE_CLAIM,
+    TENANT_CLAIM,
+    VERSION_CLAIM,
+    check_token_version,
+)
+
 
 class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[TENANT_CLAIM] = str(user.tenant_id)
+        token[ROLE_CLAIM] = user.role
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
         request = self.context["request"]
@@ -15,3 +33,15 @@ class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 class TenantTokenObtainPairView(TokenObtainPairView):
     serializer_class = TenantTokenObtainPairSerializer
+
+
+class TenantTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        # The new access token copies the refresh token's claims, so a
+        # revoked refresh token must not mint one.
+        check_token_version(self.token_class(attrs["refresh"]))
+        return super().validate(attrs)
+
+
+class TenantTokenRefreshView(TokenRefreshView):
+    serializer_class = TenantTokenRefreshSerializer
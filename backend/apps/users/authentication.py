@@ -0,0 +1,89 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+TENANT_CLAIM = "tenant_id"
+ROLE_CLAIM = "role"
+VERSION_CLAIM = "ver"
+
+# Cached for deleted or inactive users so revocation checks stay cheap.
+REVOKED = -1
+
+
+def token_version_key(user_id):
+    return f"users:token-version:{user_id}"
+
+
+def cache_token_version(user):
+    version = user.token_version if user.is_active else REVOKED
+    cache.set(token_version_key(user.id), version, settings.TOKEN_VERSION_TTL)
+
+
+def current_token_version(user_id):
+    """Return the user's live token version, hitting the DB only on a miss."""
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        row = (
+            User.objects.filter(id=user_id)
+            .values_list("token_version", "is_active")
+            .first()
+        )
+        version = row[0] if row and row[1] else REVOKED
+        cache.set(key, version, settings.TOKEN_VERSION_TTL)
+    return version
+
+
+def check_token_version(token):
+    """Reject ``token`` if its user was deactivated or its version bumped."""
+    version = current_token_version(token[api_settings.USER_ID_CLAIM])
+    if version == REVOKED:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if VERSION_CLAIM in token and version != token[VERSION_CLAIM]:
+        raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+
+class TenantTokenUser(TokenUser):
+    """Token-backed user exposing the attributes tenant permissions read."""
+
+    @cached_property
+    def tenant_id(self):
+        return uuid.UUID(self.token[TENANT_CLAIM])
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+
+class TenantJWTAuthentication(JWTStatelessUserAuthentication):
+    """Authenticate from tenant-aware claims without loading the User row.
+
+    Tokens issued before tenant claims existed fall back to the regular
+    database-backed lookup.
+    """
+
+    def get_user(self, validated_token):
+        if not all(
+            claim in validated_token
+            for claim in (TENANT_CLAIM, ROLE_CLAIM, VERSION_CLAIM)
+        ):
+            return JWTAuthentication.get_user(self, validated_token)
+        check_token_version(validated_token)
+        return TenantTokenUser(validated_token)
+
+
+class TenantJWTScheme(SimpleJWTScheme):
+    target_class = "apps.users.authentication.TenantJWTAuthentication"
@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.patients.models import Patient
+from apps.patients.serializers import PatientSerializer, patient_projection
+from apps.queue.models import QueueTicket
+from apps.queue.serializers import QueueTicketSerializer, ticket_projection
+from rme_core.synthetic import Generator, Writer, seed_tenant
+from .bench_render import per_op
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark fetching and serializing patient pages and ticket lists "
+        "through the ModelSerializers against the values() projections"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patients", type=int, default=5000, help="Seeded")
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--tickets", type=int, default=500, help="List size")
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="bench", help="Tenant subdomain prefix")
+
+    def handle(self, *args, **options):
+        if min(options["patients"], options["page_size"], options["repeat"]) < 1:
+            raise CommandError("--patients, --page-size and --repeat must be positive")
+        generator = Generator(options["seed"], options["prefix"])
+        seed_tenant(
+            generator,
+            0,
+            Writer(),
+            patients=options["patients"],
+            visits=options["tickets"],
+            days=1,
+        )
+        tenant = generator.tenant(0)
+        size, tickets = options["page_size"], options["tickets"]
+        patients = Patient.objects.filter(tenant_id=tenant.id).order_by(
+            "full_name", "id"
+        )
+        # Seeded tickets are finished, so time the board's query shape
+        # over the tenant's history rather than an empty board.
+        board = QueueTicket.objects.filter(tenant_id=tenant.id).order_by("created_at")
+        sparse = ("id", "full_name")
+
+        def project(projection, queryset, fields, limit):
+            return projection.render(
+                projection.values(queryset, fields)[:limit], fields
+            )
+
+        cases = [
+            (
+                f"patients x{size}",
+                lambda: PatientSerializer(patients[:size], many=True).data,
+                lambda: project(
+                    patient_projection,
+                    patients,
+                    tuple(patient_projection.columns),
+                    size,
+                ),
+                lambda: project(patient_projection, patients, sparse, size),
+            ),
+            (
+                f"queue x{tickets}",
+                lambda: QueueTicketSerializer(
+                    board.projected()[:tickets], many=True
+                ).data,
+                lambda: project(
+                    ticket_projection, board, tuple(ticket_projection.columns), tickets
+                ),
+                lambda: project(ticket_projection, board, ("id", "number"), tickets),
+            ),
+        ]
+        renderer = JSONRenderer()
+        repeat = options["repeat"]
+        for name, serialized, projected, narrowed in cases:
+            if renderer.render(serialized()) != renderer.render(projected()):
+                raise CommandError(f"{name}: projection output differs")
+            before = per_op(serialized, repeat)
+            after = per_op(projected, repeat)
+            self.stdout.write(
+                f"{name}: serializer {before:.3f}ms  projection {after:.3f}ms "
+                f"({before / after:.1f}x)  sparse {per_op(narrowed, repeat):.3f}ms"
+            )
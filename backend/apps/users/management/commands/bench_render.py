@@ -0,0 +1,90 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.patients.serializers import PatientSerializer
+from apps.queue.models import QueueTicket
+from apps.queue.serializers import QueueTicketSerializer
+from rme_core import compression, renderers
+from rme_core.renderers import FastJSONRenderer, MessagePackRenderer
+from rme_core.synthetic import Generator, pick_lane
+
+
+def per_op(fn, repeat):
+    """Mean milliseconds per call of ``fn`` over ``repeat`` calls."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark serializing, rendering and compressing the patient "
+        "list and queue board payloads; no database needed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patients", type=int, default=100, help="Page size")
+        parser.add_argument("--tickets", type=int, default=500, help="Board size")
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        generator = Generator(options["seed"], "bench")
+        tenant = generator.tenant(0)
+        patients = list(generator.patients(tenant, 0, 0, options["patients"]))
+        for patient in patients:
+            patient.updated_at = patient.created_at
+        rng = generator.rng(0, "board")
+        tickets = [
+            {
+                "id": generator.uuid(0, "ticket", n),
+                "number": n + 1,
+                "state": QueueTicket.State.WAITING,
+                "lane": pick_lane(rng),
+                "priority": 0,
+                "counter_id": None,
+                "patient_name": patients[n % len(patients)].full_name,
+            }
+            for n in range(options["tickets"])
+        ]
+        payloads = [
+            (
+                f"patients x{len(patients)}",
+                lambda: PatientSerializer(patients, many=True).data,
+            ),
+            (
+                f"queue x{len(tickets)}",
+                lambda: QueueTicketSerializer(tickets, many=True).data,
+            ),
+        ]
+        candidates = [("drf-json", JSONRenderer()), ("fast-json", FastJSONRenderer())]
+        if renderers.msgpack is not None:
+            candidates.append(("msgpack", MessagePackRenderer()))
+        if renderers.orjson is None:
+            self.stdout.write("orjson is not installed; fast-json is drf-json")
+
+        repeat = options["repeat"]
+        conf = compression.get_conf()
+        for name, build in payloads:
+            data = build()
+            self.stdout.write(f"{name}: serialize {per_op(build, repeat):.3f}ms")
+            for label, renderer in candidates:
+                body = renderer.render(data)
+                ms = per_op(lambda: renderer.render(data), repeat)
+                self.stdout.write(
+                    f"  {label:<10} {ms:8.3f}ms {len(body) / ms / 1000:8.1f}MB/s "
+                    f"{len(body):>9} bytes"
+                )
+            body = FastJSONRenderer().render(data)
+            for coding in compression.encodings():
+                size = len(compression.compress(coding, body, conf))
+                ms = per_op(lambda: compression.compress(coding, body, conf), repeat)
+                self.stdout.write(
+                    f"  {coding:<10} {ms:8.3f}ms {len(body) / ms / 1000:8.1f}MB/s "
+                    f"{size:>9} bytes ({size / len(body):.0%})"
+                )
@@ -0,0 +1,83 @@
+import json
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rme_core.loadtest import PERCENTILES, LoadTest, compare, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed tenants, patients and visit history, then drive login, search, "
+        "check-in and queue calls concurrently through the API"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenants", type=int, default=2)
+        parser.add_argument("--patients", type=int, default=1000, help="Per tenant")
+        parser.add_argument(
+            "--visits", type=int, default=2, help="Past visits per patient, on average"
+        )
+        parser.add_argument(
+            "--days", type=int, default=30, help="Days of history before today"
+        )
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per worker"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="lt", help="Tenant subdomain prefix")
+        parser.add_argument("--output", help="Write the JSON report to this path")
+        parser.add_argument(
+            "--compare", help="Baseline JSON report to print changes against"
+        )
+
+    def handle(self, *args, **options):
+        if min(options["tenants"], options["patients"], options["days"]) < 1:
+            raise CommandError("--tenants, --patients and --days must be at least 1")
+        fixtures = seed(
+            options["tenants"],
+            options["patients"],
+            options["visits"],
+            prefix=options["prefix"],
+            seed=options["seed"],
+            days=options["days"],
+        )
+        # An empty queue answers next with 404; keep those out of the output.
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        report = LoadTest(
+            fixtures,
+            workers=options["workers"],
+            requests=options["requests"],
+            seed=options["seed"],
+        ).run()
+
+        columns = ["requests", "errors", "throughput"] + [
+            f"p{q}_ms" for q in PERCENTILES
+        ]
+        self.stdout.write(f"{'endpoint':<16}" + "".join(f"{c:>12}" for c in columns))
+        rows = {**report["endpoints"], "total": report["total"]}
+        for name, summary in rows.items():
+            self.stdout.write(
+                f"{name:<16}" + "".join(f"{summary[c]!s:>12}" for c in columns)
+            )
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+            self.stdout.write(
+                f"Against {baseline['meta'].get('commit') or 'baseline'}:"
+            )
+            for endpoint, metric, old, new, change in compare(baseline, report):
+                self.stdout.write(
+                    f"{endpoint:<16}{metric:>12}{old:>12}{new:>12}{change:>+10.1f}%"
+                )
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+        if report["total"]["errors"]:
+            raise CommandError(
+                f"{report['total']['errors']} requests failed: "
+                f"{report['total']['error_statuses']}"
+            )
@@ -13,6 +13,10 @@ class User(AbstractUser):
         STAFF = "STAFF", "Staff"
         CASHIER = "CASHIER", "Cashier"
 
+    # Fields baked into access tokens; changing any of them revokes tokens.
+    TOKEN_FIELDS = ("tenant_id", "role", "is_active", "password")
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
     role = models.CharField(max_length=20, choices=Role.choices)
+    token_version = models.PositiveIntegerField(default=0)
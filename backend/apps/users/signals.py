@@ -0,0 +1,37 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import REVOKED, cache_token_version, token_version_key
+from .models import User
+
+
+@receiver(pre_save, sender=User)
+def detect_token_field_changes(sender, instance, update_fields=None, **kwargs):
+    instance._token_fields_changed = False
+    if instance._state.adding:
+        return
+    watched = User.TOKEN_FIELDS
+    if update_fields is not None:
+        names = {User._meta.get_field(f).attname for f in update_fields}
+        if not names.intersection(watched):
+            return
+    previous = User.objects.filter(pk=instance.pk).values(*watched).first()
+    instance._token_fields_changed = bool(previous) and any(
+        previous[f] != getattr(instance, f) for f in watched
+    )
+
+
+@receiver(post_save, sender=User)
+def bump_token_version(sender, instance, **kwargs):
+    if getattr(instance, "_token_fields_changed", False):
+        User.objects.filter(pk=instance.pk).update(token_version=F("token_version") + 1)
+        instance.refresh_from_db(fields=["token_version"])
+        instance._token_fields_changed = False
+    cache_token_version(instance)
+
+
+@receiver(post_delete, sender=User)
+def revoke_token_version(sender, instance, **kwargs):
+    cache.set(token_version_key(instance.id), REVOKED)
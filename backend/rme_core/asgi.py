@@ -2,6 +2,8 @@
 ASGI config for rme_core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP (including the queue Server-Sent Events feed) is served by Django;
+WebSocket connections go to the queue board push channel.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -13,4 +15,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "rme_core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler  # noqa: E402
+from apps.queue.stream import QueueWebSocketApp  # noqa: E402
+
+if settings.DEBUG:
+    django_application = ASGIStaticFilesHandler(django_application)
+
+websocket_application = QueueWebSocketApp()
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        return await websocket_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,100 @@
+"""gzip/brotli response compression above a size threshold.
+
+Streaming responses (exports, the queue event stream) and responses that
+already carry a ``Content-Encoding`` pass through untouched. brotli is
+used when the optional ``brotli`` package is installed and the client
+prefers it at least as much as gzip.
+"""
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULTS = {
+    "ENABLED": True,
+    "MIN_SIZE": 1024,
+    "BROTLI_QUALITY": 5,
+}
+# Random gzip header bytes, as Django's GZipMiddleware adds against BREACH.
+MAX_RANDOM_BYTES = 100
+
+
+def get_conf(**options):
+    return {**DEFAULTS, **getattr(settings, "COMPRESSION", {}), **options}
+
+
+def encodings():
+    """Supported codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def parse_accept_encoding(header):
+    """``Accept-Encoding`` as {coding: q}."""
+    codings = {}
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[name] = q
+    return codings
+
+
+def choose_encoding(header):
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = [c for c in encodings() if codings.get(c, wildcard) > 0]
+    # max() keeps the first of equal weights, i.e. the preferred coding.
+    return max(candidates, key=lambda c: codings.get(c, wildcard), default=None)
+
+
+def compress(coding, content, conf):
+    if coding == "br":
+        return brotli.compress(content, quality=conf["BROTLI_QUALITY"])
+    return compress_string(content, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+class CompressionMiddleware:
+    """Compress buffered responses of at least ``MIN_SIZE`` bytes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        conf = get_conf()
+        if (
+            not conf["ENABLED"]
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < conf["MIN_SIZE"]
+        ):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if coding is None:
+            return response
+        compressed = compress(coding, response.content, conf)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = coding
+        # The bytes differ per coding, so a strong ETag has to become weak.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,267 @@
+"""End-to-end API load test driven through the real URLconf.
+
+Workers are threads with their own ``APIClient``; each logs in to one
+seeded tenant and then issues a weighted mix of searches, check-ins,
+board reads and call-next/done pairs. Latencies are collected per
+endpoint and summarised as throughput and p50/p95/p99.
+"""
+
+import math
+import platform
+import random
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.patients.models import Patient
+from apps.tenants.models import Tenant
+from .synthetic import Generator, Writer, seed_tenant
+
+PASSWORD = "loadtest"
+SEARCH_TERMS = 25
+# Operation -> relative weight in the request mix.
+MIX = {
+    "patient-search": 4,
+    "checkin": 2,
+    "queue-list": 8,
+    "queue-call": 2,
+    "login": 1,
+}
+# Endpoint -> statuses that count as success.
+EXPECTED = {
+    "login": (200,),
+    "patient-search": (200,),
+    "checkin": (201,),
+    "queue-list": (200,),
+    "queue-next": (200, 404),
+    "queue-done": (200,),
+}
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class TenantFixture:
+    tenant: Tenant
+    username: str
+    patient_ids: list
+    search_terms: list = field(default_factory=list)
+
+
+def seed(tenants=2, patients=1000, visits=2, prefix="lt", seed=0, days=30):
+    """Create missing tenants with ``rme_core.synthetic``; reuse existing ones.
+
+    A new tenant gets one user per role, ``patients`` patients and about
+    ``visits`` past visits per patient spread over ``days`` days.
+    """
+    generator = Generator(seed, prefix)
+    writer = Writer()
+    password = make_password(PASSWORD)
+    fixtures = []
+    for t in range(tenants):
+        seed_tenant(
+            generator,
+            t,
+            writer,
+            patients=patients,
+            visits=visits * patients,
+            days=days,
+            password=password,
+        )
+        tenant = Tenant.objects.get(subdomain=generator.tenant(t).subdomain)
+        patient_rows = Patient.objects.filter(tenant=tenant).order_by("mrn")
+        ids = list(patient_rows.values_list("id", flat=True)[:patients])
+        # Surnames and MRN fragments, as typed at the registration desk.
+        terms = []
+        for name, mrn in patient_rows.values_list("full_name", "mrn")[:SEARCH_TERMS]:
+            terms += [name.split()[-1], mrn[-5:]]
+        fixtures.append(TenantFixture(tenant, f"{tenant.subdomain}-staff1", ids, terms))
+    return fixtures
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(math.ceil(q / 100 * len(values)) - 1, 0))]
+
+
+class LoadTest:
+    def __init__(self, fixtures, workers=4, requests=200, seed=0, mix=None):
+        self.fixtures = fixtures
+        self.workers = workers
+        self.requests = requests
+        self.seed = seed
+        self.mix = mix or MIX
+        self.latencies = {name: [] for name in EXPECTED}
+        self.errors = {name: {} for name in EXPECTED}
+        self.lock = threading.Lock()
+
+    def run(self):
+        started = time.perf_counter()
+        if self.workers == 1:
+            self.worker(0)
+        else:
+            barrier = threading.Barrier(self.workers)
+            threads = [
+                threading.Thread(target=self.threaded, args=(n, barrier))
+                for n in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return self.report(time.perf_counter() - started)
+
+    def threaded(self, n, barrier):
+        barrier.wait()
+        try:
+            self.worker(n)
+        finally:
+            connections.close_all()
+
+    def worker(self, n):
+        rng = random.Random(self.seed * 1000 + n)
+        fixture = self.fixtures[n % len(self.fixtures)]
+        client = APIClient()
+        tenant_header = {"HTTP_X_TENANT_ID": str(fixture.tenant.id)}
+        headers = {**tenant_header, "HTTP_AUTHORIZATION": self.login(client, fixture)}
+        operations = list(self.mix)
+        weights = [self.mix[name] for name in operations]
+        for _ in range(self.requests):
+            operation = rng.choices(operations, weights)[0]
+            if operation == "login":
+                self.login(client, fixture)
+            elif operation == "patient-search":
+                term = rng.choice(fixture.search_terms)
+                self.call(
+                    "patient-search",
+                    client.get,
+                    "/api/patients/",
+                    {"search": term},
+                    **headers,
+                )
+            elif operation == "checkin":
+                patient = rng.choice(fixture.patient_ids)
+                self.call(
+                    "checkin",
+                    client.post,
+                    "/api/admissions/checkin/",
+                    {"patient_id": str(patient)},
+                    **headers,
+                )
+            elif operation == "queue-list":
+                self.call("queue-list", client.get, "/api/queue/", **headers)
+            elif operation == "queue-call":
+                resp = self.call(
+                    "queue-next", client.post, "/api/queue/next/", **headers
+                )
+                if resp.status_code == 200:
+                    self.call(
+                        "queue-done",
+                        client.post,
+                        f"/api/queue/{resp.json()['id']}/done/",
+                        **headers,
+                    )
+
+    def login(self, client, fixture):
+        resp = self.call(
+            "login",
+            client.post,
+            "/api/auth/login/",
+            {"username": fixture.username, "password": PASSWORD},
+            HTTP_X_TENANT_ID=str(fixture.tenant.id),
+        )
+        return f"Bearer {resp.json().get('access')}"
+
+    def call(self, endpoint, method, *args, **kwargs):
+        started = time.perf_counter()
+        resp = method(*args, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+            if resp.status_code not in EXPECTED[endpoint]:
+                errors = self.errors[endpoint]
+                errors[resp.status_code] = errors.get(resp.status_code, 0) + 1
+        return resp
+
+    def report(self, elapsed):
+        endpoints = {
+            name: summarize(values, self.errors[name], elapsed)
+            for name, values in self.latencies.items()
+            if values
+        }
+        everything = [ms for values in self.latencies.values() for ms in values]
+        errors = {}
+        for by_status in self.errors.values():
+            for code, count in by_status.items():
+                errors[code] = errors.get(code, 0) + count
+        return {
+            "meta": {
+                "commit": git_commit(),
+                "started_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "tenants": len(self.fixtures),
+                "patients": sum(len(f.patient_ids) for f in self.fixtures),
+                "workers": self.workers,
+                "requests_per_worker": self.requests,
+                "seed": self.seed,
+                "mix": self.mix,
+            },
+            "elapsed_seconds": round(elapsed, 3),
+            "endpoints": endpoints,
+            "total": summarize(everything, errors, elapsed),
+        }
+
+
+def summarize(latencies, errors, elapsed):
+    values = sorted(latencies)
+    summary = {
+        "requests": len(values),
+        "errors": sum(errors.values()),
+        "error_statuses": {str(code): n for code, n in sorted(errors.items())},
+        "throughput": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values), 2) if values else None,
+    }
+    for q in PERCENTILES:
+        value = percentile(values, q)
+        summary[f"p{q}_ms"] = None if value is None else round(value, 2)
+    return summary
+
+
+def compare(baseline, report, metrics=("throughput", "p50_ms", "p95_ms", "p99_ms")):
+    """Rows of (endpoint, metric, before, after, change %) for shared endpoints."""
+    rows = []
+    before_all = {**baseline["endpoints"], "total": baseline["total"]}
+    after_all = {**report["endpoints"], "total": report["total"]}
+    for endpoint, after in after_all.items():
+        before = before_all.get(endpoint)
+        if before is None:
+            continue
+        for metric in metrics:
+            old, new = before.get(metric), after.get(metric)
+            if not old or new is None:
+                continue
+            rows.append((endpoint, metric, old, new, round((new - old) / old * 100, 1)))
+    return rows
+
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
@@ -0,0 +1,265 @@
+import bisect
+import logging
+import secrets
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": True,
+    # Queries per request before the N+1 alarm fires; None disables it.
+    "QUERY_BUDGET": 50,
+    # Tighter budgets per route (URL name), e.g. {"queue-list": 2}.
+    "ROUTE_QUERY_BUDGETS": {},
+    # When set, /api/metrics requires "Authorization: Bearer <TOKEN>".
+    # Without one the endpoint is only served with DEBUG on.
+    "TOKEN": None,
+}
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+LABELS = ("route", "method", "tenant")
+
+
+def get_conf(**options):
+    return {**DEFAULTS, **getattr(settings, "METRICS", {}), **options}
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+
+    def __init__(self, name, help_text, buckets, labels=LABELS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        self._series = {}
+
+    def observe(self, label_values, value):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * len(self.buckets), 0, 0.0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += 1
+        series[2] += value
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, (counts, count, total) in sorted(self._series.items()):
+            labels = _format_labels(self.labels, label_values)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _number(bound)
+                yield f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{labels},le="+Inf"}} {count}'
+            yield f"{self.name}_sum{{{labels}}} {_number(total)}"
+            yield f"{self.name}_count{{{labels}}} {count}"
+
+    def clear(self):
+        self._series.clear()
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=LABELS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._series = {}
+
+    def inc(self, label_values, amount=1):
+        self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        for label_values, value in sorted(self._series.items()):
+            yield f"{self.name}{{{_format_labels(self.labels, label_values)}}} {value}"
+
+    def clear(self):
+        self._series.clear()
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class MetricsRegistry:
+    """Process-local request metrics; each worker exposes its own series."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_seconds = Histogram(
+            "rme_http_request_duration_seconds",
+            "Total time spent handling the request.",
+            SECONDS_BUCKETS,
+        )
+        self.db_queries = Histogram(
+            "rme_http_db_queries",
+            "Database queries executed per request.",
+            QUERY_BUCKETS,
+        )
+        self.db_seconds = Histogram(
+            "rme_http_db_duration_seconds",
+            "Time spent in database queries per request.",
+            SECONDS_BUCKETS,
+        )
+        self.render_seconds = Histogram(
+            "rme_http_render_duration_seconds",
+            "Time spent rendering the response body.",
+            SECONDS_BUCKETS,
+        )
+        self.budget_exceeded = Counter(
+            "rme_http_query_budget_exceeded_total",
+            "Requests that ran more queries than their route's budget.",
+        )
+        self.families = (
+            self.request_seconds,
+            self.db_queries,
+            self.db_seconds,
+            self.render_seconds,
+            self.budget_exceeded,
+        )
+
+    def record(self, labels, timing, over_budget=False):
+        with self._lock:
+            self.request_seconds.observe(labels, timing.total)
+            self.db_queries.observe(labels, timing.queries)
+            self.db_seconds.observe(labels, timing.db)
+            self.render_seconds.observe(labels, timing.render)
+            if over_budget:
+                self.budget_exceeded.inc(labels)
+
+    def expose(self):
+        with self._lock:
+            lines = [line for family in self.families for line in family.expose()]
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            for family in self.families:
+                family.clear()
+
+
+registry = MetricsRegistry()
+
+
+class RequestTiming:
+    """Per-request counters; also the database execute wrapper."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+        self.render_started = None
+        self.total = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def rendered(self, response):
+        self.render = time.perf_counter() - self.render_started
+
+    def server_timing(self):
+        app = max(self.total - self.db - self.render, 0.0)
+        return ", ".join(
+            [
+                f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"',
+                f"render;dur={self.render * 1000:.2f}",
+                f"app;dur={app * 1000:.2f}",
+                f"total;dur={self.total * 1000:.2f}",
+            ]
+        )
+
+
+def query_budget(route, conf):
+    return conf["ROUTE_QUERY_BUDGETS"].get(route, conf["QUERY_BUDGET"])
+
+
+class MetricsMiddleware:
+    """Time each request and feed the per-route, per-tenant histograms.
+
+    DB count and time come from an execute wrapper on every connection;
+    render time is the template/DRF renderer pass over the response. The
+    rest of the view, serializers included, is reported as ``app``.
+    Streaming responses are skipped since their work happens after this
+    returns. Runs before TenantMiddleware so tenant lookups are counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        conf = get_conf()
+        if not conf["ENABLED"]:
+            return self.get_response(request)
+
+        timing = RequestTiming()
+        request._timing = timing
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing))
+            response = self.get_response(request)
+        if response.streaming:
+            return response
+        timing.total = time.perf_counter() - timing.started
+        response["Server-Timing"] = timing.server_timing()
+
+        match = request.resolver_match
+        route = match.view_name if match else "unmatched"
+        tenant = getattr(request, "tenant", None)
+        labels = (route, request.method, tenant.subdomain if tenant else "")
+        budget = query_budget(route, conf)
+        over_budget = budget is not None and timing.queries > budget
+        if over_budget:
+            logger.warning(
+                "Query budget exceeded: %s %s ran %d queries (budget %d)",
+                request.method,
+                route,
+                timing.queries,
+                budget,
+            )
+        registry.record(labels, timing, over_budget)
+        return response
+
+    def process_template_response(self, request, response):
+        timing = getattr(request, "_timing", None)
+        if timing is not None:
+            timing.render_started = time.perf_counter()
+            response.add_post_render_callback(timing.rendered)
+        return response
+
+
+def metrics_view(request):
+    """Prometheus text exposition of this worker's request metrics."""
+    token = get_conf()["TOKEN"]
+    if not token and not settings.DEBUG:
+        raise Http404
+    if token:
+        supplied = request.headers.get("Authorization", "")
+        if not secrets.compare_digest(supplied, f"Bearer {token}"):
+            return HttpResponseForbidden()
+    return HttpResponse(registry.expose(), content_type=CONTENT_TYPE)
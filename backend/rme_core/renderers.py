@@ -0,0 +1,76 @@
+"""Response renderers: orjson-backed JSON and optional MessagePack.
+
+``FastJSONRenderer`` is a drop-in for DRF's ``JSONRenderer``. UUIDs,
+datetimes and dates are encoded natively, in the same form DRF's
+serializer fields produce; anything else goes through DRF's encoder.
+Without orjson, or for output DRF would format differently (indented,
+ASCII-only), it is DRF's renderer unchanged.
+"""
+
+import datetime
+
+from rest_framework.utils import encoders
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# The separators DRF writes for JavaScript safety; orjson leaves them raw.
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+_encoder = encoders.JSONEncoder()
+
+
+def default(obj):
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=default, option=orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            # Non-string keys and the like; json.dumps knows what to do.
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+def msgpack_default(obj):
+    if isinstance(obj, datetime.datetime):
+        value = obj.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    if isinstance(obj, datetime.date):
+        return obj.isoformat()
+    return _encoder.default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """``application/msgpack``; offered only when msgpack is installed."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=msgpack_default, use_bin_type=True)
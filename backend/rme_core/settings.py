@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
+from importlib.util import find_spec
 import os
 from datetime import timedelta
 import dj_database_url
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "apps.tenants",
@@ -49,12 +51,15 @@ INSTALLED_APPS = [
     "apps.patients",
     "apps.admissions",
     "apps.queue",
+    "apps.sync",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "rme_core.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "rme_core.metrics.MetricsMiddleware",
     "apps.tenants.middleware.TenantMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -90,6 +95,23 @@ DATABASES = {
     "default": dj_database_url.config(default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
 }
 
+# Holds response-cache versions, idempotency keys and token versions. LocMem
+# is per process; set REDIS_URL to share them between workers.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -135,9 +157,15 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.TenantJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # orjson-backed JSON first; MessagePack only when msgpack is installed.
+    "DEFAULT_RENDERER_CLASSES": (
+        "rme_core.renderers.FastJSONRenderer",
+        *(("rme_core.renderers.MessagePackRenderer",) if find_spec("msgpack") else ()),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -152,4 +180,92 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
     "ROTATE_REFRESH_TOKENS": True,
+    "TOKEN_USER_CLASS": "apps.users.authentication.TenantTokenUser",
+}
+
+# Seconds a user's token version stays cached before the next DB check.
+# Revocations are immediate in-process; other workers see them after this
+# delay unless the default cache is shared (e.g. Redis).
+TOKEN_VERSION_TTL = 30
+
+# Tenant resolution cache used by TenantMiddleware. SHARED_CACHE (a CACHES
+# alias) shares entries across worker processes and carries invalidations
+# to them within SYNC_INTERVAL seconds; without it each worker may serve a
+# renamed or deleted tenant for up to TTL seconds.
+TENANT_REGISTRY = {
+    "MAX_SIZE": 1024,
+    "MAX_MISSING": 256,
+    "TTL": 60,
+    "NEGATIVE_TTL": 5,
+    "SHARED_CACHE": "default" if os.environ.get("REDIS_URL") else None,
+    "SYNC_INTERVAL": 1.0,
+}
+
+# Patient search ranks up to this many matches by relevance; broader terms
+# return every match in list order instead.
+PATIENT_SEARCH_LIMIT = 200
+
+# Patient list counts use planner estimates above this many rows.
+PAGINATION_EXACT_COUNT_THRESHOLD = 1000
+
+# Fan-out for queue board push (SSE at /api/queue/stream/, WebSocket at
+# /api/queue/ws/). InMemoryBroker only reaches clients of the publishing
+# process; REDIS_URL switches to Redis pub/sub so every ASGI worker's
+# clients get every event.
+if os.environ.get("REDIS_URL"):
+    QUEUE_EVENTS = {
+        "BROKER": "apps.queue.events.RedisBroker",
+        "OPTIONS": {"url": os.environ["REDIS_URL"]},
+    }
+else:
+    QUEUE_EVENTS = {
+        "BROKER": "apps.queue.events.InMemoryBroker",
+        "OPTIONS": {},
+    }
+
+# Default priority for check-ins per queue lane when none is given; higher
+# is called first. Unlisted lanes get 0.
+QUEUE_LANE_PRIORITIES = {
+    "EMERGENCY": 100,
+    "ELDERLY": 50,
+    "FOLLOW_UP": 10,
+}
+
+# Idempotency-Key support on check-in and queue actions: responses are
+# replayed for TTL seconds; duplicates arriving mid-flight wait up to WAIT
+# seconds. CACHE should be a shared alias when running several workers.
+IDEMPOTENCY = {
+    "CACHE": "default",
+    "TTL": 24 * 60 * 60,
+    "WAIT": 10,
+}
+
+# Request instrumentation (rme_core.metrics): Server-Timing headers and
+# Prometheus histograms at /api/metrics. A request running more queries than
+# its route's budget logs a warning on "rme_core.metrics". Outside DEBUG
+# the endpoint is only served when METRICS_TOKEN is set.
+METRICS = {
+    "ENABLED": True,
+    "QUERY_BUDGET": 50,
+    "ROUTE_QUERY_BUDGETS": {"queue-list": 2},
+    "TOKEN": os.environ.get("METRICS_TOKEN") or None,
+}
+
+# Read-through cache for the queue board and patient list/detail
+# (apps.tenants.cache). Entries are keyed by a per-tenant, per-resource
+# version that writes bump, so invalidation never scans keys. A write
+# only bumps the version in its own worker's cache, so without a shared
+# one (REDIS_URL) CACHE is None and responses are not cached. TTL 0 also
+# disables it.
+RESPONSE_CACHE = {
+    "CACHE": "default" if os.environ.get("REDIS_URL") else None,
+    "TTL": 300,
+}
+
+# Response compression (rme_core.compression): gzip, or brotli when the
+# brotli package is installed, for buffered responses of MIN_SIZE bytes
+# or more.
+COMPRESSION = {
+    "ENABLED": True,
+    "MIN_SIZE": 1024,
 }
@@ -0,0 +1,335 @@
+"""Deterministic synthetic clinic data for performance work.
+
+Every row is derived from ``(seed, prefix, tenant index, ...)`` and the
+current date alone, including primary keys, so a given seed produces the
+same database on any given day and any slice of it can be regenerated
+without the rest. History is laid out over the days before today.
+"""
+
+import datetime
+import hashlib
+import random
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.admissions.models import Visit
+from apps.patients.importer import copy_objects
+from apps.patients.models import Patient
+from apps.queue.models import Counter, QueueCounter, QueueTicket, QueueWaitStat
+from apps.queue.stats import BUCKETS, bucket
+from apps.sync.models import SyncedModel
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+MALE_NAMES = (
+    "Agus", "Ahmad", "Andi", "Arif", "Bambang", "Budi", "Dedi", "Dimas",
+    "Eko", "Fajar", "Hendra", "Imam", "Joko", "Kurniawan", "Muhammad",
+    "Nugroho", "Putu", "Rahmat", "Rizky", "Slamet", "Sugeng", "Teguh",
+    "Wahyu", "Yusuf", "Ilham", "Gede", "Made", "Hadi", "Rudi", "Yoga",
+)  # fmt: skip
+FEMALE_NAMES = (
+    "Ani", "Ayu", "Dewi", "Dian", "Eka", "Fitri", "Indah", "Kartika",
+    "Lestari", "Maya", "Nur", "Putri", "Rina", "Sari", "Siti", "Sri",
+    "Tri", "Wulan", "Yuni", "Ratna", "Nurul", "Aisyah", "Rahayu", "Intan",
+    "Kadek", "Ketut", "Fatimah", "Lia", "Mega", "Novi",
+)  # fmt: skip
+FAMILY_NAMES = (
+    "Santoso", "Wijaya", "Saputra", "Setiawan", "Pratama", "Hidayat",
+    "Kusuma", "Susanto", "Wibowo", "Purnomo", "Gunawan", "Hakim",
+    "Nasution", "Siregar", "Harahap", "Simanjuntak", "Sitompul", "Lubis",
+    "Ginting", "Tarigan", "Sembiring", "Panjaitan", "Permana", "Suryadi",
+    "Rahman", "Halim", "Syahputra", "Utami", "Anggraini", "Wulandari",
+    "Maharani", "Lestari", "Handayani", "Fauzi", "Firmansyah", "Ramadhan",
+)  # fmt: skip
+# Kecamatan codes (province, regency, district) used as NIK prefixes.
+REGIONS = (
+    "317101", "317102", "317301", "317405", "327301", "327302", "320101",
+    "337401", "337402", "357801", "357802", "350701", "517101", "127101",
+    "127102", "737101", "647201", "157101", "187101", "917101",
+)  # fmt: skip
+ROLES = (
+    User.Role.ADMIN,
+    User.Role.DOCTOR,
+    User.Role.NURSE,
+    User.Role.STAFF,
+    User.Role.CASHIER,
+)
+# Visit volume by weekday (Monday first), relative to a full weekday.
+WEEKDAY_LOAD = (1.0, 0.9, 0.9, 0.85, 0.8, 0.5, 0.2)
+OPENING_HOUR = 7
+OPENING_HOURS = 9
+# Share of tickets that never get served, and of patients without a card.
+SKIP_RATE = 0.04
+NO_NIK_RATE = 0.03
+NO_BPJS_RATE = 0.3
+# Non-default lanes and the share of arrivals that use them.
+LANE_SHARE = {"ELDERLY": 0.12, "FOLLOW_UP": 0.1, "EMERGENCY": 0.02}
+
+
+def stable_uuid(*parts):
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=16)
+    return uuid.UUID(bytes=digest.digest(), version=4)
+
+
+class Generator:
+    """Builds unsaved model instances for tenant number ``t`` under ``seed``."""
+
+    def __init__(self, seed=0, prefix="scale"):
+        self.seed = seed
+        self.prefix = prefix
+        self.today = timezone.localdate()
+        self.midnight = timezone.make_aware(
+            datetime.datetime.combine(self.today, datetime.time())
+        )
+
+    def rng(self, *scope):
+        return random.Random(":".join(map(str, (self.seed, self.prefix, *scope))))
+
+    def uuid(self, *scope):
+        return stable_uuid(self.seed, self.prefix, *scope)
+
+    def tenant(self, t):
+        return Tenant(
+            id=self.uuid(t, "tenant"),
+            name=f"Klinik {self.rng(t, 'tenant').choice(FAMILY_NAMES)} {t}",
+            subdomain=f"{self.prefix}{t}",
+        )
+
+    def users(self, tenant, t, per_role, password):
+        return [
+            User(
+                id=self.uuid(t, "user", role, n),
+                username=f"{tenant.subdomain}-{role.lower()}{n}",
+                tenant=tenant,
+                role=role,
+                password=password,
+            )
+            for role in ROLES
+            for n in range(1, per_role + 1)
+        ]
+
+    def counters(self, tenant, t, count):
+        return [
+            Counter(id=self.uuid(t, "counter", n), tenant=tenant, name=f"Loket {n}")
+            for n in range(1, count + 1)
+        ]
+
+    def patient_id(self, t, i):
+        return self.uuid(t, "patient", i)
+
+    def patient(self, tenant, t, i, days=365):
+        rng = self.rng(t, "patient", i)
+        female = rng.random() < 0.52
+        birth = datetime.date(1940, 1, 1) + datetime.timedelta(
+            days=rng.randrange(83 * 365)
+        )
+        return Patient(
+            id=self.patient_id(t, i),
+            tenant=tenant,
+            full_name=full_name(rng, female),
+            mrn=f"RM{i + 1:08d}",
+            nik="" if rng.random() < NO_NIK_RATE else nik(rng, female, birth),
+            bpjs="" if rng.random() < NO_BPJS_RATE else bpjs(rng),
+            created_at=self.midnight
+            - datetime.timedelta(seconds=rng.randrange(max(days, 1) * 86400)),
+        )
+
+    def patients(self, tenant, t, start, stop, days=365):
+        for i in range(start, stop):
+            yield self.patient(tenant, t, i, days)
+
+    def visit_counts(self, visits, days):
+        """Spread ``visits`` over the ``days`` before today by weekday load."""
+        dates = [self.today - datetime.timedelta(days=d) for d in range(days, 0, -1)]
+        weights = [WEEKDAY_LOAD[day.weekday()] for day in dates]
+        total = sum(weights)
+        counts = [int(visits * w / total) for w in weights]
+        for i in range(visits - sum(counts)):
+            counts[i % len(counts)] += 1
+        return list(zip(dates, counts))
+
+    def day(self, tenant, t, day, count, patients, counters):
+        """One day's visits, tickets, per-lane counters and wait-stat rollups."""
+        rng = self.rng(t, "day", day.isoformat())
+        opening = timezone.make_aware(
+            datetime.datetime.combine(day, datetime.time(OPENING_HOUR))
+        )
+        arrivals = sorted(rng.uniform(0, OPENING_HOURS * 3600) for _ in range(count))
+        numbers = defaultdict(int)
+        stats = {}
+        visits, tickets = [], []
+        for n, offset in enumerate(arrivals):
+            created = opening + datetime.timedelta(seconds=offset)
+            lane = pick_lane(rng)
+            numbers[lane] += 1
+            counter = rng.choice(counters) if counters else None
+            visit = Visit(
+                id=self.uuid(t, "visit", day.isoformat(), n),
+                tenant=tenant,
+                patient_id=self.patient_id(t, rng.randrange(patients)),
+                created_at=created,
+            )
+            ticket = QueueTicket(
+                id=self.uuid(t, "ticket", day.isoformat(), n),
+                tenant=tenant,
+                visit_id=visit.id,
+                number=numbers[lane],
+                lane=lane,
+                priority=settings.QUEUE_LANE_PRIORITIES.get(lane, 0),
+                queue_date=day,
+                counter=counter,
+                created_at=created,
+            )
+            wait = min(rng.expovariate(1 / 900), 3 * 3600)
+            if rng.random() < SKIP_RATE:
+                ticket.state = QueueTicket.State.SKIPPED
+                ticket.finished_at = created + datetime.timedelta(seconds=wait)
+            else:
+                service = 60 + rng.expovariate(1 / 420)
+                ticket.state = QueueTicket.State.DONE
+                ticket.called_at = created + datetime.timedelta(seconds=wait)
+                ticket.finished_at = ticket.called_at + datetime.timedelta(
+                    seconds=service
+                )
+            add_to_rollup(stats, tenant, ticket)
+            visits.append(visit)
+            tickets.append(ticket)
+        last_numbers = [
+            QueueCounter(tenant=tenant, day=day, lane=lane, value=value)
+            for lane, value in numbers.items()
+        ]
+        return visits, tickets, last_numbers, list(stats.values())
+
+
+def full_name(rng, female):
+    first = rng.choice(FEMALE_NAMES if female else MALE_NAMES)
+    shape = rng.random()
+    if shape < 0.15:
+        return first
+    if shape < 0.35:
+        middle = rng.choice(FEMALE_NAMES if female else MALE_NAMES)
+        return f"{first} {middle} {rng.choice(FAMILY_NAMES)}"
+    return f"{first} {rng.choice(FAMILY_NAMES)}"
+
+
+def nik(rng, female, birth):
+    """16 digits: kecamatan code, DDMMYY birth date (day + 40 for women), serial."""
+    day = birth.day + 40 if female else birth.day
+    return (
+        f"{rng.choice(REGIONS)}{day:02d}{birth.month:02d}{birth.year % 100:02d}"
+        f"{rng.randrange(1, 10000):04d}"
+    )
+
+
+def bpjs(rng):
+    """13-digit JKN card number; issued cards start with 000."""
+    return f"000{rng.randrange(10**10):010d}"
+
+
+def pick_lane(rng):
+    roll = rng.random()
+    for lane, share in LANE_SHARE.items():
+        if roll < share:
+            return lane
+        roll -= share
+    return ""
+
+
+def add_to_rollup(stats, tenant, ticket):
+    key = (
+        ticket.queue_date,
+        timezone.localtime(ticket.created_at).hour,
+        ticket.counter_id,
+    )
+    stat = stats.get(key)
+    if stat is None:
+        stat = stats[key] = QueueWaitStat(
+            tenant=tenant,
+            day=key[0],
+            hour=key[1],
+            counter_id=key[2],
+            wait_histogram=[0] * (len(BUCKETS) + 1),
+            service_histogram=[0] * (len(BUCKETS) + 1),
+        )
+    if ticket.state == QueueTicket.State.SKIPPED:
+        stat.skipped += 1
+        return
+    wait = (ticket.called_at - ticket.created_at).total_seconds()
+    service = (ticket.finished_at - ticket.called_at).total_seconds()
+    stat.served += 1
+    stat.wait_seconds += wait
+    stat.service_seconds += service
+    stat.wait_histogram[bucket(wait)] += 1
+    stat.service_histogram[bucket(service)] += 1
+
+
+class Writer:
+    """Bulk inserts in ``batch_size`` chunks; ``COPY`` on PostgreSQL if asked."""
+
+    def __init__(self, batch_size=5000, use_copy=None):
+        self.batch_size = batch_size
+        if use_copy is None:
+            use_copy = connection.vendor == "postgresql"
+        self.use_copy = use_copy
+        self.counts = defaultdict(int)
+
+    def write(self, model, objs, copy=True):
+        objs = list(objs)
+        if not objs:
+            return
+        with transaction.atomic():
+            if issubclass(model, SyncedModel):
+                model.stamp(objs)
+            if copy and self.use_copy:
+                copy_objects(model, objs)
+            else:
+                model.objects.bulk_create(objs, batch_size=self.batch_size)
+        self.counts[model._meta.label] += len(objs)
+
+
+def seed_tenant(
+    generator,
+    t,
+    writer,
+    users_per_role=1,
+    patients=1000,
+    visits=0,
+    days=90,
+    counters=3,
+    password="",
+):
+    """Create tenant ``t`` and all its data; returns None if it already exists.
+
+    Patients and each day of history are committed batch by batch so a
+    large run keeps memory flat and shows progress in the database.
+    """
+    tenant = generator.tenant(t)
+    if Tenant.objects.filter(subdomain=tenant.subdomain).exists():
+        return None
+    with transaction.atomic():
+        tenant.save(force_insert=True)
+        writer.write(
+            User, generator.users(tenant, t, users_per_role, password), copy=False
+        )
+        desks = generator.counters(tenant, t, counters)
+        writer.write(Counter, desks, copy=False)
+    for start in range(0, patients, writer.batch_size):
+        stop = min(start + writer.batch_size, patients)
+        with transaction.atomic():
+            writer.write(Patient, generator.patients(tenant, t, start, stop, days))
+    if not visits or not patients:
+        return tenant
+    for day, count in generator.visit_counts(visits, days):
+        visit_rows, tickets, numbers, stats = generator.day(
+            tenant, t, day, count, patients, desks
+        )
+        with transaction.atomic():
+            writer.write(Visit, visit_rows)
+            writer.write(QueueTicket, tickets)
+            writer.write(QueueCounter, numbers, copy=False)
+            writer.write(QueueWaitStat, stats, copy=False)
+    return tenant
@@ -22,25 +22,36 @@ from rest_framework.routers import DefaultRouter
 
 from apps.users.views import UserViewSet
 from apps.patients.views import PatientViewSet
-from apps.users.auth import TenantTokenObtainPairView
-from rest_framework_simplejwt.views import TokenRefreshView
-from apps.admissions.views import CheckInView
-from apps.queue.views import QueueTicketViewSet
+from apps.users.auth import TenantTokenObtainPairView, TenantTokenRefreshView
+from apps.admissions.views import BatchCheckInView, CheckInView
+from apps.queue.stream import queue_stream
+from apps.queue.views import CounterViewSet, QueueTicketViewSet
+from apps.sync.views import SyncView
 
+from .metrics import metrics_view
 from .views import HealthzView
 
 router = DefaultRouter()
 router.register(r"users", UserViewSet, basename="user")
 router.register(r"patients", PatientViewSet, basename="patient")
 router.register(r"queue", QueueTicketViewSet, basename="queue")
+router.register(r"counters", CounterViewSet, basename="counter")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/healthz", HealthzView.as_view(), name="healthz"),
+    path("api/metrics", metrics_view, name="metrics"),
     path("api/auth/login/", TenantTokenObtainPairView.as_view(), name="login"),
-    path("api/auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("api/auth/refresh/", TenantTokenRefreshView.as_view(), name="token_refresh"),
+    path("api/queue/stream/", queue_stream, name="queue-stream"),
     path("api/", include(router.urls)),
     path("api/admissions/checkin/", CheckInView.as_view(), name="checkin"),
+    path(
+        "api/admissions/checkin/batch/",
+        BatchCheckInView.as_view(),
+        name="checkin-batch",
+    ),
+    path("api/sync/", SyncView.as_view(), name="sync"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/docs/",
@@ -0,0 +1,135 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from apps.queue.services import claim_next, close_day, transition
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+
+@override_settings(RESPONSE_CACHE={"CACHE": "default", "TTL": 300})
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.budi = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi", mrn="1"
+        )
+        self.siti = Patient.objects.create(
+            tenant=self.tenant, full_name="Siti", mrn="2"
+        )
+
+    def get(self, url, etag=None):
+        if etag is not None:
+            return self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        return self.client.get(url, **self.headers)
+
+    def check_in(self, patient):
+        resp = self.client.post(
+            "/api/admissions/checkin/",
+            {"patient_id": str(patient.id)},
+            **self.headers,
+        )
+        self.assertEqual(resp.status_code, 201)
+
+    def test_board_not_modified_skips_the_view(self):
+        self.check_in(self.budi)
+        first = self.get("/api/queue/")
+        etag = first["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        with self.assertNumQueries(0):
+            resp = self.get("/api/queue/", etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+        self.assertEqual(resp["ETag"], etag)
+        self.check_in(self.siti)
+        resp = self.get("/api/queue/", etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+        self.assertEqual(len(resp.json()), 2)
+
+    def test_patient_list_etag_follows_tenant_version(self):
+        etag = self.get("/api/patients/")["ETag"]
+        self.assertEqual(self.get("/api/patients/", etag).status_code, 304)
+        self.assertNotEqual(self.get("/api/patients/?search=Budi")["ETag"], etag)
+        self.client.post(
+            "/api/patients/", {"full_name": "Agus", "mrn": "3"}, **self.headers
+        )
+        resp = self.get("/api/patients/", etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["count"], 3)
+
+    @override_settings(RESPONSE_CACHE={"CACHE": None})
+    def test_lists_have_no_etag_without_a_shared_cache(self):
+        for url in ("/api/patients/", "/api/queue/"):
+            self.assertNotIn("ETag", self.get(url))
+            self.assertEqual(self.get(url, "*").status_code, 200)
+        self.assertIn("ETag", self.get(f"/api/patients/{self.budi.id}/"))
+
+    def test_patient_detail_etag_follows_the_row(self):
+        url = f"/api/patients/{self.budi.id}/"
+        first = self.get(url)
+        etag = first["ETag"]
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get(url, etag).status_code, 304)
+        self.client.patch(
+            f"/api/patients/{self.siti.id}/", {"full_name": "Siti A"}, **self.headers
+        )
+        self.assertEqual(self.get(url, etag).status_code, 304)
+        self.client.patch(url, {"full_name": "Bambang"}, **self.headers)
+        resp = self.get(url, etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["full_name"], "Bambang")
+        self.assertNotEqual(resp["ETag"], etag)
+        self.assertEqual(self.get(url, resp["ETag"]).status_code, 304)
+        self.assertEqual(self.get(url, f'W/"x", {resp["ETag"]}').status_code, 304)
+
+    def test_detail_etag_is_per_representation(self):
+        url = f"/api/patients/{self.budi.id}/"
+        etag = self.get(url)["ETag"]
+        other = self.get(f"/api/patients/{self.siti.id}/")["ETag"]
+        self.assertNotEqual(etag, other)
+        resp = self.client.get(
+            url, HTTP_IF_NONE_MATCH=etag, HTTP_ACCEPT="text/html", **self.headers
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_missing_rows_are_not_found(self):
+        url = f"/api/patients/{self.budi.id}/"
+        etag = self.get(url)["ETag"]
+        self.client.delete(url, **self.headers)
+        self.assertEqual(self.get(url, etag).status_code, 404)
+        self.assertEqual(self.get("/api/patients/nope/", etag).status_code, 404)
+        self.assertEqual(self.get(url, "*").status_code, 404)
+
+    def test_queue_write_paths_maintain_updated_at(self):
+        self.check_in(self.budi)
+        self.check_in(self.siti)
+        ticket = QueueTicket.objects.get(visit__patient=self.budi)
+        stamps = [ticket.updated_at]
+        claim_next(self.tenant)
+        ticket.refresh_from_db()
+        stamps.append(ticket.updated_at)
+        transition(self.tenant, ticket.pk, QueueTicket.State.DONE)
+        ticket.refresh_from_db()
+        stamps.append(ticket.updated_at)
+        self.assertEqual(stamps, sorted(set(stamps)))
+        self.assertEqual(ticket.updated_at, ticket.finished_at)
+        waiting = QueueTicket.objects.get(visit__patient=self.siti)
+        close_day(self.tenant)
+        before = waiting.updated_at
+        waiting.refresh_from_db()
+        self.assertGreater(waiting.updated_at, before)
+        self.assertEqual(waiting.state, QueueTicket.State.SKIPPED)
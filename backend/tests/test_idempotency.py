@@ -0,0 +1,122 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from apps.tenants.idempotency import IdempotencyStore
+from apps.tenants.models import IdempotencyRecord, Tenant
+from apps.users.models import User
+
+
+class IdempotencyKeyTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.auth_headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.budi = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi", mrn="1"
+        )
+        self.siti = Patient.objects.create(
+            tenant=self.tenant, full_name="Siti", mrn="2"
+        )
+
+    def check_in(self, patient, key):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/admissions/checkin/",
+                {"patient_id": str(patient.id)},
+                HTTP_IDEMPOTENCY_KEY=key,
+                **self.auth_headers,
+            )
+
+    def call_next(self, key):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/queue/next/", HTTP_IDEMPOTENCY_KEY=key, **self.auth_headers
+            )
+
+    def test_retried_checkin_replays_first_response(self):
+        first = self.check_in(self.budi, "k1")
+        retry = self.check_in(self.budi, "k1")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Visit.objects.count(), 1)
+
+        cache.clear()
+        self.assertEqual(self.check_in(self.budi, "k1").json(), first.json())
+        self.assertEqual(QueueTicket.objects.count(), 1)
+
+    def test_key_reused_for_another_request_is_rejected(self):
+        self.check_in(self.budi, "k1")
+        resp = self.check_in(self.siti, "k1")
+        self.assertEqual(resp.status_code, 422)
+        self.assertEqual(Visit.objects.count(), 1)
+
+    def test_retried_next_does_not_call_a_second_patient(self):
+        self.check_in(self.budi, "a")
+        self.check_in(self.siti, "b")
+        first = self.call_next("n1")
+        self.assertEqual(self.call_next("n1").json(), first.json())
+        states = set(QueueTicket.objects.values_list("state", flat=True))
+        self.assertEqual(states, {"IN_PROGRESS", "WAITING"})
+
+    def test_error_responses_are_not_stored(self):
+        self.assertEqual(self.call_next("n1").status_code, 404)
+        self.check_in(self.budi, "a")
+        self.assertEqual(self.call_next("n1").status_code, 200)
+
+    def test_requests_without_key_are_untouched(self):
+        for _ in range(2):
+            self.client.post(
+                "/api/admissions/checkin/",
+                {"patient_id": str(self.budi.id)},
+                **self.auth_headers,
+            )
+        self.assertEqual(Visit.objects.count(), 2)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+    @override_settings(IDEMPOTENCY={"WAIT": 1})
+    def test_duplicate_in_flight_waits_for_first_response(self):
+        first = self.check_in(self.budi, "k1")
+        store = IdempotencyStore(self.tenant, "k2")
+        self.assertIsNone(store.get())
+        self.assertTrue(store.acquire())
+
+        def finish():
+            time.sleep(0.2)
+            cache.set(
+                store.cache_key,
+                cache.get(IdempotencyStore(self.tenant, "k1").cache_key),
+            )
+            store.release()
+
+        thread = threading.Thread(target=finish)
+        thread.start()
+        resp = self.check_in(self.budi, "k2")
+        thread.join()
+        self.assertEqual(resp.json(), first.json())
+        self.assertEqual(Visit.objects.count(), 1)
+
+    @override_settings(IDEMPOTENCY={"WAIT": 0.2})
+    def test_duplicate_gives_up_while_first_is_still_running(self):
+        self.assertTrue(IdempotencyStore(self.tenant, "k1").acquire())
+        resp = self.check_in(self.budi, "k1")
+        self.assertEqual(resp.status_code, 409)
+        self.assertFalse(Visit.objects.exists())
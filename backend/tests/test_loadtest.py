@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from rme_core.loadtest import EXPECTED, LoadTest, compare, percentile, seed
+
+
+class LoadTestTests(TestCase):
+    def test_seed_reuses_existing_tenants(self):
+        fixtures = seed(tenants=2, patients=30, visits=2, prefix="x")
+        self.assertEqual(len(fixtures), 2)
+        self.assertEqual(Patient.objects.count(), 60)
+        self.assertEqual(Visit.objects.count(), 120)
+        self.assertEqual(QueueTicket.objects.count(), 120)
+        self.assertTrue(fixtures[0].search_terms)
+        fixtures = seed(tenants=3, patients=30, visits=2, prefix="x")
+        self.assertEqual(Patient.objects.count(), 90)
+        self.assertEqual(QueueTicket.objects.count(), 180)
+        self.assertEqual(len(fixtures[0].patient_ids), 30)
+        self.assertEqual(fixtures[2].username, "x2-staff1")
+
+    def test_run_covers_every_endpoint(self):
+        fixtures = seed(tenants=1, patients=20, visits=1)
+        mix = {"patient-search": 1, "checkin": 1, "queue-list": 1, "queue-call": 1}
+        report = LoadTest(fixtures, workers=1, requests=40, seed=1, mix=mix).run()
+        self.assertEqual(set(report["endpoints"]), set(EXPECTED))
+        self.assertEqual(report["total"]["errors"], 0)
+        for summary in report["endpoints"].values():
+            self.assertLessEqual(summary["p50_ms"], summary["p95_ms"])
+            self.assertLessEqual(summary["p95_ms"], summary["p99_ms"])
+        self.assertEqual(report["meta"]["workers"], 1)
+
+    def test_command_writes_and_compares_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.json")
+            args = ["--tenants=1", "--patients=10", "--visits=0", "--workers=1"]
+            call_command(
+                "loadtest",
+                *args,
+                "--requests=10",
+                f"--output={path}",
+                stdout=StringIO(),
+            )
+            with open(path) as f:
+                report = json.load(f)
+            # Login plus ten operations; a call adds next and done.
+            self.assertGreaterEqual(report["total"]["requests"], 11)
+            out = StringIO()
+            call_command(
+                "loadtest", *args, "--requests=10", f"--compare={path}", stdout=out
+            )
+        self.assertIn("total", out.getvalue())
+        self.assertIn("throughput", out.getvalue())
+
+    def test_percentile_and_compare(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertIsNone(percentile([], 50))
+        before = {"endpoints": {"a": {"p95_ms": 10.0}}, "total": {"p95_ms": 20.0}}
+        after = {"endpoints": {"a": {"p95_ms": 15.0}}, "total": {"p95_ms": 10.0}}
+        self.assertEqual(
+            compare(before, after, metrics=("p95_ms",)),
+            [("a", "p95_ms", 10.0, 15.0, 50.0), ("total", "p95_ms", 20.0, 10.0, -50.0)],
+        )
@@ -0,0 +1,145 @@
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.queue.models import QueueTicket
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from rme_core.metrics import Histogram, registry
+
+
+TOKEN = "s3cret"
+
+
+def metrics_override(**options):
+    return override_settings(
+        METRICS={
+            "ENABLED": True,
+            "QUERY_BUDGET": 50,
+            "ROUTE_QUERY_BUDGETS": {},
+            "TOKEN": TOKEN,
+            **options,
+        }
+    )
+
+
+def server_timing(response):
+    entries = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        entries[name] = dict(param.split("=", 1) for param in params)
+    return entries
+
+
+@metrics_override()
+class MetricsMiddlewareTests(APITestCase):
+    def setUp(self):
+        registry.clear()
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.auth_headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        for number in range(1, 4):
+            patient = Patient.objects.create(
+                tenant=self.tenant, full_name=f"P{number}", mrn=str(number)
+            )
+            visit = Visit.objects.create(tenant=self.tenant, patient=patient)
+            QueueTicket.objects.create(tenant=self.tenant, visit=visit, number=number)
+        registry.clear()
+
+    def scrape(self):
+        return self.client.get("/api/metrics", HTTP_AUTHORIZATION=f"Bearer {TOKEN}")
+
+    def test_server_timing_reports_queries_and_phases(self):
+        with self.assertNumQueries(1) as ctx:
+            resp = self.client.get("/api/queue/", **self.auth_headers)
+        self.assertEqual(resp.status_code, 200)
+        timing = server_timing(resp)
+        self.assertEqual(set(timing), {"db", "render", "app", "total"})
+        self.assertEqual(timing["db"]["desc"], f'"{len(ctx.captured_queries)} queries"')
+        self.assertGreater(float(timing["render"]["dur"]), 0)
+        self.assertGreaterEqual(
+            float(timing["total"]["dur"]), float(timing["db"]["dur"])
+        )
+
+    def test_metrics_endpoint_exposes_route_and_tenant_histograms(self):
+        self.client.get("/api/queue/", **self.auth_headers)
+        self.client.get("/api/queue/", **self.auth_headers)
+        resp = self.scrape()
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = resp.content.decode()
+        labels = 'route="queue-list",method="GET",tenant="t"'
+        self.assertIn(f"rme_http_request_duration_seconds_count{{{labels}}} 2", body)
+        self.assertIn(f'rme_http_db_queries_bucket{{{labels},le="1"}} 2', body)
+        self.assertIn(f'rme_http_db_queries_bucket{{{labels},le="+Inf"}} 2', body)
+        self.assertIn("# TYPE rme_http_render_duration_seconds histogram", body)
+        self.assertNotIn("rme_http_query_budget_exceeded_total{", body)
+
+    def test_query_budget_alarm(self):
+        with metrics_override(ROUTE_QUERY_BUDGETS={"queue-list": 0}):
+            with self.assertLogs("rme_core.metrics", "WARNING") as logs:
+                self.client.get("/api/queue/", **self.auth_headers)
+        self.assertIn("GET queue-list ran 1 queries (budget 0)", logs.output[0])
+        body = self.scrape().content.decode()
+        self.assertIn(
+            "rme_http_query_budget_exceeded_total"
+            '{route="queue-list",method="GET",tenant="t"} 1',
+            body,
+        )
+
+    def test_rejected_tenant_is_recorded_as_unmatched(self):
+        resp = self.client.get("/api/queue/", HTTP_X_TENANT_ID="nope")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("Server-Timing", resp)
+        body = self.scrape().content.decode()
+        self.assertIn(
+            'rme_http_request_duration_seconds_count{route="unmatched",'
+            'method="GET",tenant=""} 1',
+            body,
+        )
+
+    def test_streaming_responses_are_skipped(self):
+        resp = self.client.get("/api/patients/export/", **self.auth_headers)
+        self.assertTrue(resp.streaming)
+        b"".join(resp.streaming_content)
+        self.assertNotIn("Server-Timing", resp)
+        body = self.scrape().content.decode()
+        self.assertNotIn("patient-export", body)
+
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get("/api/metrics").status_code, 403)
+        self.assertEqual(self.scrape().status_code, 200)
+        with metrics_override(TOKEN=None):
+            self.assertEqual(self.client.get("/api/metrics").status_code, 404)
+            with override_settings(DEBUG=True):
+                self.assertEqual(self.client.get("/api/metrics").status_code, 200)
+
+    def test_disabled(self):
+        with metrics_override(ENABLED=False):
+            resp = self.client.get("/api/queue/", **self.auth_headers)
+        self.assertNotIn("Server-Timing", resp)
+        self.assertNotIn("queue-list", self.scrape().content.decode())
+
+
+class HistogramTests(SimpleTestCase):
+    def test_buckets_are_cumulative_and_upper_inclusive(self):
+        histogram = Histogram("h", "help", (1, 5), labels=("route",))
+        for value in (0, 1, 3, 5, 9):
+            histogram.observe(("r",), value)
+        lines = list(histogram.expose())
+        self.assertIn('h_bucket{route="r",le="1"} 2', lines)
+        self.assertIn('h_bucket{route="r",le="5"} 4', lines)
+        self.assertIn('h_bucket{route="r",le="+Inf"} 5', lines)
+        self.assertIn('h_sum{route="r"} 18.0', lines)
+        self.assertIn('h_count{route="r"} 5', lines)
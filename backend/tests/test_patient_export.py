@@ -0,0 +1,84 @@
+import csv
+import gzip
+import io
+import json
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from apps.patients.exporter import ROWS_PER_CHUNK
+from apps.patients.models import Patient
+
+
+class PatientExportTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T1", subdomain="t1")
+        other = Tenant.objects.create(name="T2", subdomain="t2")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        Patient.objects.bulk_create(
+            Patient(tenant=self.tenant, full_name=f"Pasien, {i}", mrn=str(i))
+            for i in range(ROWS_PER_CHUNK + 5)
+        )
+        Patient.objects.create(tenant=other, full_name="Other", mrn="x")
+        resp = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {resp.json()['access']}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+
+    def export(self, query=""):
+        resp = self.client.get(f"/api/patients/export/{query}", **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        chunks = list(resp.streaming_content)
+        return resp, chunks
+
+    def test_csv_export_streams_in_chunks(self):
+        resp, chunks = self.export()
+        self.assertEqual(resp["Content-Type"], "text/csv")
+        self.assertGreater(len(chunks), 1)
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(len(rows), ROWS_PER_CHUNK + 5)
+        self.assertIn("Pasien, 0", {r["full_name"] for r in rows})
+
+    async def test_asgi_export_streams_without_buffering(self):
+        resp = await self.async_client.get(
+            "/api/patients/export/",
+            headers={
+                "authorization": self.headers["HTTP_AUTHORIZATION"],
+                "x-tenant-id": self.headers["HTTP_X_TENANT_ID"],
+            },
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.is_async)
+        chunks = [chunk async for chunk in resp.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(len(rows), ROWS_PER_CHUNK + 5)
+
+    def test_ndjson_gzip_export(self):
+        resp, chunks = self.export("?fmt=ndjson&compress=gzip")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        lines = gzip.decompress(b"".join(chunks)).decode().splitlines()
+        self.assertEqual(len(lines), ROWS_PER_CHUNK + 5)
+        self.assertEqual(
+            set(json.loads(lines[0])),
+            {"id", "full_name", "mrn", "nik", "bpjs", "created_at"},
+        )
+
+    def test_unknown_format(self):
+        resp = self.client.get("/api/patients/export/?fmt=xml", **self.headers)
+        self.assertEqual(resp.status_code, 400)
+
+    def test_management_command(self):
+        out = io.StringIO()
+        call_command("export_patients", "t1", "--format", "ndjson", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), ROWS_PER_CHUNK + 5)
@@ -0,0 +1,86 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from apps.patients.lookup import identifier_type
+from apps.patients.models import Patient
+
+
+class PatientLookupTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T1", subdomain="t1")
+        self.other = Tenant.objects.create(name="T2", subdomain="t2")
+        User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        resp = self.client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {resp.json()['access']}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.patient = Patient.objects.create(
+            tenant=self.tenant,
+            full_name="Budi",
+            mrn="RM-001",
+            nik="3201234567890001",
+            bpjs="0001234567890",
+        )
+        Patient.objects.create(
+            tenant=self.other, full_name="Other", mrn="RM-002", nik="3201234567890002"
+        )
+
+    def test_identifier_type_detection(self):
+        self.assertEqual(identifier_type("3201234567890001"), "nik")
+        self.assertEqual(identifier_type("0001234567890"), "bpjs")
+        self.assertEqual(identifier_type("RM-001"), "mrn")
+
+    def test_get_single_identifier(self):
+        resp = self.client.get(
+            "/api/patients/lookup/?id=3201234567890001", **self.headers
+        )
+        self.assertEqual(resp.status_code, 200)
+        [result] = resp.json()
+        self.assertEqual(result["type"], "nik")
+        self.assertEqual(result["patient"]["id"], str(self.patient.id))
+
+    def test_batch_lookup_uses_one_query(self):
+        identifiers = ["RM-001", "0001234567890", "3201234567890002", "missing"]
+        self.client.get("/api/patients/lookup/?id=warmup", **self.headers)
+        with self.assertNumQueries(1):
+            resp = self.client.post(
+                "/api/patients/lookup/",
+                {"identifiers": identifiers},
+                format="json",
+                **self.headers,
+            )
+        results = resp.json()
+        self.assertEqual([r["identifier"] for r in results], identifiers)
+        self.assertEqual(results[0]["patient"]["full_name"], "Budi")
+        self.assertEqual(results[1]["type"], "bpjs")
+        self.assertEqual(results[1]["patient"]["full_name"], "Budi")
+        # Other tenant's NIK must not leak.
+        self.assertIsNone(results[2]["patient"])
+        self.assertIsNone(results[3]["patient"])
+
+    def test_explicit_type(self):
+        resp = self.client.get(
+            "/api/patients/lookup/?id=0001234567890&type=mrn", **self.headers
+        )
+        self.assertIsNone(resp.json()[0]["patient"])
+
+    def test_all_digit_mrn_is_found_without_type(self):
+        mrn = Patient.objects.create(
+            tenant=self.tenant, full_name="Siti", mrn="0000000000042"
+        )
+        resp = self.client.get("/api/patients/lookup/?id=0000000000042", **self.headers)
+        [result] = resp.json()
+        self.assertEqual(result["type"], "mrn")
+        self.assertEqual(result["patient"]["id"], str(mrn.id))
+        resp = self.client.get(
+            "/api/patients/lookup/?id=0000000000042&type=bpjs", **self.headers
+        )
+        self.assertIsNone(resp.json()[0]["patient"])
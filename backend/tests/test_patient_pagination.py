@@ -0,0 +1,84 @@
+import unittest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.patients.pagination import KeysetPagination
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from apps.patients.models import Patient
+
+
+class PatientKeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T1", subdomain="t1")
+        User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        resp = self.client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {resp.json()['access']}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        # Duplicate names exercise the id tie-breaker.
+        for i in range(25):
+            Patient.objects.create(tenant=self.tenant, full_name=f"P{i % 7}", mrn=i)
+        self.expected = list(
+            Patient.objects.order_by("full_name", "id").values_list("id", flat=True)
+        )
+
+    def get(self, url):
+        resp = self.client.get(url, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_walk_forward_and_back(self):
+        page = self.get("/api/patients/")
+        self.assertEqual(page["count"], 25)
+        self.assertIsNone(page["previous"])
+        pages = [page]
+        while page["next"]:
+            page = self.get(page["next"])
+            pages.append(page)
+        seen = [p["id"] for page in pages for p in page["results"]]
+        self.assertEqual(seen, [str(pk) for pk in self.expected])
+        self.assertEqual(len(pages), 3)
+
+        back = self.get(pages[-1]["previous"])
+        self.assertEqual(back["results"], pages[-2]["results"])
+        back = self.get(back["previous"])
+        self.assertEqual(back["results"], pages[0]["results"])
+        self.assertIsNone(back["previous"])
+
+    def test_deep_pages_do_not_offset(self):
+        page = self.get("/api/patients/?page_size=20")
+        with CaptureQueriesContext(connection) as ctx:
+            self.get(page["next"])
+        self.assertFalse(any("OFFSET" in q["sql"] for q in ctx.captured_queries))
+
+    def test_cursor_pages_reuse_the_first_count(self):
+        page = self.get("/api/patients/?page_size=10")
+        with CaptureQueriesContext(connection) as ctx:
+            page = self.get(page["next"])
+        self.assertEqual(page["count"], 25)
+        self.assertFalse(any("COUNT" in q["sql"] for q in ctx.captured_queries))
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_cursor_page_is_an_index_range(self):
+        queryset = Patient.objects.filter(tenant=self.tenant)
+        for backwards, bound in ((False, "full_name>?"), (True, "full_name<?")):
+            plan = KeysetPagination().seek(queryset, ("P3", 1), backwards).explain()
+            self.assertIn(f"patient_tenant_name_idx (tenant_id=? AND {bound})", plan)
+
+    def test_invalid_cursor(self):
+        resp = self.client.get("/api/patients/?cursor=garbage", **self.headers)
+        self.assertEqual(resp.status_code, 404)
+
+    def test_page_number_still_supported(self):
+        page = self.get("/api/patients/?page=3")
+        self.assertEqual(len(page["results"]), 5)
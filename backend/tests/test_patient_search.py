@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from apps.patients.models import Patient
+from apps.patients import search as search_module
+from apps.patients.search import fts_available, search_patients
+
+
+class PatientSearchTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T1", subdomain="t1")
+        self.other = Tenant.objects.create(name="T2", subdomain="t2")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        resp = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {resp.json()['access']}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.budi = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi Santoso", mrn="RM-0001", nik="3201"
+        )
+        Patient.objects.create(tenant=self.tenant, full_name="Siti Budiarti", mrn="2")
+        Patient.objects.create(tenant=self.tenant, full_name="Agus", mrn="3")
+        Patient.objects.create(tenant=self.other, full_name="Budi Lain", mrn="1")
+
+    def search(self, term):
+        resp = self.client.get(f"/api/patients/?search={term}", **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        return [p["full_name"] for p in resp.json()["results"]]
+
+    def test_fts_index_is_installed(self):
+        if connection.vendor == "sqlite":
+            self.assertTrue(fts_available())
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "FTS5 is SQLite only")
+    def test_missing_fts_table_is_checked_once(self):
+        search_module.forget_fts_tables()
+        with mock.patch.object(search_module, "FTS_TABLE", "missing_fts"):
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertFalse(fts_available())
+                self.assertFalse(fts_available())
+        self.assertEqual(len(ctx.captured_queries), 1)
+        search_module.forget_fts_tables()
+        self.assertTrue(fts_available())
+
+    def test_search_matches_substrings_within_tenant(self):
+        self.assertCountEqual(self.search("budi"), ["Budi Santoso", "Siti Budiarti"])
+        self.assertEqual(self.search("0001"), ["Budi Santoso"])
+
+    def test_short_terms_fall_back_to_substring(self):
+        self.assertEqual(self.search("Ag"), ["Agus"])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.budi.full_name = "Bambang"
+        self.budi.save()
+        self.assertEqual(self.search("bambang"), ["Bambang"])
+        self.assertEqual(self.search("budi"), ["Siti Budiarti"])
+        self.budi.delete()
+        self.assertEqual(self.search("bambang"), [])
+
+    @override_settings(PATIENT_SEARCH_LIMIT=1)
+    def test_broad_terms_return_every_match(self):
+        resp = self.client.get("/api/patients/?search=budi", **self.headers)
+        self.assertEqual(resp.json()["count"], 2)
+        self.assertEqual(
+            [p["full_name"] for p in resp.json()["results"]],
+            ["Budi Santoso", "Siti Budiarti"],
+        )
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "PostgreSQL query plan")
+    def test_substring_match_uses_trigram_indexes(self):
+        # Across tenants, so only the search predicate can use an index.
+        queryset = search_patients(Patient.objects.all(), "budi")
+        with connection.cursor() as cursor:
+            # The test table is tiny; make the planner show what it can use.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertNotIn("Seq Scan", plan)
+        for field in ("full_name", "mrn", "nik", "bpjs"):
+            self.assertIn(f"patients_patient_{field}_upper_trgm", plan)
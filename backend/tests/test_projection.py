@@ -0,0 +1,157 @@
+import datetime
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.models import Patient
+from apps.patients.serializers import PatientSerializer, patient_projection
+from apps.queue.models import Counter, QueueTicket
+from apps.queue.serializers import QueueTicketSerializer, ticket_projection
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from rme_core import renderers
+from rme_core.projection import Projection
+from rme_core.renderers import FastJSONRenderer, MessagePackRenderer
+
+
+def candidates():
+    found = [JSONRenderer(), FastJSONRenderer()]
+    if renderers.msgpack is not None:
+        found.append(MessagePackRenderer())
+    return found
+
+
+class ProjectionTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        counter = Counter.objects.create(tenant=self.tenant, name="Loket 1")
+        names = ["Budi", "Siti Nurhaliza Ä", 'Agus "Gus"', "Dewi 😀"]
+        for n, name in enumerate(names):
+            patient = Patient.objects.create(
+                tenant=self.tenant,
+                full_name=name,
+                mrn=f"RM{n}",
+                nik="3171234567890123" if n % 2 else "",
+                bpjs="0001234567890" if n == 3 else "",
+            )
+            # Whole seconds render without a fraction; check both shapes.
+            created = datetime.datetime(2026, 10, 18, 7, 30, n, n * 250000)
+            Patient.objects.filter(pk=patient.pk).update(
+                created_at=timezone.make_aware(created, datetime.UTC)
+            )
+            visit = Visit.objects.create(tenant=self.tenant, patient=patient)
+            QueueTicket.objects.create(
+                tenant=self.tenant,
+                visit=visit,
+                number=n + 1,
+                lane="lansia" if n == 2 else "",
+                priority=n,
+                counter=counter if n % 2 else None,
+            )
+
+    def assertSameBytes(self, expected, actual):
+        for renderer in candidates():
+            self.assertEqual(renderer.render(actual), renderer.render(expected))
+
+    def test_patients_match_serializer(self):
+        queryset = Patient.objects.filter(tenant=self.tenant).order_by("full_name")
+        fields = tuple(patient_projection.columns)
+        for zone in ("UTC", "Asia/Jakarta"):
+            with timezone.override(zone):
+                self.assertSameBytes(
+                    PatientSerializer(queryset, many=True).data,
+                    patient_projection.render(
+                        patient_projection.values(queryset, fields), fields
+                    ),
+                )
+
+    def test_tickets_match_serializer(self):
+        fields = tuple(ticket_projection.columns)
+        rows = ticket_projection.values(QueueTicket.objects.active(self.tenant), fields)
+        self.assertSameBytes(
+            QueueTicketSerializer(
+                QueueTicket.objects.board(self.tenant), many=True
+            ).data,
+            ticket_projection.render(rows, fields),
+        )
+
+    def test_list_responses_match_serializer(self):
+        resp = self.client.get("/api/patients/?page_size=3", **self.headers)
+        patients = Patient.objects.filter(tenant=self.tenant).order_by(
+            "full_name", "id"
+        )
+        expected = {
+            **resp.data,
+            "results": PatientSerializer(patients[:3], many=True).data,
+        }
+        self.assertEqual(resp.content, FastJSONRenderer().render(expected))
+        resp = self.client.get("/api/queue/", **self.headers)
+        expected = QueueTicketSerializer(
+            QueueTicket.objects.board(self.tenant), many=True
+        )
+        self.assertEqual(resp.content, FastJSONRenderer().render(expected.data))
+
+    def test_sparse_fieldsets_shrink_query_and_payload(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/patients/?fields=full_name,id", **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(list(resp.json()["results"][0]), ["id", "full_name"])
+        sql = ctx.captured_queries[-1]["sql"]
+        self.assertIn('"patients_patient"."full_name"', sql)
+        self.assertNotIn('"patients_patient"."nik"', sql)
+        self.assertNotIn('"patients_patient"."created_at"', sql)
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/queue/?fields=number,counter", **self.headers)
+        ticket = resp.json()[1]
+        self.assertEqual(list(ticket), ["number", "counter"])
+        self.assertEqual(ticket["number"], 2)
+        self.assertIsNotNone(ticket["counter"])
+        sql = ctx.captured_queries[-1]["sql"]
+        self.assertNotIn("patients_patient", sql)
+        self.assertNotIn('"queue_queueticket"."lane"', sql)
+
+    def test_sparse_fieldsets_keep_cursors_and_search(self):
+        resp = self.client.get("/api/patients/?fields=mrn&page_size=2", **self.headers)
+        first = resp.json()
+        self.assertEqual(first["results"], [{"mrn": "RM2"}, {"mrn": "RM0"}])
+        second = self.client.get(first["next"], **self.headers).json()
+        self.assertEqual(second["results"], [{"mrn": "RM3"}, {"mrn": "RM1"}])
+        resp = self.client.get("/api/patients/?fields=mrn&search=Dewi", **self.headers)
+        self.assertEqual(resp.json()["results"], [{"mrn": "RM3"}])
+
+    def test_unknown_fields_are_rejected(self):
+        resp = self.client.get("/api/patients/?fields=id,tenant,secret", **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json(), {"fields": ["Unknown fields: secret, tenant."]})
+        resp = self.client.get("/api/queue/?fields=visit", **self.headers)
+        self.assertEqual(resp.status_code, 400)
+
+    def test_fields_without_a_plain_column_are_refused(self):
+        class NestedSerializer(serializers.ModelSerializer):
+            patient_name = serializers.CharField(source="visit.patient.full_name")
+
+            class Meta:
+                model = QueueTicket
+                fields = ["id", "patient_name"]
+
+        with self.assertRaises(ImproperlyConfigured):
+            Projection(NestedSerializer).columns
@@ -0,0 +1,174 @@
+import datetime
+import gzip
+import json
+import unittest
+import uuid
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from apps.patients.models import Patient
+from apps.patients.serializers import PatientSerializer
+from apps.queue.serializers import QueueTicketSerializer
+from apps.tenants.models import Tenant
+from apps.users.models import User
+from rme_core import compression, renderers
+from rme_core.compression import choose_encoding
+from rme_core.renderers import FastJSONRenderer, MessagePackRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def payloads(self):
+        tenant = Tenant(name="T", subdomain="t")
+        now = datetime.datetime(2026, 10, 18, 7, 30, 1, 250000, tzinfo=datetime.UTC)
+        patient = Patient(
+            tenant=tenant,
+            full_name="Siti\u2028Nurhaliza Ä",
+            mrn="RM1",
+            created_at=now,
+            updated_at=now,
+        )
+        ticket = {
+            "id": uuid.uuid4(),
+            "number": 7,
+            "state": "WAITING",
+            "lane": "",
+            "priority": 0,
+            "counter_id": None,
+            "patient_name": "Budi",
+        }
+        return [
+            PatientSerializer([patient], many=True).data,
+            {"results": PatientSerializer(patient).data, "count": 1, "next": None},
+            QueueTicketSerializer([ticket], many=True).data,
+            {"detail": ErrorDetail("Not found.", code="not_found")},
+            {1: "non-string key", "ratio": 0.1, "items": ("a", "b")},
+        ]
+
+    @unittest.skipUnless(renderers.orjson, "orjson is not installed")
+    def test_matches_drf_json_renderer(self):
+        for data in self.payloads():
+            self.assertEqual(
+                FastJSONRenderer().render(data), JSONRenderer().render(data)
+            )
+
+    @unittest.skipUnless(renderers.orjson, "orjson is not installed")
+    def test_native_types_render_like_serializer_fields(self):
+        now = datetime.datetime(2026, 10, 18, 7, 30, 1, 250000, tzinfo=datetime.UTC)
+        pk = uuid.uuid4()
+        rendered = json.loads(
+            FastJSONRenderer().render({"id": pk, "at": now, "day": now.date()})
+        )
+        patient = Patient(id=pk, created_at=now, updated_at=now)
+        fields = PatientSerializer(patient).data
+        self.assertEqual(rendered["id"], fields["id"])
+        self.assertEqual(rendered["at"], fields["created_at"])
+        self.assertEqual(rendered["day"], "2026-10-18")
+
+    def test_indent_and_empty_bodies_fall_back(self):
+        data = {"a": [1, 2]}
+        indented = "application/json; indent=2"
+        self.assertEqual(
+            FastJSONRenderer().render(data, indented),
+            JSONRenderer().render(data, indented),
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    @unittest.skipUnless(renderers.msgpack, "msgpack is not installed")
+    def test_msgpack(self):
+        now = datetime.datetime(2026, 10, 18, 7, 30, tzinfo=datetime.UTC)
+        pk = uuid.uuid4()
+        body = MessagePackRenderer().render({"id": pk, "at": now})
+        self.assertEqual(
+            renderers.msgpack.unpackb(body),
+            {"id": str(pk), "at": "2026-10-18T07:30:00Z"},
+        )
+
+
+class AcceptEncodingTests(SimpleTestCase):
+    def test_choose_encoding(self):
+        best = "br" if compression.brotli else "gzip"
+        self.assertEqual(choose_encoding("gzip, deflate, br"), best)
+        self.assertEqual(choose_encoding("br;q=0.5, gzip"), "gzip")
+        self.assertEqual(choose_encoding("*"), best)
+        self.assertIsNone(choose_encoding("gzip;q=0, br;q=0"))
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertIsNone(choose_encoding(""))
+
+
+@override_settings(
+    COMPRESSION={"ENABLED": True, "MIN_SIZE": 1024},
+    RESPONSE_CACHE={"CACHE": "default", "TTL": 300},
+)
+class CompressionMiddlewareTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        patients = [
+            Patient.objects.create(tenant=self.tenant, full_name=f"P{i}", mrn=str(i))
+            for i in range(20)
+        ]
+        self.client.post(
+            "/api/admissions/checkin/batch/",
+            {"patient_ids": [str(p.id) for p in patients]},
+            format="json",
+            **self.headers,
+        )
+
+    def board(self, **extra):
+        return self.client.get("/api/queue/", **self.headers, **extra)
+
+    def test_gzip_above_threshold(self):
+        plain = self.board()
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertGreater(len(plain.content), 1024)
+        resp = self.board(HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", resp["Vary"])
+        self.assertEqual(resp["Content-Length"], str(len(resp.content)))
+        self.assertLess(len(resp.content), len(plain.content))
+        self.assertEqual(json.loads(gzip.decompress(resp.content)), plain.json())
+
+    def test_weak_etag_still_revalidates(self):
+        resp = self.board(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertTrue(resp["ETag"].startswith('W/"'))
+        resp = self.board(HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, 304)
+
+    def test_small_and_streaming_responses_pass_through(self):
+        resp = self.client.get(
+            "/api/counters/", HTTP_ACCEPT_ENCODING="gzip", **self.headers
+        )
+        self.assertNotIn("Content-Encoding", resp)
+        resp = self.client.get(
+            "/api/patients/export/", HTTP_ACCEPT_ENCODING="gzip", **self.headers
+        )
+        self.assertTrue(resp.streaming)
+        self.assertNotIn("Content-Encoding", resp)
+
+    def test_disabled(self):
+        with self.settings(COMPRESSION={"ENABLED": False}):
+            resp = self.board(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", resp)
+
+    @unittest.skipUnless(compression.brotli, "brotli is not installed")
+    def test_brotli(self):
+        resp = self.board(HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(resp["Content-Encoding"], "br")
+        self.assertEqual(
+            json.loads(compression.brotli.decompress(resp.content)),
+            self.board().json(),
+        )
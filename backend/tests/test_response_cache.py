@@ -0,0 +1,178 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.importer import PatientImporter
+from apps.patients.models import Patient
+from apps.queue.models import Counter, QueueTicket
+from apps.queue.services import close_day
+from apps.tenants.cache import (
+    CACHE_HEADER,
+    PATIENTS,
+    QUEUE,
+    bump,
+    get_version,
+    version_key,
+)
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+
+@override_settings(RESPONSE_CACHE={"CACHE": "default", "TTL": 300})
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        self.other = Tenant.objects.create(name="O", subdomain="o")
+        self.headers = self.login(self.tenant, "admin", User.Role.ADMIN)
+        self.budi = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi", mrn="1"
+        )
+        self.siti = Patient.objects.create(
+            tenant=self.tenant, full_name="Siti", mrn="2"
+        )
+
+    def login(self, tenant, username, role):
+        User.objects.create_user(
+            username=username, password="pass", tenant=tenant, role=role
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": username, "password": "pass"},
+            HTTP_X_TENANT_ID=str(tenant.id),
+        ).json()["access"]
+        return {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(tenant.id),
+        }
+
+    def board(self, headers=None):
+        resp = self.client.get("/api/queue/", **(headers or self.headers))
+        self.assertEqual(resp.status_code, 200)
+        return resp
+
+    def states(self):
+        return [(t["patient_name"], t["state"]) for t in self.board().json()]
+
+    def test_repeat_reads_are_served_from_cache(self):
+        self.client.post(
+            "/api/admissions/checkin/",
+            {"patient_id": str(self.budi.id)},
+            **self.headers,
+        )
+        self.assertEqual(self.board()[CACHE_HEADER], "MISS")
+        with self.assertNumQueries(0):
+            resp = self.board()
+        self.assertEqual(resp[CACHE_HEADER], "HIT")
+        self.assertEqual(resp.json()[0]["patient_name"], "Budi")
+
+    def test_queue_writes_invalidate_the_board(self):
+        self.assertEqual(self.states(), [])
+        self.client.post(
+            "/api/admissions/checkin/",
+            {"patient_id": str(self.budi.id)},
+            **self.headers,
+        )
+        self.client.post(
+            "/api/admissions/checkin/batch/",
+            {"patient_ids": [str(self.siti.id)]},
+            format="json",
+            **self.headers,
+        )
+        self.assertEqual(self.states(), [("Budi", "WAITING"), ("Siti", "WAITING")])
+        ticket = self.client.post("/api/queue/next/", **self.headers).json()
+        self.assertEqual(self.states(), [("Budi", "IN_PROGRESS"), ("Siti", "WAITING")])
+        self.client.post(f"/api/queue/{ticket['id']}/done/", **self.headers)
+        self.assertEqual(self.states(), [("Siti", "WAITING")])
+        close_day(tenant=None)
+        self.assertEqual(self.states(), [])
+
+    def test_orm_writes_invalidate_the_board(self):
+        self.assertEqual(self.states(), [])
+        visit = Visit.objects.create(tenant=self.tenant, patient=self.budi)
+        ticket = QueueTicket.objects.create(tenant=self.tenant, visit=visit, number=1)
+        self.assertEqual(self.states(), [("Budi", "WAITING")])
+        self.budi.full_name = "Budi Santoso"
+        self.budi.save()
+        self.assertEqual(self.states(), [("Budi Santoso", "WAITING")])
+        counter = Counter.objects.create(tenant=self.tenant, name="Loket 1")
+        QueueTicket.objects.filter(pk=ticket.pk).update(counter=counter)
+        bump(self.tenant.id, QUEUE)
+        self.assertEqual(self.board().json()[0]["counter"], str(counter.id))
+        counter.delete()
+        self.assertIsNone(self.board().json()[0]["counter"])
+        visit.delete()
+        self.assertEqual(self.states(), [])
+
+    def test_patient_writes_invalidate_list_and_detail(self):
+        url = f"/api/patients/{self.budi.id}/"
+        self.assertEqual(
+            self.client.get("/api/patients/", **self.headers).json()["count"], 2
+        )
+        self.assertEqual(
+            self.client.get(url, **self.headers).json()["full_name"], "Budi"
+        )
+        self.client.post(
+            "/api/patients/", {"full_name": "Agus", "mrn": "3"}, **self.headers
+        )
+        self.client.patch(url, {"full_name": "Bambang"}, **self.headers)
+        resp = self.client.get("/api/patients/", **self.headers)
+        self.assertEqual(resp[CACHE_HEADER], "MISS")
+        names = [p["full_name"] for p in resp.json()["results"]]
+        self.assertEqual(names, ["Agus", "Bambang", "Siti"])
+        self.assertEqual(
+            self.client.get(url, **self.headers).json()["full_name"], "Bambang"
+        )
+        self.client.delete(url, **self.headers)
+        self.assertEqual(self.client.get(url, **self.headers).status_code, 404)
+        PatientImporter(self.tenant).run([(1, {"full_name": "Dewi", "mrn": "4"})])
+        resp = self.client.get("/api/patients/?search=Dewi", **self.headers)
+        self.assertEqual(resp.json()["count"], 1)
+
+    def test_entries_are_per_tenant_and_query(self):
+        other_headers = self.login(self.other, "other", User.Role.STAFF)
+        Patient.objects.create(tenant=self.other, full_name="Lain", mrn="1")
+        mine = self.client.get("/api/patients/", **self.headers).json()
+        theirs = self.client.get("/api/patients/", **other_headers).json()
+        self.assertEqual(mine["count"], 2)
+        self.assertEqual([p["full_name"] for p in theirs["results"]], ["Lain"])
+        resp = self.client.get("/api/patients/?search=Siti", **self.headers)
+        self.assertEqual([p["full_name"] for p in resp.json()["results"]], ["Siti"])
+
+    def test_permissions_are_checked_before_the_cache(self):
+        self.board()
+        cashier = self.login(self.tenant, "cashier", User.Role.CASHIER)
+        resp = self.client.get("/api/queue/", **cashier)
+        self.assertEqual(resp.status_code, 403)
+
+    def test_lost_version_never_resurrects_stale_entries(self):
+        before = get_version(self.tenant.id, PATIENTS)
+        self.client.get("/api/patients/", **self.headers)
+        cache.delete(version_key(self.tenant.id, PATIENTS))
+        Patient.objects.filter(pk=self.siti.pk).delete()
+        self.assertGreater(get_version(self.tenant.id, PATIENTS), before)
+        resp = self.client.get("/api/patients/", **self.headers)
+        self.assertEqual(resp[CACHE_HEADER], "MISS")
+        self.assertEqual(resp.json()["count"], 1)
+
+    def test_bump_repeats_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            before = get_version(self.tenant.id, QUEUE)
+            bump(self.tenant.id, QUEUE)
+            self.assertEqual(get_version(self.tenant.id, QUEUE), before + 1)
+        self.assertEqual(get_version(self.tenant.id, QUEUE), before + 2)
+
+    @override_settings(RESPONSE_CACHE={"TTL": 0})
+    def test_disabled(self):
+        self.board()
+        resp = self.board()
+        self.assertNotIn(CACHE_HEADER, resp)
+
+    @override_settings(RESPONSE_CACHE={"CACHE": None, "TTL": 300})
+    def test_off_without_a_shared_cache(self):
+        self.board()
+        resp = self.board()
+        self.assertNotIn(CACHE_HEADER, resp)
+        with self.captureOnCommitCallbacks(execute=True):
+            bump(self.tenant.id, QUEUE)
+        self.assertIsNone(get_version(self.tenant.id, QUEUE))
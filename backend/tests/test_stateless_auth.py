@@ -0,0 +1,79 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+
+class StatelessAuthTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T1", subdomain="t1")
+        self.user = User.objects.create_user(
+            username="staff", password="pass", tenant=self.tenant, role=User.Role.STAFF
+        )
+        resp = self.client.post(
+            reverse("login"),
+            {"username": "staff", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+        self.token = resp.json()["access"]
+        self.refresh = resp.json()["refresh"]
+
+    def get(self, token=None):
+        return self.client.get(
+            "/api/patients/",
+            HTTP_AUTHORIZATION=f"Bearer {token or self.token}",
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+
+    def test_authenticated_request_skips_user_query(self):
+        self.get()
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.get()
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(any("users_user" in q["sql"] for q in ctx.captured_queries))
+
+    def test_role_change_revokes_token(self):
+        self.user.role = User.Role.CASHIER
+        self.user.save()
+        self.assertEqual(self.user.token_version, 1)
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_deactivation_revokes_token(self):
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_unrelated_change_keeps_token(self):
+        self.user.first_name = "Siti"
+        self.user.save()
+        self.assertEqual(self.get().status_code, 200)
+
+    def refresh_token(self, refresh=None):
+        return self.client.post(
+            reverse("token_refresh"),
+            {"refresh": refresh or self.refresh},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        )
+
+    def test_refresh_keeps_claims(self):
+        resp = self.refresh_token()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.get(resp.json()["access"]).status_code, 200)
+
+    def test_revoked_refresh_token_cannot_mint_access(self):
+        self.user.role = User.Role.CASHIER
+        self.user.save()
+        resp = self.refresh_token()
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(resp.json()["code"], "token_revoked")
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        legacy = str(RefreshToken.for_user(self.user))
+        self.assertEqual(self.refresh_token(legacy).status_code, 401)
+
+    def test_token_without_tenant_claims_falls_back_to_db(self):
+        legacy = str(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(self.get(legacy).status_code, 200)
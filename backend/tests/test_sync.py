@@ -0,0 +1,273 @@
+import datetime
+import io
+import threading
+import unittest
+
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.urls import reverse
+from django.test import TransactionTestCase
+from rest_framework.test import APITestCase
+from apps.admissions.models import Visit
+from apps.patients.importer import PatientImporter
+from apps.patients.models import Patient
+from apps.queue.archive import archive_tickets
+from apps.queue.models import Counter, QueueTicket
+from apps.queue.services import close_day
+from apps.sync.feed import SOURCES, TOMBSTONES, after, changes, since
+from apps.sync.models import ChangeCounter, Tombstone
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+DAY = datetime.timedelta(days=1)
+
+
+class SyncTests(APITestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="T", subdomain="t")
+        self.other = Tenant.objects.create(name="O", subdomain="o")
+        User.objects.create_user(
+            username="admin", password="pass", tenant=self.tenant, role=User.Role.ADMIN
+        )
+        token = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "pass"},
+            HTTP_X_TENANT_ID=str(self.tenant.id),
+        ).json()["access"]
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_X_TENANT_ID": str(self.tenant.id),
+        }
+        self.budi = Patient.objects.create(
+            tenant=self.tenant, full_name="Budi", mrn="1"
+        )
+        self.siti = Patient.objects.create(
+            tenant=self.tenant, full_name="Siti", mrn="2"
+        )
+        Patient.objects.create(tenant=self.other, full_name="Lain", mrn="1")
+
+    def sync(self, **params):
+        resp = self.client.get("/api/sync/", params, **self.headers)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return resp.json()
+
+    def drain(self, since=0, limit=500):
+        """Follow continuation tokens; returns the batches and the final seq."""
+        batches = [self.sync(since=since, limit=limit)]
+        while batches[-1]["next"]:
+            batches.append(self.sync(cursor=batches[-1]["next"], limit=limit))
+        return batches, batches[-1]["seq"]
+
+    def check_in(self, patient):
+        resp = self.client.post(
+            "/api/admissions/checkin/",
+            {"patient_id": str(patient.id)},
+            **self.headers,
+        )
+        self.assertEqual(resp.status_code, 201)
+        return resp.json()
+
+    def test_writes_get_increasing_per_tenant_sequence_numbers(self):
+        self.assertLess(self.budi.change_seq, self.siti.change_seq)
+        self.budi.full_name = "Budi Santoso"
+        self.budi.save(update_fields=["full_name"])
+        self.budi.refresh_from_db()
+        self.assertGreater(self.budi.change_seq, self.siti.change_seq)
+        self.check_in(self.siti)
+        visit = Visit.objects.get(patient=self.siti)
+        ticket = QueueTicket.objects.get(visit=visit)
+        self.assertLess(self.budi.change_seq, visit.change_seq)
+        self.assertLess(visit.change_seq, ticket.change_seq)
+        self.assertEqual(
+            ChangeCounter.objects.high_water(self.tenant.id), ticket.change_seq
+        )
+
+    @unittest.skipIf(connection.vendor == "postgresql", "numbers from xids")
+    def test_counters_are_per_tenant(self):
+        self.assertEqual([self.budi.change_seq, self.siti.change_seq], [1, 2])
+        self.assertEqual(Patient.objects.get(tenant=self.other).change_seq, 1)
+        self.assertEqual(ChangeCounter.objects.get(tenant=self.tenant).value, 2)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "numbers from xids")
+    def test_allocation_writes_and_locks_nothing(self):
+        first = ChangeCounter.objects.allocate(self.tenant.id, 3)
+        self.assertEqual(ChangeCounter.objects.allocate(self.tenant.id), first + 3)
+        self.assertFalse(ChangeCounter.objects.exists())
+
+    def test_initial_sync_then_only_changes(self):
+        data = self.sync()
+        self.assertEqual({p["full_name"] for p in data["patients"]}, {"Budi", "Siti"})
+        self.assertIsNone(data["next"])
+        seq = data["seq"]
+        self.assertEqual(self.sync(since=seq)["patients"], [])
+
+        ticket = self.check_in(self.budi)
+        self.client.post("/api/queue/next/", **self.headers)
+        self.client.patch(
+            f"/api/patients/{self.siti.id}/", {"nik": "123"}, **self.headers
+        )
+        data = self.sync(since=seq)
+        self.assertEqual([p["nik"] for p in data["patients"]], ["123"])
+        self.assertEqual(len(data["visits"]), 1)
+        self.assertEqual(
+            [(t["id"], t["state"]) for t in data["queue_tickets"]],
+            [(ticket["id"], "IN_PROGRESS")],
+        )
+        self.assertGreater(data["seq"], seq)
+        self.assertEqual(self.sync(since=data["seq"])["queue_tickets"], [])
+
+    def test_deletes_become_tombstones(self):
+        self.check_in(self.budi)
+        seq = self.sync()["seq"]
+        visit = Visit.objects.get(patient=self.budi)
+        ticket = QueueTicket.objects.get(visit=visit)
+        self.client.delete(f"/api/patients/{self.budi.id}/", **self.headers)
+        data = self.sync(since=seq)
+        self.assertEqual(data["patients"], [])
+        self.assertEqual(
+            data["deleted"],
+            {
+                "patients": [str(self.budi.id)],
+                "visits": [str(visit.id)],
+                "queue_tickets": [str(ticket.id)],
+            },
+        )
+
+    def test_bulk_paths_are_stamped(self):
+        ticket = self.check_in(self.budi)
+        self.check_in(self.siti)
+        seq = self.sync()["seq"]
+        close_day(tenant=None)
+        data = self.sync(since=seq)
+        self.assertEqual({t["state"] for t in data["queue_tickets"]}, {"SKIPPED"})
+        self.assertEqual(len(data["queue_tickets"]), 2)
+
+        seq = data["seq"]
+        PatientImporter(self.tenant).run([(1, {"full_name": "Dewi", "mrn": "3"})])
+        QueueTicket.objects.filter(pk=ticket["id"]).update(queue_date="2000-01-01")
+        archive_tickets()
+        data = self.sync(since=seq)
+        self.assertEqual([p["full_name"] for p in data["patients"]], ["Dewi"])
+        self.assertEqual(data["deleted"]["queue_tickets"], [ticket["id"]])
+
+    def test_deleting_a_counter_stamps_its_tickets(self):
+        counter = Counter.objects.create(tenant=self.tenant, name="Loket 1")
+        self.check_in(self.budi)
+        self.client.post(
+            "/api/queue/next/", {"counter": str(counter.id)}, **self.headers
+        )
+        seq = self.sync()["seq"]
+        counter.delete()
+        (ticket,) = self.sync(since=seq)["queue_tickets"]
+        self.assertIsNone(ticket["counter"])
+
+    def test_batches_continue_through_shared_sequence_numbers(self):
+        patients = Patient.stamp(
+            [
+                Patient(tenant=self.tenant, full_name=f"P{i}", mrn=f"x{i}")
+                for i in range(7)
+            ]
+        )
+        Patient.objects.bulk_create(patients)
+        # One UPDATE stamps all seven rows with the same number.
+        Patient.objects.filter(mrn__startswith="x").update(
+            change_seq=ChangeCounter.objects.allocate(self.tenant.id)
+        )
+        budi_id = str(self.budi.id)
+        self.budi.delete()
+        batches, seq = self.drain(limit=3)
+        self.assertEqual(len(batches), 3)
+        names = [p["full_name"] for b in batches for p in b["patients"]]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(set(names), {"Siti", *(f"P{i}" for i in range(7))})
+        self.assertEqual(batches[-1]["deleted"]["patients"], [budi_id])
+        self.assertEqual(seq, ChangeCounter.objects.high_water(self.tenant.id))
+        # A truncated batch's seq is always safe to resume from.
+        resumed, _ = self.drain(since=batches[0]["seq"])
+        resumed_names = {p["full_name"] for b in resumed for p in b["patients"]}
+        self.assertTrue(set(names[3:]) <= resumed_names)
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_continuations_are_index_ranges(self):
+        sources = [(rank, model) for rank, (_, model) in enumerate(SOURCES)]
+        for rank, model in sources:
+            queryset = model.objects.filter(tenant=self.tenant)
+            plan = after(queryset, rank, (5, rank, self.budi.pk))[:10].explain()
+            self.assertIn("(tenant_id=? AND (change_seq,id)>(?,?))", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+        # SQLite seeks a rowid primary key by change_seq only; tombstones
+        # are numbered one apiece, so there are no groups to rescan.
+        queryset = Tombstone.objects.filter(tenant=self.tenant)
+        plan = after(queryset, TOMBSTONES, (5, TOMBSTONES, 1))[:10].explain()
+        self.assertIn("(tenant_id=? AND change_seq>?)", plan)
+
+    def test_tenants_are_isolated(self):
+        data = self.sync()
+        self.assertNotIn("Lain", [p["full_name"] for p in data["patients"]])
+        Patient.objects.filter(tenant=self.other).delete()
+        self.assertEqual(self.sync()["deleted"]["patients"], [])
+
+    def test_deleting_a_tenant_leaves_no_tombstones(self):
+        self.other.delete()
+        self.assertFalse(Tombstone.objects.filter(tenant_id=self.other.id).exists())
+
+    def test_pruned_tombstones_force_a_resync(self):
+        seq = self.sync()["seq"]
+        self.budi.delete()
+        Tombstone.objects.update(deleted_at=F("deleted_at") - 40 * DAY)
+        siti_id = self.siti.id
+        self.siti.delete()
+        out = io.StringIO()
+        call_command("prune_tombstones", stdout=out)
+        self.assertIn("Deleted 1 tombstones", out.getvalue())
+        self.assertEqual(
+            list(Tombstone.objects.values_list("object_id", flat=True)),
+            [siti_id],
+        )
+        resp = self.client.get("/api/sync/", {"since": seq}, **self.headers)
+        self.assertEqual(resp.status_code, 410)
+        batches, seq = self.drain()
+        self.assertEqual(batches[0]["patients"], [])
+        self.assertEqual(self.sync(since=seq)["deleted"]["patients"], [])
+
+    def test_invalid_cursor(self):
+        resp = self.client.get("/api/sync/", {"cursor": "nope"}, **self.headers)
+        self.assertEqual(resp.status_code, 404)
+        resp = self.client.get("/api/sync/", {"since": -1}, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "Needs concurrent writers; runs in the backend-postgres CI job",
+)
+class ConcurrentWriterTests(TransactionTestCase):
+    def test_feed_waits_for_older_transactions(self):
+        tenant = Tenant.objects.create(name="T", subdomain="t")
+        started, release = threading.Event(), threading.Event()
+
+        def slow_writer():
+            try:
+                with transaction.atomic():
+                    Patient.objects.create(tenant=tenant, full_name="Lama", mrn="1")
+                    started.set()
+                    release.wait(10)
+            finally:
+                connections.close_all()
+
+        thread = threading.Thread(target=slow_writer)
+        thread.start()
+        try:
+            started.wait(10)
+            # Committed first, but numbered after the writer still running.
+            Patient.objects.create(tenant=tenant, full_name="Baru", mrn="2")
+            batch = changes(tenant, since(0))
+            self.assertEqual(batch.rows["patients"], [])
+        finally:
+            release.set()
+            thread.join()
+        batch = changes(tenant, since(batch.seq))
+        self.assertEqual(
+            [p.full_name for p in batch.rows["patients"]], ["Lama", "Baru"]
+        )
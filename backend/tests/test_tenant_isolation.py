@@ -34,3 +34,11 @@ class TenantIsolationTests(APITestCase):
             HTTP_X_TENANT_ID=str(self.t2.id),
         )
         self.assertEqual(other.status_code, 403)
+
+    def test_query_tenant_only_on_stream(self):
+        resp = self.client.get(
+            f"/api/users/?tenant={self.t1.id}",
+            HTTP_AUTHORIZATION=f"Bearer {self.token}",
+            HTTP_HOST="unknown.example.com",
+        )
+        self.assertEqual(resp.status_code, 400)
@@ -0,0 +1,99 @@
+from django.test import TestCase
+from apps.tenants.models import Tenant
+from apps.tenants.registry import GENERATION, TenantRegistry, registry
+
+
+class TenantRegistryTests(TestCase):
+    def setUp(self):
+        registry.clear()
+        self.tenant = Tenant.objects.create(name="T1", subdomain="t1")
+
+    def test_lookup_is_cached_by_id_and_subdomain(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(registry.get_by_id(self.tenant.id), self.tenant)
+            self.assertEqual(registry.get_by_subdomain("t1"), self.tenant)
+            self.assertEqual(registry.get_by_id(str(self.tenant.id)), self.tenant)
+        self.assertEqual(registry.stats()["hits"], 2)
+        self.assertEqual(registry.stats()["misses"], 1)
+
+    def test_negative_results_are_cached(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(registry.get_by_subdomain("junk"))
+            self.assertIsNone(registry.get_by_subdomain("junk"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(registry.get_by_id("not-a-uuid"))
+        self.assertEqual(registry.stats()["negative_hits"], 1)
+
+    def test_save_and_delete_invalidate(self):
+        registry.get_by_subdomain("t1")
+        self.tenant.subdomain = "renamed"
+        self.tenant.save()
+        self.assertIsNone(registry.get_by_subdomain("t1"))
+        self.assertEqual(registry.get_by_id(self.tenant.id).subdomain, "renamed")
+        registry.get_by_subdomain("new")
+        created = Tenant.objects.create(name="New", subdomain="new")
+        self.assertEqual(registry.get_by_subdomain("new"), created)
+        self.tenant.delete()
+        self.assertIsNone(registry.get_by_subdomain("renamed"))
+
+    def test_lru_bound(self):
+        small = TenantRegistry(MAX_SIZE=2, MAX_MISSING=2)
+        Tenant.objects.create(name="T2", subdomain="t2")
+        small.get_by_subdomain("t1")
+        small.get_by_subdomain("t2")
+        self.assertEqual(small.stats()["size"], 2)
+        for junk in ("a", "b", "c"):
+            small.get_by_subdomain(junk)
+        self.assertEqual(small.stats()["missing"], 2)
+        # Misses have their own bound and never push tenants out.
+        with self.assertNumQueries(0):
+            self.assertEqual(small.get_by_subdomain("t2").name, "T2")
+
+    def test_shared_tier(self):
+        shared = TenantRegistry(SHARED_CACHE="default")
+        shared.shared.clear()
+        shared.get_by_id(self.tenant.id)
+        other = TenantRegistry(SHARED_CACHE="default")
+        with self.assertNumQueries(0):
+            self.assertEqual(other.get_by_subdomain("t1"), self.tenant)
+        self.assertEqual(other.stats()["shared_hits"], 1)
+
+    def test_invalidation_reaches_other_processes(self):
+        first = TenantRegistry(SHARED_CACHE="default", SYNC_INTERVAL=0)
+        second = TenantRegistry(SHARED_CACHE="default", SYNC_INTERVAL=0)
+        first.shared.clear()
+        self.assertEqual(first.get_by_subdomain("t1"), self.tenant)
+        self.assertIsNone(first.get_by_subdomain("t9"))
+        Tenant.objects.filter(pk=self.tenant.pk).update(subdomain="t9")
+        # What the post_save receiver does after a rename, in another worker.
+        second.invalidate(tenant_id=self.tenant.id, subdomain="t9")
+        second.invalidate(subdomain="t1")
+        self.assertIsNone(first.get_by_subdomain("t1"))
+        self.assertEqual(first.get_by_subdomain("t9").id, self.tenant.id)
+
+    def test_evicted_generation_still_flushes_other_processes(self):
+        first = TenantRegistry(SHARED_CACHE="default", SYNC_INTERVAL=0)
+        second = TenantRegistry(SHARED_CACHE="default", SYNC_INTERVAL=0)
+        first.shared.clear()
+        first.get_by_subdomain("t1")
+        second.invalidate(tenant_id=self.tenant.id)
+        # Picks up the bumped generation and caches t1 again.
+        self.assertEqual(first.get_by_subdomain("t1"), self.tenant)
+        first.shared.delete(first._shared_key(GENERATION))
+        Tenant.objects.filter(pk=self.tenant.pk).update(subdomain="t9")
+        second.invalidate(subdomain="t1")
+        self.assertIsNone(first.get_by_subdomain("t1"))
+
+    def test_invalidates_again_on_commit(self):
+        registry.get_by_subdomain("t1")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tenant.subdomain = "renamed"
+            self.tenant.save()
+            # A lookup before commit caches the row as this transaction
+            # sees it; a concurrent one would cache the old row.
+            registry._store("sub:t1", Tenant(id=self.tenant.id, subdomain="t1"))
+        self.assertIsNone(registry.get_by_subdomain("t1"))
+
+    def test_middleware_rejects_unknown_tenant(self):
+        resp = self.client.get("/api/users/", HTTP_X_TENANT_ID="bogus")
+        self.assertEqual(resp.status_code, 400)